@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tempo de construção dos widgets: as colunas e notas de um quadro
+(program.py) e as miniaturas do gerenciador (manager.py), até a primeira
+exibição.
+
+    cd src && QT_QPA_PLATFORM=offscreen python benchmarks/bench_board_widgets.py [--notes N] [--tiles N] [--save DIR]
+                                                                                [--baseline REV]
+
+Com --baseline o mesmo script roda também sobre a revisão REV do git (num
+worktree temporário), para comparar antes e depois; com --save as imagens
+dos widgets são gravadas em DIR (e em DIR/REV) para conferir que o desenho
+não mudou.
+
+Medidas de referência com --baseline b328377^ (offscreen, valores padrão,
+mediana de 3 execuções), antes e depois da folha de estilos compartilhada e
+do cache de ícones; as imagens gravadas com --save são idênticas:
+
+    program:  900 notes   2106 ms ->  1239 ms
+    manager:  600 tiles   1216 ms ->   403 ms
+"""
+import os
+import sys
+import time
+import shutil
+import pathlib
+import tempfile
+import argparse
+import subprocess
+
+from PyQt5.QtWidgets import QApplication, QWidget, QHBoxLayout
+
+SRC_DIR = pathlib.Path(__file__).resolve().parent.parent
+
+
+def bench_program(app, notes_per_column, save):
+    import simple_kanban_gui.program as program
+
+    styles = {"doing": {"frame": "background-color: #ffeeee; border: 2px solid #cc6666; padding: 5px;",
+                        "title": "color: #990000;"}}
+    columns = [{"title": f"c{c}",
+                "style": [None, "doing", "default"][c % 3],
+                "notes": [{"id": f"{c}-{i}", "title": f"note {i}", "content": "x",
+                           **({"due": 1} if i % 7 == 0 else {})}
+                          for i in range(notes_per_column)]}
+               for c in range(3)]
+    document = program.BoardDocument({"title": "t", "description": "", "styles": styles, "boards": columns})
+
+    host = QWidget()
+    layout = QHBoxLayout(host)
+    # As versões anteriores não têm a folha de estilos compartilhada
+    shared = hasattr(program, "board_style")
+    if shared:
+        program.board_style().attach(host)
+
+    start = time.perf_counter()
+    if shared:
+        program.board_style().style_names([document.column_style(column) for column in document.columns])
+    for column in document.columns:
+        widget = program.ColumnWidget(document, column)
+        layout.addWidget(widget)
+        for note in column["notes"]:
+            widget.add_note_widget(note)
+    host.show()
+    app.processEvents()
+    elapsed = time.perf_counter() - start
+
+    if save:
+        host.resize(1200, 700)
+        app.processEvents()
+        host.grab().save(os.path.join(save, "program.png"))
+    return elapsed
+
+
+def bench_manager(app, tiles, save):
+    import simple_kanban_gui.manager as manager
+
+    root = tempfile.mkdtemp()
+    for i in range(tiles):
+        os.mkdir(os.path.join(root, f"d{i}"))
+        manager.dump_board(os.path.join(root, f"b{i}.kanban.json"),
+                           {"title": f"T{i}", "description": "desc", "boards": []})
+
+    start = time.perf_counter()
+    grid = manager.GridView()
+    items = [manager.FolderTile(os.path.join(root, f"d{i}"), f"d{i}") for i in range(tiles)]
+    items += [manager.KanbanCard(os.path.join(root, f"b{i}.kanban.json")) for i in range(tiles)]
+    grid.setItems(items)
+    grid.resize(1200, 700)
+    grid.show()
+    app.processEvents()
+    elapsed = time.perf_counter() - start
+
+    if save:
+        grid.grab().save(os.path.join(save, "manager.png"))
+    return elapsed
+
+
+def run_baseline(args):
+    """
+    Roda este script sobre a revisão `args.baseline`, num worktree temporário.
+    """
+    worktree = tempfile.mkdtemp()
+    subprocess.run(["git", "worktree", "add", "--detach", worktree, args.baseline],
+                   cwd=SRC_DIR, check=True, stdout=subprocess.DEVNULL)
+    try:
+        command = [sys.executable, __file__, "--notes", str(args.notes), "--tiles", str(args.tiles),
+                   "--src", os.path.join(worktree, "src")]
+        if args.save:
+            save = os.path.join(args.save, args.baseline.replace("/", "_"))
+            os.makedirs(save, exist_ok=True)
+            command += ["--save", save]
+        print(f"--- {args.baseline}", flush=True)
+        subprocess.run(command, check=True)
+    finally:
+        subprocess.run(["git", "worktree", "remove", "--force", worktree], cwd=SRC_DIR, check=False)
+        shutil.rmtree(worktree, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--notes", type=int, default=300, help="notes per column (3 columns)")
+    parser.add_argument("--tiles", type=int, default=300, help="folders and boards in the manager grid")
+    parser.add_argument("--save", default="", help="directory for the screenshots")
+    parser.add_argument("--baseline", default="", help="git revision to compare against")
+    parser.add_argument("--src", default=str(SRC_DIR), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    sys.path.insert(0, args.src)
+
+    if args.baseline:
+        run_baseline(args)
+        print("--- working tree", flush=True)
+
+    app = QApplication(sys.argv)
+    print(f"program: {3 * args.notes} notes  {bench_program(app, args.notes, args.save) * 1000:8.0f} ms")
+    print(f"manager: {2 * args.tiles} tiles  {bench_manager(app, args.tiles, args.save) * 1000:8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark do codec JSON (modules/codec.py) contra o json da biblioteca
+padrão, num quadro sintético de 4 colunas x 5000 notas com texto acentuado.
+
+    cd src && python benchmarks/bench_codec.py [--notes N] [--repeat R]
+
+Imprime o melhor tempo de R repetições de cada operação e o backend em uso
+(orjson, se instalado: pip install simple_kanban_gui[fast]).
+"""
+import sys
+import json
+import time
+import random
+import pathlib
+import argparse
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from simple_kanban_gui.modules          import codec
+from simple_kanban_gui.modules.document import encode_column
+
+WORDS = "tarefa revisar código ação nota prazo quadro coluna".split()
+
+
+def make_board(notes_per_column, columns=4, seed=1):
+    rnd = random.Random(seed)
+    return {"title": "bench",
+            "boards": [{"id": f"c{c}", "title": f"col{c}",
+                        "notes": [{"id": f"{c}-{i}",
+                                   "title": " ".join(rnd.choices(WORDS, k=4)),
+                                   "content": " ".join(rnd.choices(WORDS, k=60)),
+                                   "modified": 1700000000 + i}
+                                  for i in range(notes_per_column)]}
+                       for c in range(columns)]}
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--notes", type=int, default=5000, help="notes per column")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    data = make_board(args.notes)
+    raw = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    column = data["boards"][0]
+    records = [dict(op="edit_note", seq=i, board=0, index=i, title="x ação") for i in range(20000)]
+
+    cases = [
+        ("stdlib loads(bytes)",   lambda: json.loads(raw)),
+        ("codec loads(bytes)",    lambda: codec.loads(raw)),
+        ("stdlib dumps indent=2", lambda: json.dumps(data, ensure_ascii=False, indent=2)),
+        ("codec dumps indent",    lambda: codec.dumps(data, indent=True)),
+        ("stdlib encode column",  lambda: "    " + json.dumps(column, ensure_ascii=False, indent=2).replace("\n", "\n    ")),
+        ("codec encode_column",   lambda: encode_column(column)),
+        ("stdlib journal lines",  lambda: [json.dumps(r, ensure_ascii=False, separators=(",", ":")) for r in records]),
+        ("codec journal lines",   lambda: [codec.dumpb(r) for r in records]),
+    ]
+
+    print(f"backend: {codec.BACKEND}, corpus: {len(raw) / 1e6:.1f} MB")
+    for name, fn in cases:
+        print(f"  {name:24s} {best_of(fn, args.repeat) * 1000:8.1f} ms")
+    print("same output as json indent=2:", codec.dumps(data, indent=True) == raw.decode("utf-8"))
+
+
+if __name__ == "__main__":
+    main()
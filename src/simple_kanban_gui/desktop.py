@@ -1,6 +1,10 @@
 import os
 import simple_kanban_gui.about as about
 import subprocess
+import threading
+
+APPLICATIONS_PATH = os.path.join("~",".local","share","applications")
+AUTOSTART_PATH = os.path.join("~",".config","autostart")
 
 
 def update_desktop_database(desktop_path):
@@ -16,7 +20,7 @@ def update_desktop_database(desktop_path):
     except FileNotFoundError:
         print("The command 'update-desktop-database' was not found. Verify that the package 'desktop-file-utils' is installed.")
 
-def create_desktop_file(desktop_path, overwrite=False, program_name=None):
+def create_desktop_file(desktop_path, overwrite=False, program_name=None, args=""):
     base_dir_path = os.path.dirname(os.path.abspath(__file__))
     icon_path = os.path.join(base_dir_path, 'icons', 'logo.png')
 
@@ -31,7 +35,7 @@ def create_desktop_file(desktop_path, overwrite=False, program_name=None):
     desktop_entry = f"""[Desktop Entry]
 Name={__program_name}
 Comment={about.__description__}
-Exec={script_path}
+Exec={script_path}{" " + args if args else ""}
 Terminal=false
 Type=Application
 Icon={icon_path}
@@ -100,6 +104,23 @@ def create_desktop_menu(directory_name = "ResearchTools",
             f.write(desktop_entry)
         print(f"File {path} created.")
 
+def install_desktop_entries(program_name=None, desktop_path=APPLICATIONS_PATH, overwrite=False, args=""):
+    """
+    Diretório e menu "ResearchTools" e o atalho do programa em `desktop_path`.
+    """
+    create_desktop_directory(overwrite=overwrite)
+    create_desktop_menu(overwrite=overwrite)
+    create_desktop_file(desktop_path, overwrite=overwrite, program_name=program_name, args=args)
+
+def install_desktop_entries_later(program_name=None):
+    """
+    Cria numa thread os atalhos que ainda não existem, sem atrasar a abertura
+    da janela (update-desktop-database pode demorar).
+    """
+    thread = threading.Thread(target=install_desktop_entries, kwargs={"program_name": program_name}, daemon=True)
+    thread.start()
+    return thread
+
 if __name__ == '__main__':
     create_desktop_menu()
     create_desktop_directory()
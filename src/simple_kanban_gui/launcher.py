@@ -0,0 +1,138 @@
+"""
+Pontos de entrada dos programas.
+
+Os argumentos são lidos antes de qualquer importação do Qt: --help e as
+opções que só instalam atalhos (--autostart, --applications) terminam sem
+carregar a interface nem a configuração. Os atalhos de uma abertura normal
+são criados depois da primeira pintura da janela.
+"""
+import sys
+import time
+import argparse
+import importlib
+
+import simple_kanban_gui.about as about
+
+# Módulos importados um a um em --profile-startup, na ordem em que seriam
+# carregados pelo programa
+PROFILE_IMPORTS = ["PyQt5.QtCore", "PyQt5.QtGui", "PyQt5.QtWidgets", "simple_kanban_gui.modules.codec"]
+
+
+class StartupProfile:
+    """
+    Tempos das importações e das fases da abertura (--profile-startup),
+    impressos na saída de erro depois da primeira pintura da janela.
+    """
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.start = self.last = time.perf_counter()
+        self.rows = []
+        self.paint_filter = None
+
+    def mark(self, phase):
+        if self.enabled:
+            now = time.perf_counter()
+            self.rows.append((phase, now - self.last))
+            self.last = now
+
+    def import_module(self, name):
+        if self.enabled:
+            for module in PROFILE_IMPORTS:
+                if module not in sys.modules:
+                    importlib.import_module(module)
+                    self.mark("import " + module)
+        module = importlib.import_module(name)
+        self.mark("import " + name)
+        return module
+
+    def watch_first_paint(self, widget):
+        """
+        Marca a primeira pintura de `widget` e imprime o relatório.
+        """
+        if not self.enabled:
+            return
+        from PyQt5.QtCore import QObject, QEvent
+
+        profile = self
+
+        class FirstPaint(QObject):
+            def eventFilter(self, obj, event):
+                if event.type() == QEvent.Paint:
+                    widget.removeEventFilter(self)
+                    profile.mark("first paint")
+                    profile.report()
+                return False
+
+        self.paint_filter = FirstPaint()
+        widget.installEventFilter(self.paint_filter)
+
+    def report(self):
+        total = self.last - self.start
+        lines = ["Startup profile (ms):"]
+        for phase, seconds in self.rows:
+            lines.append(f"  {seconds * 1000:8.1f}  {phase}")
+        lines.append(f"  {total * 1000:8.1f}  total")
+        print("\n".join(lines), file=sys.stderr)
+
+
+def common_arguments(parser):
+    parser.add_argument("--autostart", action="store_true",
+                        help="install the desktop entries and start at login, then exit")
+    parser.add_argument("--applications", action="store_true",
+                        help="install the desktop entries in the applications menu, then exit")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print the import and startup phase times")
+
+
+def program_main(module=None, argv=None):
+    """
+    simple-kanban-gui [arquivo]; `module` é o simple_kanban_gui.program já
+    importado (quando executado com python -m).
+    """
+    parser = argparse.ArgumentParser(prog=about.__program_name__, description=about.__description__)
+    parser.add_argument("file", nargs="?", default="", help="kanban file to open")
+    common_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.autostart or args.applications:
+        from simple_kanban_gui.desktop import install_desktop_entries, AUTOSTART_PATH, APPLICATIONS_PATH
+        install_desktop_entries(desktop_path=AUTOSTART_PATH if args.autostart else APPLICATIONS_PATH,
+                                overwrite=True)
+        return
+
+    profile = StartupProfile(args.profile_startup)
+    if module is None:
+        module = profile.import_module("simple_kanban_gui.program")
+    module.run(args.file, profile)
+
+
+def manager_main(module=None, argv=None):
+    """
+    simple-kanban-manager [diretório]; `module` é o simple_kanban_gui.manager
+    já importado (quando executado com python -m).
+    """
+    parser = argparse.ArgumentParser(prog=about.__manager_name__, description="Browser of the kanban files and folders")
+    parser.add_argument("path", nargs="?", default=None, help="directory to open")
+    common_arguments(parser)
+    parser.add_argument("--reminders", action="store_true",
+                        help="stay in the system tray and notify the due dates of the notes")
+    parser.add_argument("--last-path", action="store_true",
+                        help="open the last visited directory")
+    args = parser.parse_args(argv)
+
+    if args.autostart or args.applications:
+        from simple_kanban_gui.desktop import install_desktop_entries, AUTOSTART_PATH, APPLICATIONS_PATH
+        # O processo iniciado no login fica na bandeja lembrando os vencimentos
+        install_desktop_entries(program_name=about.__manager_name__,
+                                desktop_path=AUTOSTART_PATH if args.autostart else APPLICATIONS_PATH,
+                                overwrite=True,
+                                args="--reminders" if args.autostart else "")
+        return
+
+    profile = StartupProfile(args.profile_startup)
+    if module is None:
+        module = profile.import_module("simple_kanban_gui.manager")
+    if args.reminders:
+        module.run_reminders()
+        return
+    module.run(args.path, args.last_path, profile)
@@ -6,7 +6,7 @@
 Kanban Card Browser (Qt5)
 
 Um "gestor de ficheros" em cards que navega por pastas e mostra APENAS arquivos
-com extensão *.kanban.json. Para cada arquivo, exibe as chaves primárias
+de quadros (*.kanban.json, também comprimidos ou em MessagePack). Para cada arquivo, exibe as chaves primárias
 "title" e "description" como um card. Pastas aparecem como ícones clicáveis.
 
 Requisitos:
@@ -17,12 +17,11 @@ Execução:
 
 Notas de design:
   - Pastas e arquivos são renderizados como "tiles" num grid responsivo.
-  - Apenas diretórios e arquivos *.kanban.json são listados.
+  - Apenas diretórios e arquivos de quadros são listados.
   - Duplo clique: entra em pastas. Clique simples no card não abre nada (apenas seleciona).
   - Menu de contexto nos cards: "Open in the default editor" e "Open in the file manager".
 """
 
-import json
 import os
 import sys
 import pathlib
@@ -37,8 +36,10 @@ from PyQt5.QtCore    import (Qt, QUrl)
 
 import simple_kanban_gui.about as about
 import simple_kanban_gui.modules.configure as configure 
-from simple_kanban_gui.desktop import create_desktop_file, create_desktop_directory, create_desktop_menu
-from simple_kanban_gui.modules.wabout  import show_about_window
+from simple_kanban_gui.desktop import install_desktop_entries_later
+from simple_kanban_gui.modules.styles  import STYLES_KEY, FORMAT_KEY, FORMAT_VERSION
+from simple_kanban_gui.modules.formats import is_board_file, read_board, dump_board
+from simple_kanban_gui.modules.icons   import standard_pixmap, theme_icon
 
 KANBAN_SUFFIX = ".kanban.json"
 
@@ -147,12 +148,30 @@ QMenu::item:disabled {
                                                 "title":"font-weight: bold; background-color: #ccffcc; color:#000000"
                                             },
                     "ok": "OK",
-                    "cancel": "Cancel"
+                    "cancel": "Cancel",
+                    "reminders_tooltip": "Kanban due-date reminders",
+                    "reminders_due": "Note due",
+                    "reminders_overdue": "notes due",
+                    "reminders_open_manager": "Open the kanban manager",
+                    "reminders_quit": "Quit reminders"
                 }
 
 configure.verify_default_config(CONFIG_PATH,default_content=DEFAULT_CONTENT)
 
-CONFIG=configure.load_config(CONFIG_PATH)
+# Recarregada quando o arquivo muda; CONFIG é o dicionário atualizado no lugar
+LIVE_CONFIG=configure.LiveConfig(CONFIG_PATH,default_content=DEFAULT_CONTENT)
+CONFIG=LIVE_CONFIG.data
+
+# Chaves que mudam só a folha de estilo dos cartões e pastas ou as suas medidas
+TILE_STYLE_KEYS = {"folder_style", "folder_label_style", "card_style"}
+TILE_LAYOUT_KEYS = {"folder_margin", "card_margin", "folder_spacing", "card_spacing", "folder_icon_size", "card_icon_size"}
+
+def on_config_changed(keys):
+    app = QApplication.instance()
+    if app is not None and "context_menu_style" in keys:
+        app.setStyleSheet(CONFIG["context_menu_style"])
+
+LIVE_CONFIG.changed.connect(on_config_changed)
 
 # ------------------------- Utilidades de Plataforma ------------------------- #
 
@@ -168,11 +187,19 @@ def open_with_default_app(path: str):
             subprocess.Popen(["xdg-open", path])
         return
     else:
-        if path.lower().endswith(KANBAN_SUFFIX):
+        if is_board_file(path):
             process = subprocess.Popen(["simple-kanban-gui", path])
             return
 # ------------------------------- Widgets UI -------------------------------- #
 
+def tile_stylesheet():
+    """
+    Folha de estilo dos FolderTile e KanbanCard (seletores pelos nomes dos objetos).
+    """
+    return "\n".join([ CONFIG["folder_style"],
+                        "#FolderTile QLabel#name {" + CONFIG["folder_label_style"] + "}",
+                        CONFIG["card_style"]])
+
 class FolderTile(QFrame):
     activated = QtCore.pyqtSignal(str)  # caminho
 
@@ -185,7 +212,6 @@ class FolderTile(QFrame):
         self.setCursor(Qt.PointingHandCursor)
         self.setFrameShape(QFrame.StyledPanel)
         self.setFrameShadow(QFrame.Raised)
-        self.setStyleSheet(CONFIG["folder_style"])
 
         lay = QVBoxLayout(self)
         lay.setContentsMargins( CONFIG["folder_margin"],
@@ -195,15 +221,13 @@ class FolderTile(QFrame):
         lay.setSpacing(CONFIG["folder_spacing"])
 
         icon_label = QLabel()
-        icon = self.style().standardIcon(QStyle.SP_DirIcon)
-        pix = icon.pixmap(CONFIG["folder_icon_size"], CONFIG["folder_icon_size"])
-        icon_label.setPixmap(pix)
+        icon_label.setPixmap(standard_pixmap(QStyle.SP_DirIcon, CONFIG["folder_icon_size"]))
         icon_label.setAlignment(Qt.AlignCenter)
 
         name_label = QLabel(name)
+        name_label.setObjectName("name")
         name_label.setAlignment(Qt.AlignCenter)
         name_label.setWordWrap(True)
-        name_label.setStyleSheet(CONFIG["folder_label_style"])
         name_label.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Maximum)
 
         lay.addWidget(icon_label)
@@ -231,7 +255,6 @@ class KanbanCard(QFrame):
         self.setFrameShape(QFrame.StyledPanel)
         self.setFrameShadow(QFrame.Raised)
         self.setCursor(Qt.PointingHandCursor)
-        self.setStyleSheet(CONFIG["card_style"])
 
         title, description = self._read_title_description(file_path)
 
@@ -250,9 +273,7 @@ class KanbanCard(QFrame):
         icon_label = QLabel()
         icon_label.setObjectName("icon")
         icon_label.setProperty("class", "icon")
-        icon = self.style().standardIcon(QStyle.SP_FileIcon)
-        pix = icon.pixmap(CONFIG["folder_icon_size"], CONFIG["folder_icon_size"])
-        icon_label.setPixmap(pix)
+        icon_label.setPixmap(standard_pixmap(QStyle.SP_FileIcon, CONFIG["folder_icon_size"]))
         header.addWidget(icon_label)
 
         #
@@ -306,8 +327,7 @@ class KanbanCard(QFrame):
         title = "(sem título)"
         description = ""
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = read_board(file_path)[0]
             if isinstance(data, dict):
                 title = str(data.get("title", title))
                 description = str(data.get("description", description))
@@ -367,13 +387,12 @@ class KanbanCard(QFrame):
             try:
                 data = {}
                 if os.path.exists(self.file_path):
-                    with open(self.file_path, "r", encoding="utf-8") as f:
-                        data = json.load(f)
+                    # Regravado no mesmo formato em que foi lido
+                    data, _, fmt, _ = read_board(self.file_path)
                         
                     data["title"] = title_edit.text().strip()
                     data["description"] = desc_edit.toPlainText().strip()
-                    with open(self.file_path, "w", encoding="utf-8") as f:
-                        json.dump(data, f, ensure_ascii=False, indent=4)
+                    dump_board(self.file_path, data, fmt)
                 
                 # atualizar labels
                 self.findChild(QLabel, "title").setText(data["title"])
@@ -394,7 +413,9 @@ class GridView(QtWidgets.QScrollArea):
         self.setWidgetResizable(True)
         self.viewport().setStyleSheet("background:white;")
 
+        # Estilos dos cartões e pastas aplicados uma única vez, no contêiner
         container = QWidget()
+        container.setStyleSheet(tile_stylesheet())
         self._grid = QtWidgets.QGridLayout(container)
         self._grid.setContentsMargins(12, 12, 12, 12)
         self._grid.setHorizontalSpacing(12)
@@ -404,6 +425,9 @@ class GridView(QtWidgets.QScrollArea):
         self._items = []  # type: list[QWidget]
         self._preferred_tile_width = 280  # px
 
+    def apply_style(self):
+        self.widget().setStyleSheet(tile_stylesheet())
+
     def setItems(self, widgets: list[QWidget]):
         # Limpar
         self._items = widgets
@@ -412,9 +436,10 @@ class GridView(QtWidgets.QScrollArea):
             w = item.widget()
             if w:
                 w.setParent(None)
-        # Ajustar altura igual
+        # Ajustar altura igual (medida já dentro do contêiner, com a folha de estilo)
         max_height = 0
         for w in widgets:
+            w.setParent(self.widget())
             w.setMinimumHeight(0)
             w.setMaximumHeight(16777215)
             max_height = max(max_height, w.sizeHint().height())
@@ -491,6 +516,10 @@ class MainWindow(QMainWindow):
         self.resize(CONFIG["window_width"], CONFIG["window_height"])
         self._current_dir = pathlib.Path(start_dir).resolve()
 
+        # Edições da configuração (open_configure_editor) valem sem reiniciar
+        LIVE_CONFIG.watch()
+        LIVE_CONFIG.changed.connect(self.on_config_changed)
+
         ## Icon
         # Get base directory for icons
         base_dir_path = os.path.dirname(os.path.abspath(__file__))
@@ -540,31 +569,31 @@ class MainWindow(QMainWindow):
         self.toolbar.addAction(act_gokanban)
         
         # Home
-        act_home = QAction(QIcon.fromTheme("go-home"), CONFIG["toolbar_home"], self)
+        act_home = QAction(theme_icon("go-home"), CONFIG["toolbar_home"], self)
         act_home.setToolTip(CONFIG["toolbar_home_tooltip"])
         act_home.triggered.connect(self.goto_home)
         self.toolbar.addAction(act_home)
 
         # Up
-        act_up = QAction(QIcon.fromTheme("go-up"), CONFIG["toolbar_up"], self)
+        act_up = QAction(theme_icon("go-up"), CONFIG["toolbar_up"], self)
         act_up.setToolTip(CONFIG["toolbar_up_tooltip"])
         act_up.triggered.connect(self.go_up)
         self.toolbar.addAction(act_up)
 
         # Refresh
-        act_refresh = QAction(QIcon.fromTheme("view-refresh"), CONFIG["toolbar_refresh"], self)
+        act_refresh = QAction(theme_icon("view-refresh"), CONFIG["toolbar_refresh"], self)
         act_refresh.setToolTip(CONFIG["toolbar_refresh_tooltip"])
         act_refresh.triggered.connect(self.refresh)
         self.toolbar.addAction(act_refresh)
 
         # Criar diretório
-        act_newdir = QAction(QIcon.fromTheme("folder-new"), CONFIG["toolbar_new_folder"], self)
+        act_newdir = QAction(theme_icon("folder-new"), CONFIG["toolbar_new_folder"], self)
         act_newdir.setToolTip(CONFIG["toolbar_new_folder_tooltip"])
         act_newdir.triggered.connect(self.create_new_dir)
         self.toolbar.addAction(act_newdir)
 
         # Criar card
-        act_newcard = QAction(QIcon.fromTheme("document-new"), CONFIG["toolbar_new_card"], self)
+        act_newcard = QAction(theme_icon("document-new"), CONFIG["toolbar_new_card"], self)
         act_newcard.setToolTip(CONFIG["toolbar_new_card_tooltip"])
         act_newcard.triggered.connect(self.create_new_card)
         self.toolbar.addAction(act_newcard)
@@ -575,26 +604,26 @@ class MainWindow(QMainWindow):
         self.toolbar.addWidget(spacer)
         
         # Set kanban
-        act_setkanban = QAction(QIcon.fromTheme("go-jump"), CONFIG["toolbar_set_kanban"], self)
+        act_setkanban = QAction(theme_icon("go-jump"), CONFIG["toolbar_set_kanban"], self)
         act_setkanban.setToolTip(CONFIG["toolbar_set_kanban_tooltip"])
         act_setkanban.triggered.connect(self.set_kanban_path)
         self.toolbar.addAction(act_setkanban)
         
         #
-        self.configure_action = QAction(QIcon.fromTheme("document-properties"), CONFIG["toolbar_configure"], self)
+        self.configure_action = QAction(theme_icon("document-properties"), CONFIG["toolbar_configure"], self)
         self.configure_action.setToolTip(CONFIG["toolbar_configure_tooltip"])
         self.configure_action.triggered.connect(self.open_configure_editor)
         self.toolbar.addAction(self.configure_action)
         
         #
         self.coffee_action = QAction(CONFIG["toolbar_coffee"], self)
-        self.coffee_action.setIcon(QIcon.fromTheme("emblem-favorite"))
+        self.coffee_action.setIcon(theme_icon("emblem-favorite"))
         self.coffee_action.setToolTip(CONFIG["toolbar_coffee_tooltip"])
         self.coffee_action.triggered.connect(self.on_coffee_action_click)
         self.toolbar.addAction(self.coffee_action)
         
         #
-        self.about_action = QAction(QIcon.fromTheme('help-about'), CONFIG["toolbar_about"], self)
+        self.about_action = QAction(theme_icon('help-about'), CONFIG["toolbar_about"], self)
         self.about_action.triggered.connect(self.open_about)
         self.about_action.setToolTip(CONFIG["toolbar_about_tooltip"])
         self.toolbar.addAction(self.about_action)
@@ -620,26 +649,30 @@ class MainWindow(QMainWindow):
                 QMessageBox.warning(self, CONFIG["error"], CONFIG["directory_not_exist"]+f"\n{dir_path}")
                 return
 
-            if filename.endswith(KANBAN_SUFFIX):
+            if is_board_file(filename):
                 filepath = os.path.join(dir_path, filename)
             else:
                 filepath = os.path.join(dir_path, filename + KANBAN_SUFFIX)
 
+            # O estilo é gravado uma vez no arquivo e referenciado pelo nome
             Boards=[]
             for board_name in CONFIG["new_card_board"]:
                 Boards.append(  { "title": board_name,
                                   "notes": [],
-                                  "style": CONFIG["new_card_board_style"] })
+                                  "style": "new_card" })
 
             data = {
                 "title": title,
                 "description": description,
+                STYLES_KEY: {"new_card": CONFIG["new_card_board_style"]},
+                FORMAT_KEY: FORMAT_VERSION,
                 "boards": Boards
             }
 
             try:
-                with open(filepath, "w", encoding="utf-8") as f:
-                    json.dump(data, f, indent=4, ensure_ascii=False)
+                # Ids estáveis desde a criação (recarga incremental do editor)
+                from simple_kanban_gui.modules.document import ensure_ids
+                dump_board(filepath, ensure_ids(data))
                 self.refresh()
                 #QMessageBox.information(self, "Sucesso", f"Card salvo em:\n{filepath}")
             except Exception as e:
@@ -687,6 +720,7 @@ class MainWindow(QMainWindow):
             "url_funding": about.__url_funding__,
             "url_bugs": about.__url_bugs__
         }
+        from simple_kanban_gui.modules.wabout import show_about_window
         show_about_window(data,self.icon_path)
 
     def _emit_path(self):
@@ -705,6 +739,12 @@ class MainWindow(QMainWindow):
     def refresh(self):
         self.navigate_to(str(self._current_dir))
 
+    def on_config_changed(self, keys):
+        if keys & TILE_STYLE_KEYS:
+            self.grid.apply_style()
+        if keys & TILE_LAYOUT_KEYS:
+            self.refresh()
+
     def navigate_to(self, path: str):
         p = pathlib.Path(path).expanduser()
         if not p.exists() or not p.is_dir():
@@ -737,14 +777,13 @@ class MainWindow(QMainWindow):
             tile.activated.connect(self.navigate_to)
             folders.append(tile)
 
-        # Arquivos *.kanban.json
-        files = [x for x in entries if x.is_file() and x.name.lower().endswith(KANBAN_SUFFIX)]
+        # Arquivos de quadros, em qualquer formato
+        files = [x for x in entries if x.is_file() and is_board_file(x.name)]
 
         # Pré-carregar títulos para ordenar pelos títulos caso disponíveis
         def read_title(fp: str) -> str:
             try:
-                with open(fp, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                data = read_board(fp)[0]
                 if isinstance(data, dict):
                     return str(data.get("title", ""))
             except Exception:
@@ -758,56 +797,60 @@ class MainWindow(QMainWindow):
         self.grid.setItems(folders + cards)
 
 
-def main():
-    signal.signal(signal.SIGINT, signal.SIG_DFL)
-    
-    create_desktop_directory()    
-    create_desktop_menu()
-    create_desktop_file(os.path.join("~",".local","share","applications"), 
-                        program_name=about.__manager_name__)
-    
-    filepath = os.getcwd()
-    if(len(sys.argv)==2):
-        if sys.argv[1] == "--autostart":
-            create_desktop_directory(overwrite = True)
-            create_desktop_menu(overwrite = True)
-            create_desktop_file(os.path.join("~",".config","autostart"), 
-                                overwrite=True, 
-                                program_name=about.__manager_name__)
-            return
-            
-        if sys.argv[1] == "--applications":
-            create_desktop_directory(overwrite = True)
-            create_desktop_menu(overwrite = True)
-            create_desktop_file(os.path.join("~",".local","share","applications"), 
-                                overwrite=True, 
-                                program_name=about.__manager_name__)
-            return
-        
-        if sys.argv[1] == "--last-path":
-            filepath = INFO["last_path"]
+def run_reminders():
+    """
+    Processo residente na bandeja: indexa os vencimentos ("due") das notas
+    dos quadros sob o diretório kanban e notifica cada um na sua hora.
+    """
+    from simple_kanban_gui.modules.reminders import ReminderService, ReminderTray
+
+    app = QApplication(sys.argv)
+    app.setApplicationName(about.__manager_name__)
+    app.setStyleSheet(CONFIG["context_menu_style"])
+    app.setQuitOnLastWindowClosed(False)
+
+    base_dir_path = os.path.dirname(os.path.abspath(__file__))
+    icon = QIcon(os.path.join(base_dir_path, 'icons', 'logo.png'))
+
+    service = ReminderService(INFO["kanban_path"])
+    labels = {  "tooltip": CONFIG["reminders_tooltip"],
+                "due": CONFIG["reminders_due"],
+                "overdue": CONFIG["reminders_overdue"],
+                "open_manager": CONFIG["reminders_open_manager"],
+                "quit": CONFIG["reminders_quit"]}
+    tray = ReminderTray(service, icon, labels)
+    tray.open_board.connect(open_with_default_app)
+
+    windows = []
+    def open_manager():
+        if not windows:
+            windows.append(MainWindow(INFO["kanban_path"]))
+        windows[0].show()
+        windows[0].raise_()
+    tray.open_manager.connect(open_manager)
+
+    tray.show()
+    service.start()
+    sys.exit(app.exec_())
 
-        if os.path.exists(sys.argv[1]):
-            filepath = sys.argv[1]
-    else:
-        for n in range(len(sys.argv)):
-            if sys.argv[n] == "--autostart":
-                create_desktop_directory(overwrite = True,program_name=about.__manager_name__)
-                create_desktop_menu(overwrite = True)
-                create_desktop_file(os.path.join("~",".config","autostart"), overwrite=True)
-                return
-            if sys.argv[n] == "--applications":
-                create_desktop_directory(overwrite = True,program_name=about.__manager_name__)
-                create_desktop_menu(overwrite = True)
-                create_desktop_file(os.path.join("~",".local","share","applications"), overwrite=True)
-                return
 
-            if sys.argv[n] == "--last-path":
-                filepath = INFO["last_path"]
+def run(path=None, last_path=False, profile=None):
+    """
+    Abre o navegador (os argumentos já foram lidos por launcher.manager_main).
+    """
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+    filepath = os.getcwd()
+    if last_path:
+        filepath = INFO["last_path"]
+    if path is not None and os.path.exists(path):
+        filepath = path
     
     app = QApplication(sys.argv)
     app.setStyleSheet(CONFIG["context_menu_style"])
     app.setApplicationName(about.__manager_name__) 
+    if profile is not None:
+        profile.mark("QApplication")
     
     # Aparência sutil
     #app.setStyle("Imagine") # "Fusion"
@@ -818,9 +861,20 @@ def main():
 
     w = MainWindow(filepath)
     w.show()
+    if profile is not None:
+        profile.mark("main window")
+        profile.watch_first_paint(w)
+
+    # Atalhos do menu de aplicativos criados só depois da primeira pintura
+    QtCore.QTimer.singleShot(0, lambda: install_desktop_entries_later(program_name=about.__manager_name__))
     sys.exit(app.exec_())
 
 
+def main():
+    from simple_kanban_gui.launcher import manager_main
+    manager_main(sys.modules[__name__])
+
+
 if __name__ == "__main__":
     main()
 
@@ -0,0 +1,82 @@
+import os
+import time
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from simple_kanban_gui.modules import codec
+from simple_kanban_gui.modules.journal import read_records
+from simple_kanban_gui.modules.formats import is_board_file, board_stem
+from simple_kanban_gui.modules.blobs import inline_note
+
+ARCHIVE_SUFFIX = ".kanban.archive.json"
+
+
+def archive_path(path):
+    """
+    Arquivo morto ao lado do quadro: "x.kanban.json" (ou "x.kanban.json.gz",
+    etc.) -> "x.kanban.archive.json".
+    """
+    if is_board_file(path):
+        return board_stem(path) + ARCHIVE_SUFFIX
+    return path + ".archive.json"
+
+
+def append_records(path, records):
+    """
+    Acrescenta registros (um JSON por linha) sem reescrever o arquivo.
+    """
+    with open(path, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(codec.dumps(record) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def archive_records(column, notes, path=""):
+    """
+    Registros das notas arquivadas da coluna do quadro `path`, com os
+    conteúdos em arquivos separados trazidos para dentro da nota.
+    """
+    now = int(time.time())
+    return [{"note": inline_note(dict(note), path), "board": column.get("title", ""), "board_id": column.get("id"),
+             "archived": now}
+            for note in notes]
+
+
+def restore_records(note_ids):
+    now = int(time.time())
+    return [{"restored": note_id, "time": now} for note_id in note_ids]
+
+
+def read_archive(path):
+    """
+    Registros das notas arquivadas, sem as que já foram restauradas ao quadro.
+    """
+    records = read_records(path)
+    restored = {}
+    for index, record in enumerate(records):
+        if "restored" in record:
+            restored[record["restored"]] = index
+    return [record for index, record in enumerate(records)
+            if "note" in record and restored.get(record["note"].get("id"), -1) < index]
+
+
+class ArchiveLoader(QThread):
+    """
+    Lê o arquivo morto fora da thread da GUI; só é usado quando a vista do
+    arquivo é aberta.
+    """
+    loaded = pyqtSignal(str, object)  # caminho, registros
+    failed = pyqtSignal(str, str)
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.path = path
+
+    def run(self):
+        try:
+            records = read_archive(self.path)
+        except Exception as e:
+            self.failed.emit(self.path, str(e))
+            return
+        self.loaded.emit(self.path, records)
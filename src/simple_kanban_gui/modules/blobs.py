@@ -0,0 +1,98 @@
+import os
+import hashlib
+import tempfile
+
+from simple_kanban_gui.modules.formats import board_stem
+
+# Nota com conteúdo fora do quadro: {"content_blob": hash, "content_size": caracteres}
+BLOB_KEY = "content_blob"
+SIZE_KEY = "content_size"
+BLOB_DIR_SUFFIX = ".kanban.blobs"
+
+
+def blob_dir(path):
+    """
+    Diretório dos conteúdos grandes: "x.kanban.json" -> "x.kanban.blobs".
+    """
+    return board_stem(path) + BLOB_DIR_SUFFIX
+
+
+def blob_path(path, digest):
+    return os.path.join(blob_dir(path), digest[:2], digest[2:])
+
+
+def is_stub(note):
+    """
+    Nota cujo conteúdo ainda está só no arquivo separado. Se a nota tiver
+    "content" (editada ou lida de um diário), ele prevalece.
+    """
+    return BLOB_KEY in note and "content" not in note
+
+
+def read_blob(path, digest):
+    with open(blob_path(path, digest), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def note_text(note, path):
+    """
+    Conteúdo da nota, lido do arquivo separado se preciso ("" se ele não
+    for encontrado).
+    """
+    if is_stub(note):
+        try:
+            return read_blob(path, note[BLOB_KEY])
+        except OSError as e:
+            print(f"Note content not found: {e}")
+            return ""
+    return note.get("content", "")
+
+
+def inline_note(note, path):
+    """
+    Traz o conteúdo de volta para dentro da nota (antes de ela ir para um
+    quadro com outro diretório de conteúdos).
+    """
+    if is_stub(note):
+        try:
+            note["content"] = read_blob(path, note[BLOB_KEY])
+        except OSError as e:
+            print(f"Note content not found: {e}")
+            return note
+    note.pop(BLOB_KEY, None)
+    note.pop(SIZE_KEY, None)
+    return note
+
+
+def externalize_notes(path, notes, threshold):
+    """
+    Cópias das notas com os conteúdos maiores que `threshold` caracteres
+    trocados por referências. Cada conteúdo é gravado uma única vez, com o
+    nome do seu hash; conteúdos já presentes não são regravados.
+    """
+    result = []
+    for note in notes:
+        content = note.get("content")
+        if content is None:
+            result.append(note)  # referência já existente
+            continue
+        if BLOB_KEY in note or SIZE_KEY in note:
+            # Referência antiga de uma nota editada depois
+            note = {key: value for key, value in note.items() if key not in (BLOB_KEY, SIZE_KEY)}
+        if threshold and len(content) > threshold:
+            note = dict(note)
+            data = content.encode("utf-8")
+            digest = hashlib.sha1(data).hexdigest()
+            target = blob_path(path, digest)
+            if not os.path.exists(target):
+                directory = os.path.dirname(target)
+                os.makedirs(directory, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=directory)
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, target)
+            del note["content"]
+            note[BLOB_KEY] = digest
+            note[SIZE_KEY] = len(content)
+        result.append(note)
+    return result
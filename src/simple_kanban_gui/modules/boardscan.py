@@ -0,0 +1,266 @@
+import os
+
+from PyQt5.QtCore import QObject, QThread, QTimer, QFileSystemWatcher, pyqtSignal
+
+from simple_kanban_gui.modules.formats import is_board_file, read_board
+from simple_kanban_gui.modules.journal import journal_path, replay
+from simple_kanban_gui.modules.shards import is_sharded, read_shard, shard_dir, SHARD_DIR_SUFFIX
+
+# Espera (ms) para juntar os eventos de uma gravação antes de reler os arquivos
+SCAN_DELAY_MS = 1000
+
+# Máximo de caminhos observados por um BoardWatcher (cada um é um watch do
+# inotify, limitados por usuário em /proc/sys/fs/inotify/max_user_watches)
+MAX_WATCHES = 256
+
+# Intervalo (ms) das releituras dos caminhos que passaram de MAX_WATCHES
+POLL_INTERVAL_MS = 30000
+
+
+def file_signature(path):
+    """
+    Datas de modificação do quadro, do diário e do diretório das colunas;
+    o quadro só é relido quando alguma delas muda.
+    """
+    signature = []
+    for p in (path, journal_path(path), shard_dir(path)):
+        try:
+            signature.append(os.stat(p).st_mtime_ns)
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+def read_board_data(path):
+    """
+    Dados completos de um quadro: colunas de um quadro dividido lidas e
+    operações do diário reaplicadas.
+    """
+    data = read_board(path)[0]
+    if is_sharded(data):
+        for board in data["boards"]:
+            try:
+                board["notes"] = read_shard(path, board["id"])[0]
+            except OSError:
+                board["notes"] = []
+    replay(data, journal_path(path))
+    return data
+
+
+class BoardScanner(QThread):
+    """
+    Relê fora da thread da GUI os quadros cuja assinatura mudou, passando os
+    dados de cada um (e o caminho) por `extract`. Com `walk`, percorre os diretórios
+    recursivamente (leitura inicial); sem ele, só entra nas subpastas ainda
+    não vistas (criadas depois).
+    """
+    scanned = pyqtSignal(object, object)  # [(caminho, assinatura, entradas ou None)], diretórios
+
+    def __init__(self, directories, known, extract, walk=False, seen=(), parent=None):
+        super().__init__(parent)
+        self.directories = directories
+        self.known = known      # caminho -> assinatura
+        self.extract = extract
+        self.walk = walk
+        self.seen = seen        # diretórios já percorridos
+
+    def list_directory(self, directory, found, directories, walk):
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return
+        directories.append(directory)
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                if walk or entry.path not in self.seen:
+                    self.list_directory(entry.path, found, directories, True)
+                elif entry.name.endswith(SHARD_DIR_SUFFIX):
+                    self.list_directory(entry.path, found, directories, False)
+            elif is_board_file(entry.name):
+                found.add(entry.path)
+
+    def run(self):
+        found = set()
+        directories = []
+        for directory in self.directories:
+            self.list_directory(directory, found, directories, self.walk)
+        results = []
+        scanned = set(self.directories) | set(directories)
+        for path in self.known:
+            # Quadros apagados ou renomeados
+            if path not in found and (os.path.dirname(path) in scanned or not os.path.exists(path)):
+                results.append((path, None, None))
+        for path in found:
+            signature = file_signature(path)
+            if signature == self.known.get(path):
+                continue
+            try:
+                entries = self.extract(read_board_data(path), path)
+            except Exception as e:
+                print(f"Error reading {path}: {e}")
+                entries = {}
+            results.append((path, signature, entries))
+        self.scanned.emit(results, directories)
+
+
+class BoardWatcher(QObject):
+    """
+    Mantém `extract(dados, caminho)` atualizado para todos os quadros sob `root`.
+    A primeira leitura percorre a árvore; depois só são relidos os quadros
+    dos diretórios avisados pelo QFileSystemWatcher (inotify) cuja
+    assinatura mudou.
+
+    Só são observados `root`, os diretórios com quadros (e os das suas
+    colunas e diários) e os diretórios entre eles e `root`, até `max_watches`
+    caminhos; os que passam do limite são relidos a cada `poll_interval` ms
+    (um aviso é impresso quando isso começa). Um quadro novo numa pasta fora
+    desses caminhos só aparece na próxima leitura completa (rescan).
+    """
+    updated = pyqtSignal(object)  # [(caminho, entradas ou None se o quadro sumiu)]
+
+    def __init__(self, root, extract, parent=None, max_watches=MAX_WATCHES, poll_interval=POLL_INTERVAL_MS):
+        super().__init__(parent)
+        self.root = os.path.normpath(os.path.expanduser(root))
+        self.extract = extract
+        self.max_watches = max_watches
+        self.signatures = {}  # caminho -> assinatura da última leitura
+        self.seen = set()     # diretórios já percorridos
+        self.unwatched = []   # caminhos além de max_watches, relidos por poll_timer
+        self.scanner = None
+        self.pending = set()
+        self.pending_walk = set()
+        self.stopped = False
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.on_path_changed)
+        self.watcher.fileChanged.connect(self.on_path_changed)
+
+        self.scan_timer = QTimer(self)
+        self.scan_timer.setSingleShot(True)
+        self.scan_timer.setInterval(SCAN_DELAY_MS)
+        self.scan_timer.timeout.connect(self.scan_pending)
+
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(poll_interval)
+        self.poll_timer.timeout.connect(self.poll_unwatched)
+
+    def start(self):
+        self.pending_walk.add(self.root)
+        self.scan_pending()
+
+    def rescan(self):
+        """
+        Percorre de novo a árvore inteira.
+        """
+        self.seen = set()
+        self.start()
+
+    def board_directory(self, path):
+        """
+        Diretório a reler quando `path` (observado) muda.
+        """
+        if os.path.isdir(path):
+            directory = path
+        else:
+            directory = os.path.dirname(path)
+        # Colunas de um quadro dividido: o quadro está no diretório acima
+        if directory.endswith(SHARD_DIR_SUFFIX):
+            directory = os.path.dirname(directory)
+        return directory
+
+    def on_path_changed(self, path):
+        self.pending.add(self.board_directory(path))
+        self.scan_timer.start()
+
+    def scan_pending(self):
+        if self.scanner is not None or self.stopped:
+            return  # retomado quando a leitura atual terminar
+        walk = bool(self.pending_walk)
+        directories = sorted(self.pending_walk if walk else self.pending)
+        if walk:
+            self.pending_walk.clear()
+        else:
+            self.pending.clear()
+        if not directories:
+            return
+        self.scanner = BoardScanner(directories, dict(self.signatures), self.extract, walk, frozenset(self.seen), self)
+        self.scanner.scanned.connect(self.on_scanned)
+        self.scanner.finished.connect(self.on_scanner_finished)
+        self.scanner.start()
+
+    def on_scanned(self, results, directories):
+        self.seen.update(directories)
+        updated = []
+        for path, signature, entries in results:
+            if signature is None:
+                self.signatures.pop(path, None)
+            else:
+                self.signatures[path] = signature
+            updated.append((path, entries))
+        self.update_watches()
+        self.updated.emit(updated)
+
+    def wanted_paths(self):
+        """
+        Caminhos a observar, os mais importantes primeiro: `root`, os
+        diretórios dos quadros e das suas colunas, os diários (crescem sem
+        mudar o diretório) e os diretórios intermediários.
+        """
+        boards = sorted(self.signatures)
+        wanted = [self.root]
+        wanted += sorted(set(os.path.dirname(path) for path in boards))
+        wanted += [shard_dir(path) for path in boards if self.signatures[path][2] is not None]
+        wanted += [journal_path(path) for path in boards if self.signatures[path][1] is not None]
+        parents = set()
+        for path in boards:
+            directory = os.path.dirname(os.path.dirname(path))
+            while directory.startswith(self.root + os.sep) and directory not in parents:
+                parents.add(directory)
+                directory = os.path.dirname(directory)
+        wanted += sorted(parents)
+        return list(dict.fromkeys(wanted))
+
+    def update_watches(self):
+        wanted = self.wanted_paths()
+        if len(wanted) > self.max_watches:
+            if not self.unwatched:
+                print(f"Watching only {self.max_watches} of {len(wanted)} paths under {self.root}; "
+                      f"the others are rescanned every {self.poll_timer.interval() // 1000} s")
+                self.poll_timer.start()
+            self.unwatched = wanted[self.max_watches:]
+            wanted = wanted[:self.max_watches]
+        elif self.unwatched:
+            self.unwatched = []
+            self.poll_timer.stop()
+        keep = set(wanted)
+        current = self.watcher.directories() + self.watcher.files()
+        old = [path for path in current if path not in keep]
+        if old:
+            self.watcher.removePaths(old)
+        current = set(current)
+        new = [path for path in wanted if path not in current]
+        if new:
+            self.watcher.addPaths(new)
+
+    def poll_unwatched(self):
+        """
+        Relê os caminhos sem watch como se o inotify tivesse avisado uma
+        mudança; só os quadros com assinatura nova são lidos de fato.
+        """
+        self.pending.update(self.board_directory(path) for path in self.unwatched)
+        self.scan_pending()
+
+    def on_scanner_finished(self):
+        self.scanner.deleteLater()
+        self.scanner = None
+        if self.pending or self.pending_walk:
+            self.scan_pending()
+
+    def stop(self):
+        self.stopped = True
+        self.scan_timer.stop()
+        self.poll_timer.stop()
+        if self.scanner is not None:
+            self.scanner.wait()
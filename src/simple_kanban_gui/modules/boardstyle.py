@@ -0,0 +1,149 @@
+from PyQt5.QtCore import Qt, QObject
+from PyQt5.QtWidgets import QWidget
+
+# Nomes dos objetos e propriedades dinâmicas usados pelos seletores
+COLUMN_NAME = "column"
+COLUMN_TITLE_NAME = "columnTitle"
+NOTE_NAME = "note"
+NOTE_DUE_NAME = "noteDue"
+STYLE_PROPERTY = "kanbanStyle"   # coluna: nome do estilo na folha
+CONFLICT_PROPERTY = "conflict"   # nota: True se em conflito com o disco
+DUE_PROPERTY = "due"             # botão de vencimento: "", "pending" ou "overdue"
+
+
+def repolish(widget):
+    """
+    Recalcula o estilo de `widget` e dos filhos depois da troca de uma
+    propriedade usada pelos seletores. Widgets ainda não exibidos são
+    polidos com o valor atual ao aparecer.
+    """
+    if not widget.testAttribute(Qt.WA_WState_Polished):
+        return
+    style = widget.style()
+    for w in [widget] + widget.findChildren(QWidget):
+        style.unpolish(w)
+        style.polish(w)
+    widget.update()
+
+
+class BoardStyleSheet(QObject):
+    """
+    Uma única folha de estilo para todas as colunas e notas, aplicada nos
+    contêineres dos quadros (fora deles nenhum widget é comparado com estas
+    regras). Os estilos das colunas e das notas são declarações sem seletor
+    que, antes, cada widget recebia na sua própria folha (valendo também para
+    os filhos); aqui cada uma vira uma regra com os mesmos efeitos:
+
+      coluna   #column[kanbanStyle="sN"], #column[kanbanStyle="sN"] *
+      título   #column[kanbanStyle="sN"] #columnTitle
+      nota     #column #note, #column #note *   (mais específica que a coluna)
+
+    Cada estilo de coluna recebe um nome na primeira vez que é usado; a folha
+    só é refeita quando aparece um estilo novo, o que acontece ao criar a
+    coluna, antes de os seus widgets serem exibidos e polidos. Nessa hora os
+    nomes que nenhuma coluna dos contêineres usa mais são descartados (menos
+    os estilos fixados com pin, os da configuração), para a folha não crescer
+    a cada estilo editado.
+    """
+    def __init__(self, note_frame, note_conflict, due, overdue, parent=None):
+        super().__init__(parent)
+        self.note_frame = note_frame
+        self.note_conflict = note_conflict
+        self.due = due
+        self.overdue = overdue
+        self.names = {}      # (frame, title) -> nome do estilo
+        self.pinned = set()  # chaves mantidas mesmo sem colunas
+        self.serial = 0      # nomes descartados não são reaproveitados
+        self.sheet = self.text()
+        self.containers = []
+
+    def style_name(self, style):
+        """
+        Nome (valor da propriedade kanbanStyle) de um estilo de coluna.
+        """
+        return self.style_names([style])[0]
+
+    def style_names(self, styles):
+        """
+        Nomes de vários estilos, refazendo a folha uma única vez.
+        """
+        names = []
+        new = False
+        for style in styles:
+            key = (style["frame"], style["title"])
+            name = self.names.get(key)
+            if name is None:
+                name = self.names[key] = "s" + str(self.serial)
+                self.serial += 1
+                new = True
+            names.append(name)
+        if new:
+            self.prune(keep=set(names))
+            self.update_sheet()
+        return names
+
+    def pin(self, styles):
+        """
+        Estilos mantidos na folha mesmo sem colunas (os da configuração);
+        substitui os fixados antes.
+        """
+        self.pinned = {(style["frame"], style["title"]) for style in styles}
+        self.style_names(styles)
+        self.prune()
+        self.update_sheet()
+
+    def prune(self, keep=()):
+        """
+        Descarta os nomes que nenhuma coluna dos contêineres usa, menos os
+        fixados e os de `keep`.
+        """
+        used = set(keep)
+        for container in self.containers:
+            for column in container.findChildren(QWidget, COLUMN_NAME):
+                used.add(column.property(STYLE_PROPERTY))
+        self.names = {key: name for key, name in self.names.items()
+                      if name in used or key in self.pinned}
+
+    def set_note_styles(self, note_frame, note_conflict, due, overdue):
+        """
+        Troca os estilos das notas (configuração recarregada).
+        """
+        self.note_frame = note_frame
+        self.note_conflict = note_conflict
+        self.due = due
+        self.overdue = overdue
+        self.update_sheet()
+
+    def update_sheet(self):
+        sheet = self.text()
+        if sheet == self.sheet:
+            return
+        self.sheet = sheet
+        for container in self.containers:
+            # O Qt só descarta a folha já interpretada de um widget polido;
+            # num contêiner ainda não exibido a antiga continuaria valendo
+            container.ensurePolished()
+            container.setStyleSheet(sheet)
+
+    def text(self):
+        rules = []
+        for (frame, title), name in self.names.items():
+            column = f'#{COLUMN_NAME}[{STYLE_PROPERTY}="{name}"]'
+            rules.append(f"{column}, {column} * {{{frame}}}")
+            rules.append(f"{column} #{COLUMN_TITLE_NAME} {{{title}}}")
+        note = f"#{COLUMN_NAME} #{NOTE_NAME}"
+        rules.append(f"{note}, {note} * {{{self.note_frame}}}")
+        conflict = f'{note}[{CONFLICT_PROPERTY}="true"]'
+        rules.append(f"{conflict}, {conflict} * {{{self.note_conflict}}}")
+        due = f"{note} #{NOTE_DUE_NAME}"
+        rules.append(f'{due}[{DUE_PROPERTY}="pending"] {{{self.due}}}')
+        rules.append(f'{due}[{DUE_PROPERTY}="overdue"] {{{self.overdue}}}')
+        return "\n".join(rules)
+
+    def attach(self, container):
+        """
+        Aplica a folha em `container`, mantendo-a atualizada.
+        """
+        container.setStyleSheet(self.sheet)
+        self.containers.append(container)
+        container.destroyed.connect(lambda: self.containers.remove(container))
@@ -0,0 +1,70 @@
+import json
+
+# Backend rápido opcional: sem o pacote, usa o json da biblioteca padrão
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+# orjson.JSONDecodeError é subclasse de json.JSONDecodeError
+DecodeError = json.JSONDecodeError
+
+
+def loads(data):
+    """
+    Lê um JSON de bytes (sem decodificar antes) ou de texto.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, (bytearray, memoryview)):
+        data = bytes(data)
+    return json.loads(data)
+
+
+def dumpb(obj, indent=False, sort_keys=False):
+    """
+    JSON em UTF-8. Compacto (sem espaços) por padrão; com `indent`, dois
+    espaços por nível.
+    """
+    if orjson is not None:
+        option = 0
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, option=option)
+        except orjson.JSONEncodeError:
+            pass  # chaves não textuais, inteiros grandes: a biblioteca padrão aceita
+    return _stdlib_dumps(obj, indent, sort_keys).encode("utf-8")
+
+
+def dumps(obj, indent=False, sort_keys=False):
+    """
+    Como dumpb, mas devolve texto.
+    """
+    if orjson is not None:
+        return dumpb(obj, indent, sort_keys).decode("utf-8")
+    return _stdlib_dumps(obj, indent, sort_keys)
+
+
+def _stdlib_dumps(obj, indent, sort_keys):
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2, sort_keys=sort_keys)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys)
+
+
+def load(f):
+    """
+    Lê um arquivo aberto em modo binário ou texto.
+    """
+    return loads(f.read())
+
+
+def dump(obj, f, indent=False):
+    """
+    Grava num arquivo aberto em modo texto.
+    """
+    f.write(dumps(obj, indent))
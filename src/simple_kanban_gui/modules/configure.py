@@ -1,6 +1,10 @@
 import os
 import json
 
+from PyQt5.QtCore import QObject, QTimer, QFileSystemWatcher, pyqtSignal
+
+from simple_kanban_gui.modules import codec
+
 def verify_default_config(path,default_content={}):
     """
     Cria o arquivo JSON no caminho especificado com conteúdo padrão,
@@ -34,10 +38,10 @@ def load_config(config_path, default_content=None):
     """
     config = {}
     if os.path.exists(config_path):
-        with open(config_path, 'r', encoding='utf-8') as f:
+        with open(config_path, 'rb') as f:
             try:
-                config = json.load(f)
-            except json.JSONDecodeError:
+                config = codec.load(f)
+            except codec.DecodeError:
                 print("Erro ao ler config, usando defaults")
                 config = {}
 
@@ -57,3 +61,86 @@ def save_config(path,content):
     with open(path, 'w', encoding='utf-8') as f:
         json.dump(content, f, ensure_ascii=False, indent=4)
 
+
+
+def file_signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class LiveConfig(QObject):
+    """
+    Configuração recarregada quando o arquivo muda.
+
+    `data` é um dicionário comum (as leituras continuam sendo um acesso
+    direto) atualizado no lugar; quem guardou a referência vê os valores
+    novos. O arquivo só é relido e completado com os valores padrão quando a
+    data de modificação ou o tamanho mudam; um JSON inválido (arquivo ainda
+    sendo gravado) mantém os valores atuais.
+    """
+    changed = pyqtSignal(object)  # chaves cujo valor mudou
+
+    # Espera (ms) para juntar os eventos de uma gravação
+    RELOAD_DELAY_MS = 200
+
+    def __init__(self, path, default_content=None, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.defaults = default_content
+        self.signature = file_signature(path)
+        self.data = load_config(path, default_content)
+        self.watcher = None
+        self.reload_timer = None
+
+    def watch(self):
+        """
+        Passa a observar o arquivo (precisa do laço de eventos do Qt).
+        """
+        if self.watcher is not None:
+            return
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.schedule_reload)
+        self.watcher.directoryChanged.connect(self.schedule_reload)
+        self.reload_timer = QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.setInterval(self.RELOAD_DELAY_MS)
+        self.reload_timer.timeout.connect(self.reload)
+        # O diretório também: editores gravam num arquivo novo e o renomeiam
+        self.watcher.addPath(os.path.dirname(self.path))
+        self.watch_file()
+
+    def watch_file(self):
+        if self.path not in self.watcher.files() and os.path.exists(self.path):
+            self.watcher.addPath(self.path)
+
+    def schedule_reload(self, _path=None):
+        self.reload_timer.start()
+
+    def reload(self):
+        """
+        Relê o arquivo se ele mudou. Devolve o conjunto das chaves alteradas.
+        """
+        if self.watcher is not None:
+            self.watch_file()
+        signature = file_signature(self.path)
+        if signature is None or signature == self.signature:
+            return set()
+        self.signature = signature
+        try:
+            with open(self.path, 'rb') as f:
+                config = codec.load(f)
+        except (OSError, codec.DecodeError) as e:
+            print(f"Erro ao ler config, mantendo os valores atuais: {e}")
+            return set()
+        if self.defaults:
+            config = merge_defaults(config, self.defaults)
+        keys = set(config) | set(self.data)
+        changed = set(key for key in keys if config.get(key) != self.data.get(key))
+        if changed:
+            self.data.clear()
+            self.data.update(config)
+            self.changed.emit(changed)
+        return changed
@@ -0,0 +1,820 @@
+import os
+import time
+import uuid
+import hashlib
+import tempfile
+
+from PyQt5.QtCore import QObject, QThread, QTimer, pyqtSignal
+
+from simple_kanban_gui.modules import codec
+from simple_kanban_gui.modules.search import NoteIndex
+from simple_kanban_gui.modules.shards import (
+    LAYOUT_KEY, SHARDED, is_sharded, shard_dir, shard_path, encode_shard,
+    shard_digest, combined_digest, remove_shards
+)
+from simple_kanban_gui.modules.formats import encode_board, format_for_path
+from simple_kanban_gui.modules.blobs import BLOB_KEY, SIZE_KEY, externalize_notes
+from simple_kanban_gui.modules.styles import STYLES_KEY, normalize_styles, resolve_style, inline_style
+
+
+def index_of(items, obj):
+    """
+    Índice de `obj` em `items` por identidade (list.index compara por valor).
+    """
+    for i, item in enumerate(items):
+        if item is obj:
+            return i
+    raise ValueError("object not in list")
+
+
+def new_id():
+    return uuid.uuid4().hex[:12]
+
+
+def ensure_ids(data):
+    """
+    Atribui identificadores estáveis às colunas e notas que ainda não têm
+    (arquivos gravados por versões anteriores). Notas sem data de modificação
+    passam a contar a partir de agora.
+    """
+    now = int(time.time())
+    for board in data.get("boards", []):
+        if "id" not in board:
+            board["id"] = new_id()
+        for note in board.setdefault("notes", []):
+            if "id" not in note:
+                note["id"] = new_id()
+            if "modified" not in note:
+                note["modified"] = now
+    return data
+
+
+def note_fields(note):
+    return {key: value for key, value in note.items() if key != "id"}
+
+
+def same_note(note, fields):
+    """
+    Compara uma nota com os campos guardados de outra, sem "modified".
+    """
+    if fields is None:
+        return False
+    return ({key: value for key, value in note.items() if key not in ("id", "modified")}
+            == {key: value for key, value in fields.items() if key != "modified"})
+
+
+def board_layout(boards):
+    """
+    Ids das colunas e das suas notas, na ordem: [(id da coluna, [ids das notas])].
+    """
+    return [(board["id"], [note["id"] for note in board.get("notes", [])]) for board in boards]
+
+
+def adopt_ids(data, layout, base):
+    """
+    Ids para as colunas e notas de `data` sem ids (arquivo gravado por uma
+    versão anterior ou por outro programa), tirados da última versão lida ou
+    gravada: `layout` (board_layout) e `base` (id -> campos da nota). Uma
+    coluna recebe o id da coluna na mesma posição; uma nota, o de uma nota
+    igual dessa coluna ou, se não houver, o da nota na mesma posição. Sem isso
+    ensure_ids daria ids novos a tudo e merge trataria tudo como novo.
+    """
+    boards = data.get("boards", [])
+    claimed_columns = set(board["id"] for board in boards if "id" in board)
+    claimed = set(note["id"] for board in boards for note in board.get("notes", []) if "id" in note)
+    for position, board in enumerate(boards):
+        column_id, note_ids = layout[position] if position < len(layout) else (None, [])
+        if "id" not in board and column_id is not None and column_id not in claimed_columns:
+            board["id"] = column_id
+            claimed_columns.add(column_id)
+        notes = board.get("notes", [])
+        for note in notes:
+            if "id" in note:
+                continue
+            for note_id in note_ids:
+                if note_id not in claimed and same_note(note, base.get(note_id)):
+                    note["id"] = note_id
+                    claimed.add(note_id)
+                    break
+        for index, note in enumerate(notes):
+            if "id" not in note and index < len(note_ids) and note_ids[index] not in claimed:
+                note["id"] = note_ids[index]
+                claimed.add(note["id"])
+        # A data de modificação só é mantida se a nota não mudou
+        for note in notes:
+            fields = base.get(note.get("id"))
+            if "modified" not in note and same_note(note, fields) and "modified" in fields:
+                note["modified"] = fields["modified"]
+    return data
+
+
+def column_header(column):
+    return {key: value for key, value in column.items() if key != "notes"}
+
+
+def copy_column(column):
+    return dict(column, notes=[dict(note) for note in column.get("notes", [])])
+
+
+def encode_column(column):
+    """
+    JSON de uma coluna já indentado na posição que ocupa dentro de "boards".
+    """
+    text = codec.dumps(column, indent=True)
+    return "    " + text.replace("\n", "\n    ")
+
+
+def assemble_document(meta, fragments):
+    """
+    Monta o texto do arquivo a partir dos campos de topo e dos fragmentos das
+    colunas. O resultado é idêntico a codec.dumps(data, indent=True).
+    """
+    head = codec.dumps(meta, indent=True)
+    if len(meta) == 0:
+        head = "{\n  "
+    else:
+        head = head[:-2] + ",\n  "
+    if len(fragments) == 0:
+        return head + '"boards": []\n}'
+    return head + '"boards": [\n' + ",\n".join(fragments) + "\n  ]\n}"
+
+
+def write_atomic(path, content):
+    """
+    Grava `content` (texto ou bytes) num arquivo temporário no mesmo diretório
+    e o renomeia sobre `path`.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=directory)
+    try:
+        if isinstance(content, bytes):
+            f = os.fdopen(fd, "wb")
+        else:
+            f = os.fdopen(fd, "w", encoding="utf-8")
+        with f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class BoardDocument(QObject):
+    """
+    Modelo em memória de um arquivo *.kanban.json.
+
+    Os widgets guardam referências aos dicionários de colunas e notas deste
+    modelo e chamam os métodos abaixo ao editar. Cada alteração marca a coluna
+    afetada como suja e emite `changed` com um registro da operação.
+    """
+    changed = pyqtSignal(object)  # registro da operação
+
+    def __init__(self, data=None, parent=None, index=None, unloaded=None, source=""):
+        super().__init__(parent)
+        data = normalize_styles(data or {})
+        self.meta = {key: value for key, value in data.items() if key != "boards"}
+        self.meta.setdefault("title", "")
+        self.meta.setdefault("description", "")
+        self.columns = list(data.get("boards", []))
+
+        ensure_ids(self.to_dict())
+
+        # Colunas de um quadro dividido cujas notas ainda não foram lidas do
+        # arquivo `source` (de onde vêm também os conteúdos em arquivos separados)
+        self.unloaded = set(unloaded or ())
+        self.source = source
+
+        # Índice de busca das notas, mantido a cada operação
+        self.index = index if index is not None else NoteIndex.from_boards(self.columns, source)
+
+        # Fragmentos JSON das colunas limpas, por id() da coluna (no formato
+        # dividido, o texto do arquivo da coluna)
+        self.fragments = {}
+        self.dirty = set(id(column) for column in self.columns if column["id"] not in self.unloaded)
+        self.meta_dirty = True
+
+        # Estado da última versão gravada/lida do arquivo base (por id de nota)
+        # e alterações locais feitas depois dela
+        self.base = {}
+        for column in self.columns:
+            for note in column["notes"]:
+                self.base[note["id"]] = note_fields(note)
+        # Posições dos ids nessa versão, para reconhecer as colunas e notas
+        # de uma versão gravada sem ids (adopt_ids)
+        self.layout = board_layout(self.columns)
+        self.local = self.new_local()
+        self.saving = self.new_local()
+        self.conflicts = set()
+
+    # ----------------------------------------------------------------- dados
+    def to_dict(self):
+        return dict(self.meta, boards=self.columns)
+
+    def column_style(self, column):
+        """
+        Estilo compartilhado (frame, title) da coluna.
+        """
+        return resolve_style(column.get("style"), self.meta.get(STYLES_KEY))
+
+    def column_index(self, column):
+        return index_of(self.columns, column)
+
+    def note_index(self, column, note):
+        return index_of(column["notes"], note)
+
+    def mark_dirty(self, column=None):
+        if column is None:
+            self.meta_dirty = True
+        else:
+            self.dirty.add(id(column))
+            self.fragments.pop(id(column), None)
+
+    def mark_all_dirty(self):
+        self.fragments = {}
+        self.dirty = set(id(column) for column in self.columns)
+        self.meta_dirty = True
+
+    def is_dirty(self):
+        return self.meta_dirty or len(self.dirty) > 0
+
+    @staticmethod
+    def new_local():
+        return {"notes": set(), "removed": set(), "columns": set(), "removed_columns": set(),
+                "meta": False, "structure": False}
+
+    def is_local(self, kind, key):
+        return key in self.local[kind] or key in self.saving[kind]
+
+    def _emit(self, column, op):
+        self.mark_dirty(column)
+        self.changed.emit(op)
+
+    # ------------------------------------------------------------- operações
+    def set_meta(self, **fields):
+        self.meta.update(fields)
+        self.local["meta"] = True
+        self._emit(None, dict(op="set_meta", **fields))
+
+    def add_column(self, column, index=None):
+        if index is None:
+            index = len(self.columns)
+        ensure_ids({"boards": [column]})
+        self.columns.insert(index, column)
+        for note in column["notes"]:
+            self.index.update(note)
+        self.local["columns"].add(column["id"])
+        self.local["structure"] = True
+        self._emit(column, {"op": "add_board", "index": index, "board": column})
+
+    def remove_column(self, column):
+        index = self.column_index(column)
+        del self.columns[index]
+        for note in column["notes"]:
+            self.index.discard(note["id"])
+        self.local["removed_columns"].add(column["id"])
+        self.local["structure"] = True
+        self.dirty.discard(id(column))
+        self.fragments.pop(id(column), None)
+        self.meta_dirty = True
+        self.changed.emit({"op": "remove_board", "index": index})
+
+    def move_column(self, column, index):
+        old_index = self.column_index(column)
+        del self.columns[old_index]
+        self.columns.insert(index, column)
+        self.local["structure"] = True
+        self.meta_dirty = True
+        self.changed.emit({"op": "move_board", "from": old_index, "to": index})
+
+    def rename_column(self, column, title):
+        column["title"] = title
+        self.local["columns"].add(column["id"])
+        self._emit(column, {"op": "rename_board", "index": self.column_index(column), "title": title})
+
+    def set_column_style(self, column, style):
+        """
+        Troca o nome do estilo da coluna (None: estilo padrão).
+        """
+        if style is None:
+            column.pop("style", None)
+        else:
+            column["style"] = style
+        self.local["columns"].add(column["id"])
+        self._emit(column, {"op": "style_board", "index": self.column_index(column), "style": style})
+
+    def add_note(self, column, note, index=None):
+        notes = column["notes"]
+        if index is None:
+            index = len(notes)
+        note.setdefault("id", new_id())
+        note.setdefault("modified", int(time.time()))
+        notes.insert(index, note)
+        self.index.update(note)
+        self.local["notes"].add(note["id"])
+        self._emit(column, {"op": "add_note", "board": self.column_index(column), "index": index, "note": note})
+
+    def add_notes(self, column, notes, index=None):
+        """
+        Insere várias notas com uma única operação (e um único registro no diário).
+        """
+        if index is None:
+            index = len(column["notes"])
+        now = int(time.time())
+        for note in notes:
+            note.setdefault("id", new_id())
+            note.setdefault("modified", now)
+        column["notes"][index:index] = notes
+        self.index.update_many(notes)
+        self.local["notes"].update(note["id"] for note in notes)
+        self._emit(column, {"op": "add_notes", "board": self.column_index(column), "index": index, "notes": notes})
+
+    def remove_note(self, column, note):
+        index = self.note_index(column, note)
+        del column["notes"][index]
+        self.index.discard(note["id"])
+        self.local["removed"].add(note["id"])
+        self._emit(column, {"op": "remove_note", "board": self.column_index(column), "index": index})
+
+    def move_note(self, column, note, new_column, index):
+        old_index = self.note_index(column, note)
+        del column["notes"][old_index]
+        new_column["notes"].insert(index, note)
+        self.local["notes"].add(note["id"])
+        self.mark_dirty(column)
+        op = {"op": "move_note",
+              "board": self.column_index(column), "index": old_index,
+              "to_board": self.column_index(new_column), "to_index": index}
+        if new_column is not column:
+            # A idade de uma nota conta a partir da entrada na coluna atual
+            op["modified"] = note["modified"] = int(time.time())
+        self._emit(new_column, op)
+
+    def note_positions(self, items):
+        """
+        [coluna, posição] de cada par (coluna, nota), com um único índice por coluna.
+        """
+        columns = {}
+        positions = []
+        for column, note in items:
+            found = columns.get(id(column))
+            if found is None:
+                found = columns[id(column)] = (self.column_index(column), {id(n): i for i, n in enumerate(column["notes"])})
+            positions.append([found[0], found[1][id(note)]])
+        return positions
+
+    def _detach(self, items, positions):
+        # Do fim para o começo, para não deslocar as posições ainda não removidas
+        for (_, index), (column, _) in sorted(zip(positions, items), key=lambda pair: pair[0], reverse=True):
+            del column["notes"][index]
+            self.mark_dirty(column)
+
+    def remove_notes(self, items):
+        """
+        Retira várias notas [(coluna, nota)] com uma única operação.
+        """
+        positions = self.note_positions(items)
+        self._detach(items, positions)
+        for _, note in items:
+            self.index.discard(note["id"])
+            self.local["removed"].add(note["id"])
+        self.changed.emit({"op": "remove_notes", "notes": positions})
+
+    def move_notes(self, items, new_column, index):
+        """
+        Move várias notas [(coluna, nota)] para `new_column`, na ordem de
+        `items`, a partir de `index` (posição contada sem as notas movidas).
+        """
+        positions = self.note_positions(items)
+        self._detach(items, positions)
+        now = int(time.time())
+        for column, note in items:
+            if column is not new_column:
+                note["modified"] = now
+            self.local["notes"].add(note["id"])
+        new_column["notes"][index:index] = [note for _, note in items]
+        self._emit(new_column, {"op": "move_notes", "notes": positions,
+                                "to_board": self.column_index(new_column), "to_index": index, "modified": now})
+
+    def edit_note(self, column, note, **fields):
+        fields.setdefault("modified", int(time.time()))
+        if "content" in fields:
+            # O conteúdo novo substitui o que estava num arquivo separado
+            note.pop(BLOB_KEY, None)
+            note.pop(SIZE_KEY, None)
+        note.update(fields)
+        self.index.update(note)
+        self.local["notes"].add(note["id"])
+        self._emit(column, dict(op="edit_note", board=self.column_index(column),
+                                index=self.note_index(column, note), **fields))
+
+    # ------------------------------------------------------ formato dividido
+    def is_sharded(self):
+        return is_sharded(self.meta)
+
+    def load_column(self, column, notes, text):
+        """
+        Recebe as notas de uma coluna lidas sob demanda do seu arquivo.
+        """
+        self.unloaded.discard(column["id"])
+        column["notes"] = notes
+        if any("id" not in note for note in notes):
+            ensure_ids({"boards": [column]})
+            self.mark_dirty(column)
+        else:
+            self.fragments[id(column)] = text
+        for note in notes:
+            self.index.update(note)
+            self.base[note["id"]] = note_fields(note)
+
+    def set_layout(self, sharded):
+        """
+        Troca entre um arquivo único e um manifesto com um arquivo por coluna.
+        Todas as colunas precisam estar carregadas; a próxima gravação escreve
+        tudo no novo formato.
+        """
+        if sharded:
+            self.meta[LAYOUT_KEY] = SHARDED
+        else:
+            self.meta.pop(LAYOUT_KEY, None)
+        self.local["meta"] = True
+        self.mark_all_dirty()
+
+    # -------------------------------------------------------------- gravação
+    def snapshot(self, inline_styles=False):
+        """
+        Cópia do estado atual para gravação fora da thread da GUI.
+        Colunas limpas entram como fragmentos JSON já prontos; as sujas
+        entram como cópias, a serem codificadas pelo gravador. Com
+        `inline_styles`, os estilos são gravados resolvidos, ao lado do nome,
+        para as versões anteriores (inline_style).
+        """
+        styles = self.meta.get(STYLES_KEY)
+        export = (lambda column: inline_style(column, styles)) if inline_styles else (lambda column: column)
+        parts = []
+        for column in self.columns:
+            fragment = self.fragments.get(id(column))
+            if column["id"] in self.unloaded:
+                parts.append(None)  # arquivo da coluna não muda
+            elif fragment is None:
+                copy = export(copy_column(column))
+                for note in copy["notes"]:
+                    self.base[note["id"]] = note_fields(note)
+                parts.append((id(column), copy))
+            else:
+                parts.append(fragment)
+        self.layout = board_layout(self.columns)
+        self.dirty.clear()
+        self.meta_dirty = False
+        # As alterações locais passam a "em gravação" até o fim da escrita
+        self.saving = self.local
+        self.local = self.new_local()
+        return dict(self.meta), parts, [export(column_header(column)) for column in self.columns]
+
+    def save_finished(self, ok):
+        if not ok:
+            for kind in ["notes", "removed", "columns", "removed_columns"]:
+                self.local[kind] |= self.saving[kind]
+            self.local["meta"] = self.local["meta"] or self.saving["meta"]
+            self.local["structure"] = self.local["structure"] or self.saving["structure"]
+        self.saving = self.new_local()
+
+    def store_fragments(self, fragments):
+        """
+        Guarda os fragmentos codificados pelo gravador, exceto os das colunas
+        alteradas depois do snapshot.
+        """
+        alive = set(id(column) for column in self.columns)
+        for key, fragment in fragments.items():
+            if key in alive and key not in self.dirty:
+                self.fragments[key] = fragment
+
+
+    # ------------------------------------------------ recarga a partir do disco
+    def merge(self, data):
+        """
+        Incorpora uma versão do arquivo alterada por outro programa, preservando
+        as alterações locais ainda não gravadas no arquivo base.
+
+        Devolve (id() das colunas cujas notas mudaram, ids das notas atualizadas).
+        As notas alteradas nos dois lados ficam em `self.conflicts`, com a
+        versão local mantida.
+        """
+        normalize_styles(ensure_ids(adopt_ids(data, self.layout, self.base)))
+        self.layout = board_layout(data["boards"])
+        changed = set()
+        updated = set()
+
+        for key, value in data.items():
+            if key not in ("boards", "journal_seq") and self.meta.get(key) != value and not self.local["meta"] and not self.saving["meta"]:
+                self.meta[key] = value
+                self.meta_dirty = True
+
+        notes = {}
+        note_columns = {}
+        local_columns = {}
+        for column in self.columns:
+            local_columns[column["id"]] = column
+            for note in column["notes"]:
+                notes[note["id"]] = note
+                note_columns[note["id"]] = column
+        disk_notes = set(note["id"] for board in data["boards"] for note in board["notes"])
+        disk_columns = set(board["id"] for board in data["boards"])
+
+        new_columns = []
+        for board in data["boards"]:
+            if self.is_local("removed_columns", board["id"]):
+                continue
+            column = local_columns.get(board["id"])
+            if column is None:
+                column = dict(board, notes=[])
+                changed.add(id(column))
+            elif column_header(column) != column_header(board) and not self.is_local("columns", board["id"]):
+                column.update(column_header(board))
+                changed.add(id(column))
+
+            new_notes = []
+            for disk_note in board["notes"]:
+                note_id = disk_note["id"]
+                if self.is_local("removed", note_id):
+                    continue
+                note = notes.get(note_id)
+                if note is None:
+                    note = disk_note
+                elif self.is_local("notes", note_id):
+                    # Mantém a versão e a posição locais
+                    if note_fields(disk_note) != self.base.get(note_id) and note_fields(disk_note) != note_fields(note):
+                        self.conflicts.add(note_id)
+                        changed.add(id(note_columns[note_id]))
+                    continue
+                elif note_fields(note) != note_fields(disk_note):
+                    note.clear()
+                    note.update(disk_note)
+                    updated.add(note_id)
+                new_notes.append(note)
+                self.base[note_id] = note_fields(disk_note)
+
+            # Notas locais (novas, editadas ou movidas) ficam onde estão
+            old_notes = column["notes"] if column is local_columns.get(board["id"]) else []
+            for index, note in enumerate(old_notes):
+                if self.is_local("notes", note["id"]):
+                    new_notes.insert(min(index, len(new_notes)), note)
+                    if note["id"] not in disk_notes and note["id"] in self.base:
+                        self.conflicts.add(note["id"])  # apagada no disco, editada aqui
+
+            if [n["id"] for n in new_notes] != [n["id"] for n in old_notes] or any(n["id"] in updated for n in new_notes):
+                changed.add(id(column))
+            column["notes"] = new_notes
+            new_columns.append(column)
+
+        # Colunas que só existem localmente
+        for index, column in enumerate(self.columns):
+            if column["id"] in disk_columns:
+                continue
+            keep = self.is_local("columns", column["id"]) or any(self.is_local("notes", n["id"]) for n in column["notes"])
+            if keep:
+                new_columns.insert(min(index, len(new_columns)), column)
+                # Notas nunca gravadas ou alteradas localmente
+                column["notes"] = [n for n in column["notes"] if self.is_local("notes", n["id"]) or n["id"] not in self.base]
+                changed.add(id(column))
+
+        if self.local["structure"] or self.saving["structure"]:
+            # A ordem local das colunas prevalece
+            order = {column["id"]: i for i, column in enumerate(self.columns)}
+            new_columns.sort(key=lambda column: order.get(column["id"], len(order)))
+
+        self.columns = new_columns
+        self.unloaded &= set(column["id"] for column in self.columns)
+        if changed:
+            self.index = NoteIndex.from_boards(self.columns, self.source)
+        for key in changed:
+            self.dirty.add(key)
+            self.fragments.pop(key, None)
+        self.meta_dirty = True
+        return changed, updated
+
+
+def encode_snapshot(meta, parts):
+    fragments = {}
+    texts = []
+    for part in parts:
+        if isinstance(part, str):
+            texts.append(part)
+        else:
+            key, column = part
+            fragments[key] = encode_column(column)
+            texts.append(fragments[key])
+    return assemble_document(meta, texts), fragments
+
+
+def write_sharded(path, meta, parts, headers, last_hash):
+    """
+    Grava um quadro dividido: só os arquivos das colunas alteradas e, se
+    mudou, o manifesto (campos de topo, ordem e estilos das colunas).
+    """
+    fragments = {}
+    digests = []
+    changed = []
+    for header, part in zip(headers, parts):
+        if part is None:
+            continue
+        if isinstance(part, str):
+            text = part
+        else:
+            key, column = part
+            text = fragments[key] = encode_shard(column)
+            changed.append((column["id"], text))
+        digests.append(shard_digest(header["id"], text))
+    manifest = assemble_document(meta, [encode_column(header) for header in headers])
+    digest = combined_digest(manifest, digests)
+    if digest == last_hash and os.path.exists(path):
+        return fragments, digest, False
+
+    # As colunas primeiro: uma queda no meio deixa o manifesto anterior válido
+    os.makedirs(shard_dir(path), exist_ok=True)
+    for board_id, text in changed:
+        write_atomic(shard_path(path, board_id), text)
+    current = None
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            current = f.read()
+    if current != manifest:
+        write_atomic(path, manifest)
+    remove_shards(path, keep=set(header["id"] for header in headers))
+    return fragments, digest, True
+
+
+def externalize_parts(path, parts, threshold):
+    """
+    Troca, nas cópias das colunas alteradas, os conteúdos grandes por
+    referências a arquivos separados.
+    """
+    for part in parts:
+        if part is not None and not isinstance(part, str):
+            column = part[1]
+            column["notes"] = externalize_notes(path, column["notes"], threshold)
+
+
+def write_snapshot(path, meta, parts, headers, last_hash, blob_threshold=0):
+    """
+    Grava um snapshot no layout indicado pelos campos de topo e no formato
+    indicado pela extensão do arquivo (o manifesto de um quadro dividido é
+    sempre JSON). Conteúdos de notas maiores que `blob_threshold` vão para
+    arquivos separados. Devolve (fragmentos novos, hash dos bytes gravados, gravou).
+    """
+    externalize_parts(path, parts, blob_threshold)
+    if is_sharded(meta):
+        return write_sharded(path, meta, parts, headers, last_hash)
+    text, fragments = encode_snapshot(meta, parts)
+    content = encode_board(text, format_for_path(path))
+    digest = hashlib.sha1(content).hexdigest()
+    written = False
+    if digest != last_hash or not os.path.exists(path):
+        write_atomic(path, content)
+        written = True
+    if os.path.isdir(shard_dir(path)):
+        remove_shards(path)  # restos de um quadro que era dividido
+    return fragments, digest, written
+
+
+class BoardWriter(QThread):
+    """
+    Codifica um snapshot e o grava de forma atômica fora da thread da GUI.
+    A gravação é omitida se o conteúdo tiver o mesmo hash da última gravada.
+    """
+    saved = pyqtSignal(str, object, str, bool)  # caminho, fragmentos, hash, gravou
+    failed = pyqtSignal(str, str)
+
+    def __init__(self, path, meta, parts, headers, last_hash, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.meta = meta
+        self.parts = parts
+        self.headers = headers
+        self.last_hash = last_hash
+        self.history = None
+        self.blob_threshold = 0
+
+    def run(self):
+        try:
+            fragments, digest, written = write_snapshot(self.path, self.meta, self.parts, self.headers, self.last_hash,
+                                                        self.blob_threshold)
+        except Exception as e:
+            self.failed.emit(self.path, str(e))
+            return
+        if written and self.history is not None:
+            # Uma falha no histórico não invalida a gravação do quadro
+            try:
+                self.history.record(self.path, self.meta, self.parts, self.headers, fragments)
+            except Exception as e:
+                print(f"History not recorded for {self.path}: {e}")
+        self.saved.emit(self.path, fragments, digest, written)
+
+
+class BoardSaver(QObject):
+    """
+    Gravação de um BoardDocument: imediata (save) ou agrupada por um
+    temporizador de autosave, com no máximo uma gravação em curso.
+    """
+    saved = pyqtSignal(str, bool, object)  # caminho, gravou, campos de topo gravados
+    failed = pyqtSignal(str, str)
+
+    def __init__(self, document, delay_ms=2000, parent=None):
+        super().__init__(parent)
+        self.document = document
+        self.path = ""
+        self.last_hash = ""
+        self.writer = None
+        self.pending = False
+        self.history = None  # HistoryStore que registra cada versão gravada
+        self.blob_threshold = 0  # conteúdos maiores vão para arquivos separados (0: nunca)
+        self.inline_styles = False  # estilos completos para as versões anteriores
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self.save)
+
+    def set_document(self, document, path=""):
+        self.timer.stop()
+        self.document = document
+        self.path = path
+        self.last_hash = ""
+
+    def schedule(self):
+        """
+        (Re)inicia o temporizador; edições em sequência geram uma só gravação.
+        """
+        if self.path:
+            self.timer.start()
+
+    def save(self, path=None):
+        self.timer.stop()
+        if path is not None:
+            self.path = path
+        if not self.path:
+            return
+        if self.writer is not None:
+            self.pending = True
+            return
+
+        meta, parts, headers = self.document.snapshot(self.inline_styles)
+        self.writer = BoardWriter(self.path, meta, parts, headers, self.last_hash, self)
+        self.writer.document = self.document
+        self.writer.history = self.history
+        self.writer.blob_threshold = self.blob_threshold
+        self.writer.saved.connect(self.on_saved)
+        self.writer.failed.connect(self.on_failed)
+        self.writer.finished.connect(self.on_finished)
+        self.writer.start()
+
+    def flush(self):
+        """
+        Grava na thread atual o que ainda estiver pendente (ao fechar a janela).
+        """
+        self.timer.stop()
+        if self.writer is not None:
+            self.pending = False
+            self.writer.wait()
+            self.on_finished()
+        if self.path and self.document.is_dirty():
+            meta, parts, headers = self.document.snapshot(self.inline_styles)
+            fragments, self.last_hash, written = write_snapshot(self.path, meta, parts, headers, "", self.blob_threshold)
+            if written and self.history is not None:
+                try:
+                    self.history.record(self.path, meta, parts, headers, fragments)
+                except Exception as e:
+                    print(f"History not recorded for {self.path}: {e}")
+            self.document.save_finished(True)
+            self.saved.emit(self.path, True, meta)
+
+    def on_saved(self, path, fragments, digest, written):
+        if self.sender() is None:
+            return
+        self.sender().document.save_finished(True)
+        if path == self.path and self.sender().document is self.document:
+            self.last_hash = digest
+            self.document.store_fragments(fragments)
+        self.saved.emit(path, written, self.sender().meta)
+
+    def on_failed(self, path, message):
+        if self.sender() is None:
+            return
+        # As colunas voltam a ser consideradas sujas
+        document = self.sender().document
+        document.save_finished(False)
+        for column in document.columns:
+            document.mark_dirty(column)
+        document.mark_dirty()
+        self.failed.emit(path, message)
+
+    def on_finished(self):
+        if self.writer is None:
+            return
+        self.writer.deleteLater()
+        self.writer = None
+        if self.pending:
+            self.pending = False
+            self.save()
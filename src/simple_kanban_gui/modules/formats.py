@@ -0,0 +1,199 @@
+import io
+import gzip
+import hashlib
+
+from simple_kanban_gui.modules import codec
+
+# Formatos opcionais: sem o pacote, o formato só não é oferecido ao gravar
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON = "json"
+GZIP = "gzip"
+ZSTD = "zstd"
+MSGPACK = "msgpack"
+
+SUFFIXES = {
+    JSON: ".kanban.json",
+    GZIP: ".kanban.json.gz",
+    ZSTD: ".kanban.json.zst",
+    MSGPACK: ".kanban.msgpack",
+}
+BOARD_SUFFIXES = tuple(SUFFIXES.values())
+
+MODULES = {ZSTD: "zstandard", MSGPACK: "msgpack"}
+
+# Nomes dos filtros dos diálogos de arquivo
+FILTER_NAMES = {
+    JSON: "JSON",
+    GZIP: "JSON gzip",
+    ZSTD: "JSON zstd",
+    MSGPACK: "MessagePack",
+}
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+ZSTD_LEVEL = 3
+
+# Bloco lido de cada vez ao descomprimir
+READ_BLOCK = 1 << 16
+
+
+def is_board_file(name):
+    return name.lower().endswith(BOARD_SUFFIXES)
+
+
+def board_stem(path):
+    """
+    Caminho sem a extensão de quadro: "x.kanban.json.gz" -> "x".
+    """
+    lower = path.lower()
+    for suffix in sorted(BOARD_SUFFIXES, key=len, reverse=True):
+        if lower.endswith(suffix):
+            return path[:-len(suffix)]
+    return path
+
+
+def format_for_path(path):
+    """
+    Formato de gravação indicado pela extensão (JSON se não reconhecida).
+    """
+    lower = path.lower()
+    for fmt, suffix in SUFFIXES.items():
+        if fmt != JSON and lower.endswith(suffix):
+            return fmt
+    return JSON
+
+
+def available(fmt):
+    if fmt == ZSTD:
+        return zstandard is not None
+    if fmt == MSGPACK:
+        return msgpack is not None
+    return True
+
+
+def require(fmt):
+    if not available(fmt):
+        raise RuntimeError(f"the '{fmt}' format requires the '{MODULES[fmt]}' package")
+
+
+def save_filters():
+    """
+    Filtros do diálogo "Salvar como", um por formato disponível.
+    """
+    return [f"{FILTER_NAMES[fmt]} (*{suffix})" for fmt, suffix in SUFFIXES.items() if available(fmt)]
+
+
+def open_filter():
+    return "Kanban (" + " ".join("*" + suffix for suffix in BOARD_SUFFIXES) + ")"
+
+
+def path_for_filter(path, selected_filter):
+    """
+    Acrescenta a extensão do filtro escolhido a um caminho sem extensão de quadro.
+    """
+    if is_board_file(path):
+        return path
+    for fmt, suffix in SUFFIXES.items():
+        if selected_filter.startswith(FILTER_NAMES[fmt] + " ("):
+            return path + suffix
+    return path + SUFFIXES[JSON]
+
+
+def detect_format(head):
+    """
+    Formato pelos primeiros bytes do arquivo, independente da extensão.
+    """
+    if head.startswith(GZIP_MAGIC):
+        return GZIP
+    if head.startswith(ZSTD_MAGIC):
+        return ZSTD
+    # Um quadro é sempre um mapa: fixmap (0x80-0x8f), map16 (0xde) ou map32 (0xdf)
+    if head and (0x80 <= head[0] <= 0x8f or head[0] in (0xde, 0xdf)):
+        return MSGPACK
+    return JSON
+
+
+class HashingReader(io.RawIOBase):
+    """
+    Repassa as leituras de um arquivo calculando o hash dos bytes lidos.
+    """
+    def __init__(self, f):
+        self.f = f
+        self.hash = hashlib.sha1()
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.f.read(len(buffer))
+        self.hash.update(data)
+        buffer[:len(data)] = data
+        return len(data)
+
+    def hexdigest(self):
+        # Restos não lidos pelo descompressor também fazem parte do arquivo
+        for data in iter(lambda: self.f.read(READ_BLOCK), b""):
+            self.hash.update(data)
+        return self.hash.hexdigest()
+
+
+def read_board(path):
+    """
+    Lê um quadro em qualquer formato. Os formatos comprimidos são
+    descomprimidos enquanto o arquivo é lido, sem guardar os bytes
+    comprimidos em memória.
+
+    Devolve (dados, hash dos bytes do arquivo, formato, bytes do JSON ou None).
+    """
+    with open(path, "rb") as f:
+        fmt = detect_format(f.read(4))
+        f.seek(0)
+        if fmt == JSON:
+            raw = f.read()
+            return codec.loads(raw), hashlib.sha1(raw).hexdigest(), fmt, raw
+        require(fmt)
+        reader = HashingReader(f)
+        if fmt == GZIP:
+            stream = gzip.GzipFile(fileobj=reader, mode="rb")
+        elif fmt == ZSTD:
+            stream = zstandard.ZstdDecompressor().stream_reader(reader)
+        if fmt == MSGPACK:
+            data = msgpack.Unpacker(io.BufferedReader(reader, READ_BLOCK), raw=False).unpack()
+        else:
+            data = codec.load(stream)
+        return data, reader.hexdigest(), fmt, None
+
+
+def encode_board(text, fmt):
+    """
+    Bytes gravados para o JSON `text` no formato `fmt`. A compressão é
+    determinística, então o mesmo conteúdo sempre tem o mesmo hash.
+    """
+    if fmt == JSON:
+        return text.encode("utf-8")
+    require(fmt)
+    if fmt == GZIP:
+        return gzip.compress(text.encode("utf-8"), mtime=0)
+    if fmt == ZSTD:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(text.encode("utf-8"))
+    return msgpack.packb(codec.loads(text), use_bin_type=True)
+
+
+def dump_board(path, data, fmt=None):
+    """
+    Grava `data` inteiro (usado pelo gestor ao criar e editar quadros).
+    """
+    if fmt is None:
+        fmt = format_for_path(path)
+    with open(path, "wb") as f:
+        f.write(encode_board(codec.dumps(data, indent=True), fmt))
@@ -0,0 +1,231 @@
+import os
+import time
+import zlib
+import hashlib
+import tempfile
+import threading
+
+from simple_kanban_gui.modules import codec
+from simple_kanban_gui.modules.shards import read_shard
+
+# As notas de uma coluna são gravadas em pedaços, terminados depois das notas
+# cujo hash é múltiplo de CHUNK_MASK + 1 (16 notas por pedaço, em média). Os
+# limites dependem só do conteúdo: editar ou inserir uma nota altera um único
+# pedaço.
+CHUNK_MASK = 0xF
+
+# Limite de fragmentos de colunas limpas lembrados entre gravações
+FRAGMENT_CACHE = 4096
+
+
+def canonical(obj):
+    return codec.dumps(obj, sort_keys=True)
+
+
+def text_hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def split_chunks(notes):
+    chunks = []
+    chunk = []
+    for note in notes:
+        chunk.append(note)
+        if int(text_hash(canonical(note))[-2:], 16) & CHUNK_MASK == 0:
+            chunks.append(chunk)
+            chunk = []
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+class HistoryStore:
+    """
+    Versões dos quadros num repositório local endereçado por conteúdo.
+
+    Pedaços de listas de notas, colunas e versões são objetos JSON
+    comprimidos, gravados uma única vez com o nome do seu hash; uma versão
+    nova só acrescenta os objetos que mudaram. Cada quadro tem um registro
+    (uma linha JSON por versão) em boards/, e listar as versões não lê
+    nenhum objeto.
+    """
+    def __init__(self, root):
+        self.root = root
+        self.lock = threading.Lock()
+        self.known = set()      # hashes já presentes no repositório
+        self.fragments = {}     # hash do fragmento de uma coluna limpa -> hash da coluna
+        self.last = {}          # caminho do quadro -> último registro
+
+    # -------------------------------------------------------------- objetos
+    def object_path(self, digest):
+        return os.path.join(self.root, "objects", digest[:2], digest[2:])
+
+    def put(self, obj):
+        text = canonical(obj)
+        digest = text_hash(text)
+        if digest in self.known:
+            return digest
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            directory = os.path.dirname(path)
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=directory)
+            with os.fdopen(fd, "wb") as f:
+                f.write(zlib.compress(text.encode("utf-8")))
+            os.replace(tmp_path, path)
+        self.known.add(digest)
+        return digest
+
+    def get(self, digest):
+        with open(self.object_path(digest), "rb") as f:
+            return codec.loads(zlib.decompress(f.read()))
+
+    def put_column(self, column):
+        header = {key: value for key, value in column.items() if key != "notes"}
+        chunks = split_chunks(column.get("notes", []))
+        return self.put({"header": header, "chunks": [self.put(chunk) for chunk in chunks], "sizes": [len(chunk) for chunk in chunks]})
+
+    # ------------------------------------------------------------- registros
+    def log_path(self, board_path):
+        key = text_hash(os.path.abspath(board_path))[:16]
+        return os.path.join(self.root, "boards", key + ".jsonl")
+
+    def versions(self, board_path):
+        """
+        Registros das versões de um quadro, da mais antiga à mais nova.
+        """
+        versions = []
+        path = self.log_path(board_path)
+        if not os.path.exists(path):
+            return versions
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.endswith("\n"):
+                    versions.append(codec.loads(line))
+        return versions
+
+    def last_version(self, board_path):
+        if board_path not in self.last:
+            versions = self.versions(board_path)
+            self.last[board_path] = versions[-1] if versions else None
+        return self.last[board_path]
+
+    def record(self, path, meta, parts, headers, fragments):
+        """
+        Registra a versão gravada por BoardWriter. `parts` e `headers` vêm de
+        BoardDocument.snapshot() e `fragments` de write_snapshot(); colunas
+        não lidas (None) reaproveitam a versão anterior ou o arquivo da coluna.
+        """
+        with self.lock:
+            last = self.last_version(path)
+            previous = dict(self.get(last["version"])["columns"]) if last else {}
+            columns = []
+            for header, part in zip(headers, parts):
+                if part is None:
+                    digest = previous.get(header["id"])
+                    if digest is None:
+                        digest = self.put_column(dict(header, notes=read_shard(path, header["id"])[0]))
+                elif isinstance(part, str):
+                    key = text_hash(part)
+                    digest = self.fragments.get(key)
+                    if digest is None:
+                        digest = self.put_column(dict(header, notes=codec.loads(part).get("notes", [])))
+                        self.remember(key, digest)
+                else:
+                    key, column = part
+                    digest = self.put_column(column)
+                    if key in fragments:
+                        self.remember(text_hash(fragments[key]), digest)
+                columns.append([header["id"], digest])
+
+            meta = {key: value for key, value in meta.items() if key != "journal_seq"}
+            version = self.put({"meta": meta, "columns": columns})
+            if last is not None and last["version"] == version:
+                return None
+            entry = {"version": version, "time": time.time(), "columns": len(columns), "changed": sum(1 for part in parts if part is not None and not isinstance(part, str))}
+            log = self.log_path(path)
+            os.makedirs(os.path.dirname(log), exist_ok=True)
+            with open(log, "a", encoding="utf-8") as f:
+                f.write(codec.dumps(entry) + "\n")
+            self.last[path] = entry
+            return entry
+
+    def remember(self, key, digest):
+        if len(self.fragments) >= FRAGMENT_CACHE:
+            self.fragments.clear()
+        self.fragments[key] = digest
+
+    # ---------------------------------------------------------------- leitura
+    def load_column(self, column_digest):
+        column = self.get(column_digest)
+        notes = []
+        for chunk in column["chunks"]:
+            notes.extend(self.get(chunk))
+        return dict(column["header"], notes=notes)
+
+    def load_version(self, version):
+        """
+        Dados completos (formato *.kanban.json) de uma versão.
+        """
+        snapshot = self.get(version)
+        return dict(snapshot["meta"], boards=[self.load_column(digest) for _, digest in snapshot["columns"]])
+
+    def changed_notes(self, old_column, new_column):
+        """
+        Notas dos pedaços que não são comuns às duas colunas (id -> (posição, nota)).
+        """
+        shared = set(old_column["chunks"]) & set(new_column["chunks"])
+        result = []
+        for column in (old_column, new_column):
+            notes = {}
+            position = 0
+            for chunk, size in zip(column["chunks"], column["sizes"]):
+                if chunk in shared:
+                    position += size
+                    continue
+                for note in self.get(chunk):
+                    notes[note["id"]] = (position, note)
+                    position += 1
+            result.append(notes)
+        return result
+
+    def diff(self, old, new):
+        """
+        Diferenças entre duas versões, por coluna. Só são lidos os pedaços
+        das colunas que mudaram e que não existem nas duas versões.
+
+        Devolve [(cabeçalho, hash da coluna antiga, estado, [(estado, nota antiga, nota nova, posição antiga)])],
+        com estado "added", "removed" ou "changed".
+        """
+        old_columns = self.get(old)["columns"]
+        new_columns = dict(self.get(new)["columns"])
+        result = []
+        seen = set()
+        for column_id, old_digest in old_columns:
+            seen.add(column_id)
+            new_digest = new_columns.get(column_id)
+            if new_digest == old_digest:
+                continue
+            old_column = self.get(old_digest)
+            if new_digest is None:
+                notes = self.load_column(old_digest)["notes"]
+                result.append((old_column["header"], old_digest, "removed", [("removed", note, None, i) for i, note in enumerate(notes)]))
+                continue
+            old_notes, new_notes = self.changed_notes(old_column, self.get(new_digest))
+            notes = []
+            for note_id, (position, note) in old_notes.items():
+                other = new_notes.get(note_id)
+                if other is None:
+                    notes.append(("removed", note, None, position))
+                elif other[1] != note:
+                    notes.append(("changed", note, other[1], position))
+            for note_id, (_, note) in new_notes.items():
+                if note_id not in old_notes:
+                    notes.append(("added", None, note, None))
+            result.append((old_column["header"], old_digest, "changed", notes))
+        for column_id, new_digest in new_columns.items():
+            if column_id not in seen:
+                column = self.load_column(new_digest)
+                result.append(({key: value for key, value in column.items() if key != "notes"}, None, "added",
+                               [("added", None, note, None) for note in column["notes"]]))
+        return result
@@ -0,0 +1,41 @@
+from PyQt5.QtGui import QIcon
+from PyQt5.QtWidgets import QApplication
+
+# Caches do processo: cada ícone do tema é procurado no disco uma única vez e
+# cada pixmap é desenhado uma única vez por (nome, tamanho)
+_icons = {}
+_pixmaps = {}
+
+
+def theme_icon(name, *fallbacks):
+    """
+    Ícone do tema; se `name` não existir, usa o primeiro dos `fallbacks` que
+    existir (como QIcon.fromTheme(name, QIcon.fromTheme(fallback))).
+    """
+    key = (name,) + fallbacks
+    icon = _icons.get(key)
+    if icon is None:
+        names = list(key)
+        icon = QIcon.fromTheme(names.pop())
+        while names:
+            icon = QIcon.fromTheme(names.pop(), icon)
+        _icons[key] = icon
+    return icon
+
+
+def standard_icon(standard_pixmap):
+    """
+    Ícone padrão do estilo da aplicação (QStyle.SP_*).
+    """
+    icon = _icons.get(standard_pixmap)
+    if icon is None:
+        icon = _icons[standard_pixmap] = QApplication.style().standardIcon(standard_pixmap)
+    return icon
+
+
+def standard_pixmap(standard_pixmap, size):
+    key = (standard_pixmap, size)
+    pixmap = _pixmaps.get(key)
+    if pixmap is None:
+        pixmap = _pixmaps[key] = standard_icon(standard_pixmap).pixmap(size, size)
+    return pixmap
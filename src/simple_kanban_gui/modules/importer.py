@@ -0,0 +1,59 @@
+import io
+import csv
+import re
+
+# Marcadores de lista removidos do início das linhas coladas
+BULLET_RE = re.compile(r"^\s*(?:[-*+]\s+(?:\[[ xX]\]\s+)?|\d+[.)]\s+)")
+
+
+def notes_from_lines(text):
+    """
+    Uma nota por linha não vazia do texto (lista de tarefas colada).
+    """
+    notes = []
+    for line in text.splitlines():
+        title = BULLET_RE.sub("", line).strip()
+        if title:
+            notes.append({"title": title, "content": ""})
+    return notes
+
+
+def notes_from_table(text, delimiter=None):
+    """
+    Notas de um texto CSV/TSV. Com cabeçalho ("title", "content"), as colunas
+    são lidas pelo nome; sem cabeçalho, a primeira é o título e a segunda o
+    conteúdo.
+    """
+    if delimiter is None:
+        sample = text[:4096]
+        delimiter = "\t" if sample.count("\t") > sample.count(",") else ","
+    rows = csv.reader(io.StringIO(text), delimiter=delimiter)
+    first = next(rows, None)
+    if first is None:
+        return []
+
+    names = [name.strip().casefold() for name in first]
+    if "title" in names:
+        title_col = names.index("title")
+        content_col = names.index("content") if "content" in names else None
+    else:
+        title_col, content_col = 0, 1
+        rows = [first] + list(rows)
+
+    notes = []
+    for row in rows:
+        title = row[title_col].strip() if title_col < len(row) else ""
+        content = row[content_col] if content_col is not None and content_col < len(row) else ""
+        if title or content:
+            notes.append({"title": title, "content": content})
+    return notes
+
+
+def read_table(path):
+    """
+    Lê um arquivo .csv/.tsv; o separador vem da extensão ou do conteúdo.
+    """
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        text = f.read()
+    delimiter = "\t" if path.lower().endswith(".tsv") else None
+    return notes_from_table(text, delimiter)
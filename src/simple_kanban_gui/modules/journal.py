@@ -0,0 +1,146 @@
+import os
+
+from simple_kanban_gui.modules import codec
+
+JOURNAL_SUFFIX = ".journal"
+
+# Campos de controle que não fazem parte dos dados da operação
+RECORD_KEYS = ("op", "seq", "board", "index")
+
+
+def journal_path(path):
+    return path + JOURNAL_SUFFIX
+
+
+def apply_op(data, op):
+    """
+    Aplica uma operação de BoardDocument sobre os dados de um *.kanban.json.
+    """
+    boards = data["boards"]
+    kind = op["op"]
+    if kind == "set_meta":
+        for key, value in op.items():
+            if key not in RECORD_KEYS:
+                data[key] = value
+    elif kind == "add_board":
+        boards.insert(op["index"], op["board"])
+    elif kind == "remove_board":
+        del boards[op["index"]]
+    elif kind == "move_board":
+        boards.insert(op["to"], boards.pop(op["from"]))
+    elif kind == "rename_board":
+        boards[op["index"]]["title"] = op["title"]
+    elif kind == "style_board":
+        if op["style"] is None:
+            boards[op["index"]].pop("style", None)
+        else:
+            boards[op["index"]]["style"] = op["style"]
+    elif kind == "add_note":
+        boards[op["board"]]["notes"].insert(op["index"], op["note"])
+    elif kind == "add_notes":
+        notes = boards[op["board"]]["notes"]
+        notes[op["index"]:op["index"]] = op["notes"]
+    elif kind == "remove_note":
+        del boards[op["board"]]["notes"][op["index"]]
+    elif kind == "move_note":
+        note = boards[op["board"]]["notes"].pop(op["index"])
+        if "modified" in op:
+            note["modified"] = op["modified"]
+        boards[op["to_board"]]["notes"].insert(op["to_index"], note)
+    elif kind == "remove_notes":
+        for board, index in sorted(op["notes"], reverse=True):
+            del boards[board]["notes"][index]
+    elif kind == "move_notes":
+        notes = [boards[board]["notes"][index] for board, index in op["notes"]]
+        for board, index in sorted(op["notes"], reverse=True):
+            del boards[board]["notes"][index]
+        for (board, _), note in zip(op["notes"], notes):
+            if board != op["to_board"]:
+                note["modified"] = op["modified"]
+        target = boards[op["to_board"]]["notes"]
+        target[op["to_index"]:op["to_index"]] = notes
+    elif kind == "edit_note":
+        note = boards[op["board"]]["notes"][op["index"]]
+        for key, value in op.items():
+            if key not in RECORD_KEYS:
+                note[key] = value
+    else:
+        raise ValueError(f"unknown operation: {kind}")
+
+
+def read_records(path):
+    """
+    Registros válidos do diário. Uma última linha incompleta (queda durante a
+    escrita) é descartada.
+    """
+    records = []
+    if not os.path.exists(path):
+        return records
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                records.append(codec.loads(line))
+            except codec.DecodeError:
+                break
+    return records
+
+
+def replay(data, path):
+    """
+    Reaplica sobre `data` as operações do diário posteriores ao "journal_seq"
+    gravado no arquivo base. Devolve o número da última operação aplicada.
+    """
+    seq = data.get("journal_seq", 0)
+    for record in read_records(path):
+        if record["seq"] > seq:
+            apply_op(data, record)
+            seq = record["seq"]
+    if seq > 0:
+        data["journal_seq"] = seq
+    return seq
+
+
+class BoardJournal:
+    """
+    Diário de operações (uma linha JSON compacta por operação) gravado ao lado
+    do arquivo *.kanban.json. Cada operação é sincronizada no disco ao ser
+    adicionada, de modo que uma queda perde no máximo a última.
+    """
+    def __init__(self, path, seq=0):
+        self.path = path
+        self.seq = seq
+        self.file = open(path, "ab")
+
+    def size(self):
+        return self.file.tell()
+
+    def append(self, op):
+        self.seq += 1
+        record = dict(op, seq=self.seq)
+        self.file.write(codec.dumpb(record) + b"\n")
+        self.file.flush()
+        if hasattr(os, "fdatasync"):
+            os.fdatasync(self.file.fileno())
+        else:
+            os.fsync(self.file.fileno())
+        return self.seq
+
+    def truncate_through(self, seq):
+        """
+        Remove as operações já incorporadas ao arquivo base (até `seq`).
+        """
+        self.file.close()
+        records = [r for r in read_records(self.path) if r["seq"] > seq]
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            for record in records:
+                f.write(codec.dumpb(record) + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self.file = open(self.path, "ab")
+
+    def close(self):
+        self.file.close()
@@ -0,0 +1,170 @@
+import os
+import re
+from urllib.parse import quote, unquote
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from simple_kanban_gui.modules.blobs import note_text
+from simple_kanban_gui.modules.boardscan import BoardWatcher
+
+# [[quadro.kanban.json#id-da-nota]], [[quadro.kanban.json]] ou [[#id-da-nota]]
+# (nota do mesmo quadro); o caminho é relativo ao diretório do quadro
+LINK_RE = re.compile(r"\[\[([^\[\]#|]*)(?:#([^\[\]|]+))?(?:\|([^\[\]]+))?\]\]")
+
+LINK_SCHEME = "kanban"
+
+
+def parse_links(text):
+    """
+    [(arquivo, id da nota)] das referências do texto; arquivo "" é o próprio
+    quadro e id "" é o quadro inteiro.
+    """
+    return [(m.group(1).strip(), (m.group(2) or "").strip()) for m in LINK_RE.finditer(text)
+            if m.group(1).strip() or m.group(2)]
+
+
+def link_target(source_path, file, note_id):
+    """
+    Chave (caminho absoluto, id) do destino de uma referência feita em `source_path`.
+    """
+    if not file:
+        return os.path.normpath(os.path.abspath(source_path)), note_id
+    base = os.path.dirname(os.path.abspath(source_path))
+    return os.path.normpath(os.path.join(base, os.path.expanduser(file))), note_id
+
+
+def link_url(file, note_id):
+    return f"{LINK_SCHEME}:{quote(file)}#{quote(note_id)}"
+
+
+def parse_link_url(url):
+    """
+    (arquivo, id) de um link gerado por linkify, ou None para outros links.
+    """
+    if not url.startswith(LINK_SCHEME + ":"):
+        return None
+    file, _, note_id = url[len(LINK_SCHEME) + 1:].partition("#")
+    return unquote(file), unquote(note_id)
+
+
+def linkify(text):
+    """
+    Troca as referências [[...]] por links Markdown clicáveis.
+    """
+    def replace(m):
+        file, note_id, label = m.group(1).strip(), (m.group(2) or "").strip(), m.group(3)
+        if not file and not note_id:
+            return m.group(0)
+        if not label:
+            label = f"{file}#{note_id}" if note_id and file else (file or f"#{note_id}")
+        return f"[{label}](<{link_url(file, note_id)}>)"
+    return LINK_RE.sub(replace, text)
+
+
+def note_links(data, path=""):
+    """
+    {id da nota: (título, [(arquivo, id)])} das notas com referências nos
+    dados do quadro `path`.
+    """
+    entries = {}
+    for board in data.get("boards", []):
+        for note in board.get("notes", []):
+            content = note_text(note, path)
+            if "[[" in content:
+                links = parse_links(content)
+                if links:
+                    entries[note.get("id", "")] = (note.get("title", ""), links)
+    return entries
+
+
+class BacklinkIndex:
+    """
+    Referências invertidas: destino (caminho, id) -> notas que o citam.
+    Cada quadro relido troca só as suas próprias entradas.
+    """
+    def __init__(self):
+        self.files = {}    # caminho da origem -> {id da origem: (título, [destinos])}
+        self.targets = {}  # destino -> {(caminho da origem, id da origem): título}
+
+    def update(self, path, entries):
+        path = os.path.normpath(os.path.abspath(path))
+        for note_id in list(self.files.get(path, {})):
+            self._unlink(path, note_id)
+        resolved = {}
+        for note_id, (title, links) in entries.items():
+            resolved[note_id] = (title, self._link(path, note_id, title, links))
+        self.files[path] = resolved
+
+    def update_note(self, path, note):
+        """
+        Atualiza uma única nota (edição no quadro aberto, antes da gravação).
+        """
+        path = os.path.normpath(os.path.abspath(path))
+        note_id = note.get("id", "")
+        self._unlink(path, note_id)
+        links = parse_links(note_text(note, path))
+        if links:
+            title = note.get("title", "")
+            self.files.setdefault(path, {})[note_id] = (title, self._link(path, note_id, title, links))
+
+    def remove(self, path):
+        path = os.path.normpath(os.path.abspath(path))
+        for note_id in list(self.files.get(path, {})):
+            self._unlink(path, note_id)
+        self.files.pop(path, None)
+
+    def _link(self, path, note_id, title, links):
+        targets = set(link_target(path, file, target_id) for file, target_id in links)
+        for target in targets:
+            self.targets.setdefault(target, {})[(path, note_id)] = title
+        return targets
+
+    def _unlink(self, path, note_id):
+        entry = self.files.get(path, {}).pop(note_id, None)
+        if entry is None:
+            return
+        for target in entry[1]:
+            sources = self.targets.get(target)
+            if sources is not None:
+                sources.pop((path, note_id), None)
+                if not sources:
+                    del self.targets[target]
+
+    def backlinks(self, path, note_id=""):
+        """
+        [(caminho da origem, id da origem, título)] das notas que citam a
+        nota `note_id` de `path` (ou o quadro inteiro, com id "").
+        """
+        key = (os.path.normpath(os.path.abspath(path)), note_id)
+        return sorted((source, source_id, title) for (source, source_id), title in self.targets.get(key, {}).items())
+
+
+class LinkService(QObject):
+    """
+    Índice de referências dos quadros sob `root`, mantido pelo BoardWatcher.
+    """
+    updated = pyqtSignal()
+
+    def __init__(self, root, parent=None):
+        super().__init__(parent)
+        self.index = BacklinkIndex()
+        self.boards = BoardWatcher(root, note_links, self)
+        self.boards.updated.connect(self.on_updated)
+
+    def start(self):
+        self.boards.start()
+
+    def on_updated(self, results):
+        for path, entries in results:
+            if entries is None:
+                self.index.remove(path)
+            else:
+                self.index.update(path, entries)
+        self.updated.emit()
+
+    def update_note(self, path, note):
+        self.index.update_note(path, note)
+        self.updated.emit()
+
+    def stop(self):
+        self.boards.stop()
@@ -0,0 +1,114 @@
+import time
+
+from PyQt5.QtCore import QObject, QThread, QTimer, pyqtSignal
+
+from simple_kanban_gui.modules.journal import journal_path, read_records, replay
+from simple_kanban_gui.modules.shards import is_sharded, read_shard, shard_digest, combined_digest
+from simple_kanban_gui.modules.document import ensure_ids
+from simple_kanban_gui.modules.search import NoteIndex
+from simple_kanban_gui.modules.formats import read_board
+
+# Tempo máximo (ms) de construção de widgets antes de devolver o controle ao event loop
+SLICE_BUDGET_MS = 8
+
+
+class BoardParser(QThread):
+    """
+    Lê e interpreta um arquivo de quadro (em qualquer formato) fora da thread da GUI.
+    """
+    parsed = pyqtSignal(str, object, int)  # caminho, dados, número de colunas
+    failed = pyqtSignal(str, str)          # caminho, mensagem de erro
+    unchanged = pyqtSignal(str)            # conteúdo igual a `known_digest`
+
+    def __init__(self, path, parent=None, known_digest="", build_index=False, skip_ids=None):
+        super().__init__(parent)
+        self.path = path
+        self.digest = ""
+        self.known_digest = known_digest
+        self.build_index = build_index
+        self.index = None
+        # Quadros divididos: colunas que não são lidas agora (None: todas)
+        self.skip_ids = skip_ids
+        self.unloaded = set()
+
+    def run(self):
+        try:
+            data, self.digest, _, raw = read_board(self.path)
+            if is_sharded(data):
+                # O manifesto de um quadro dividido é sempre JSON
+                self.digest = self.read_shards(data, raw.decode("utf-8"))
+            if self.digest == self.known_digest:
+                self.unchanged.emit(self.path)
+                return
+            # Operações ainda não incorporadas ao arquivo base
+            replay(data, journal_path(self.path))
+            total = len(data["boards"])
+            if self.build_index:
+                self.index = NoteIndex.from_boards(ensure_ids(data)["boards"], self.path)
+        except Exception as e:
+            self.failed.emit(self.path, str(e))
+            return
+        self.parsed.emit(self.path, data, total)
+
+    def read_shards(self, data, manifest_text):
+        """
+        Lê os arquivos das colunas de um quadro dividido, exceto as de
+        `skip_ids`, e devolve o hash do conjunto lido.
+        """
+        boards = data["boards"]
+        skip = self.skip_ids
+        if skip is None:
+            skip = set(board["id"] for board in boards if "id" in board)
+        seq = data.get("journal_seq", 0)
+        if any(record["seq"] > seq for record in read_records(journal_path(self.path))):
+            skip = set()  # as operações do diário precisam de todas as notas
+        digests = []
+        for board in boards:
+            if board.get("id") in skip:
+                board["notes"] = []
+                self.unloaded.add(board["id"])
+                continue
+            notes, text = read_shard(self.path, board["id"])
+            board["notes"] = notes
+            digests.append(shard_digest(board["id"], text))
+        return combined_digest(manifest_text, digests)
+
+
+class ChunkedBuilder(QObject):
+    """
+    Consome um gerador de passos de construção em fatias de tempo,
+    devolvendo o controle ao event loop entre as fatias.
+    """
+    progress = pyqtSignal(int, int)  # passos feitos, total
+    finished = pyqtSignal()
+
+    def __init__(self, steps, total, budget_ms=SLICE_BUDGET_MS, parent=None):
+        super().__init__(parent)
+        self.steps = steps
+        self.total = total
+        self.done = 0
+        self.budget = budget_ms / 1000.0
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(self._run_slice)
+
+    def start(self):
+        self.timer.start()
+
+    def cancel(self):
+        self.timer.stop()
+        self.steps.close()
+
+    def _run_slice(self):
+        deadline = time.perf_counter() + self.budget
+        try:
+            while time.perf_counter() < deadline:
+                next(self.steps)
+                self.done += 1
+        except StopIteration:
+            self.timer.stop()
+            self.progress.emit(self.total, self.total)
+            self.finished.emit()
+            return
+        self.progress.emit(self.done, self.total)
@@ -0,0 +1,148 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from PyQt5 import sip
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+from PyQt5.QtGui import QTextDocument, QDesktopServices
+from PyQt5.QtWidgets import QTextBrowser
+
+from simple_kanban_gui.modules.links import parse_link_url
+
+
+def content_key(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def render_markdown(text):
+    """
+    QTextDocument com o Markdown já interpretado (texto simples no Qt < 5.14).
+    O documento guarda as caixas de seleção das listas de tarefas, que se
+    perdem numa conversão para HTML.
+    """
+    document = QTextDocument()
+    if hasattr(document, "setMarkdown"):
+        document.setMarkdown(text)
+    else:
+        document.setPlainText(text)
+    return document
+
+
+class MarkdownWorker(QThread):
+    """
+    Interpreta os textos longos fora da thread da GUI, um de cada vez.
+    """
+    rendered = pyqtSignal(str, object)  # chave, QTextDocument
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.lock = threading.Lock()
+        self.pending = OrderedDict()  # chave -> texto
+        self.finished.connect(self.restart)
+
+    def add(self, key, text):
+        with self.lock:
+            self.pending[key] = text
+        if not self.isRunning():
+            self.start()
+
+    def restart(self):
+        # Pedidos feitos enquanto a thread terminava
+        if self.pending:
+            self.start()
+
+    def run(self):
+        while True:
+            with self.lock:
+                if not self.pending:
+                    return
+                key, text = self.pending.popitem(last=False)
+            document = render_markdown(text)
+            document.moveToThread(self.thread())
+            self.rendered.emit(key, document)
+
+
+class MarkdownCache(QObject):
+    """
+    Documentos interpretados por hash do conteúdo, com descarte dos menos
+    usados. As vistas recebem cópias, então um documento pode sair do cache
+    enquanto ainda é exibido.
+    """
+    def __init__(self, size=256, async_chars=2000, parent=None):
+        super().__init__(parent)
+        self.size = size
+        self.async_chars = async_chars
+        self.entries = OrderedDict()  # chave -> QTextDocument
+        self.waiters = {}             # chave -> vistas esperando o documento
+        self.worker = MarkdownWorker(self)
+        self.worker.rendered.connect(self.on_rendered)
+
+    def request(self, text, view):
+        key = content_key(text)
+        view.key = key
+        document = self.entries.get(key)
+        if document is not None:
+            self.entries.move_to_end(key)
+            view.show_document(document)
+            return
+        if len(text) < self.async_chars:
+            view.show_document(self.store(key, render_markdown(text)))
+            return
+        view.show_pending(text)
+        waiters = self.waiters.setdefault(key, [])
+        if not waiters:
+            self.worker.add(key, text)
+        waiters.append(view)
+
+    def store(self, key, document):
+        self.entries[key] = document
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+        return document
+
+    def on_rendered(self, key, document):
+        self.store(key, document)
+        for view in self.waiters.pop(key, []):
+            if not sip.isdeleted(view) and view.key == key:
+                view.show_document(document)
+
+    def stop(self):
+        with self.worker.lock:
+            self.worker.pending.clear()
+        self.worker.wait()
+
+
+class MarkdownView(QTextBrowser):
+    """
+    Conteúdo de uma nota renderizado; um clique fora de um link pede o editor.
+    Links [[...]] entre notas são repassados por `link_activated`.
+    """
+    edit_requested = pyqtSignal()
+    link_activated = pyqtSignal(str, str)  # arquivo, id da nota
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.key = ""
+        self.setOpenLinks(False)
+        self.anchorClicked.connect(self.on_anchor_clicked)
+
+    def on_anchor_clicked(self, url):
+        target = parse_link_url(url.toString())
+        if target is None:
+            QDesktopServices.openUrl(url)
+        else:
+            self.link_activated.emit(*target)
+
+    def show_document(self, document):
+        # A cópia anterior pertence à vista e é apagada pelo setDocument
+        self.setDocument(document.clone(self))
+
+    def show_pending(self, text):
+        # Texto cru até o documento interpretado chegar
+        self.setPlainText(text)
+
+    def mousePressEvent(self, event):
+        if self.anchorAt(event.pos()):
+            super().mousePressEvent(event)
+        else:
+            self.edit_requested.emit()
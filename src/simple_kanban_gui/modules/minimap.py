@@ -0,0 +1,158 @@
+import re
+
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtGui import QPainter, QPixmap, QColor, QPen
+from PyQt5.QtCore import Qt, QRectF, pyqtSignal
+
+BACKGROUND_RE = re.compile(r"background-color\s*:\s*([^;]+)")
+BORDER_RE = re.compile(r"border\s*:[^;]*?(#[0-9a-fA-F]{3,8})")
+
+# Largura (px) de cada coluna no desenho em cache; o mapa é escalado ao pintar
+COLUMN_WIDTH = 16
+NOTE_HEIGHT = 3
+NOTE_GAP = 1
+HEADER_HEIGHT = 4
+
+
+def style_colors(css, default):
+    """
+    Cores (fundo, borda) de uma folha de estilo "background-color: ...; border: ...".
+    """
+    background = QColor(default)
+    border = QColor(default).darker(130)
+    match = BACKGROUND_RE.search(css or "")
+    if match and QColor(match.group(1).strip()).isValid():
+        background = QColor(match.group(1).strip())
+    match = BORDER_RE.search(css or "")
+    if match:
+        border = QColor(match.group(1))
+    return background, border
+
+
+class BoardMinimap(QWidget):
+    """
+    Miniatura do quadro desenhada a partir do modelo (BoardDocument), sem
+    criar widgets de notas. Cada coluna é desenhada num QPixmap próprio, que
+    só é refeito quando essa coluna muda.
+    """
+    jump_requested = pyqtSignal(float)  # posição em unidades de coluna
+
+    def __init__(self, note_css, parent=None):
+        super().__init__(parent)
+        self.note_color = style_colors(note_css, "#ffffff")[0]
+        self.document = None
+        self.pixmaps = {}      # id() da coluna -> QPixmap
+        self.colors = {}       # folha de estilo -> (fundo, borda)
+        self.viewport = (0.0, 0.0)
+        self.setCursor(Qt.PointingHandCursor)
+        self.setAttribute(Qt.WA_OpaquePaintEvent, False)
+
+    def set_note_style(self, note_css):
+        """
+        Nova configuração: cores das notas e das colunas recalculadas.
+        """
+        self.note_color = style_colors(note_css, "#ffffff")[0]
+        self.pixmaps = {}
+        self.update()
+
+    def set_document(self, document):
+        if self.document is not None:
+            self.document.changed.disconnect(self.on_document_changed)
+        self.document = document
+        self.pixmaps = {}
+        document.changed.connect(self.on_document_changed)
+        self.update()
+
+    def on_document_changed(self, op):
+        # Colunas novas, removidas ou movidas não invalidam as demais
+        if op["op"].endswith(("_note", "_notes")):
+            columns = self.document.columns
+            boards = {op["board"]} if "board" in op else set(board for board, _ in op["notes"])
+            if "to_board" in op:
+                boards.add(op["to_board"])
+            for board in boards:
+                self.pixmaps.pop(id(columns[board]), None)
+        self.update()
+
+    def invalidate(self, *keys):
+        for key in keys:
+            self.pixmaps.pop(key, None)
+        self.update()
+
+    def set_viewport(self, first, last):
+        """
+        Faixa visível em unidades de coluna (pode ser fracionária).
+        """
+        self.viewport = (first, last)
+        self.update()
+
+    def resizeEvent(self, event):
+        if event.oldSize().height() != event.size().height():
+            self.pixmaps = {}
+        super().resizeEvent(event)
+
+    def column_colors(self, column):
+        css = self.document.column_style(column)["frame"]
+        colors = self.colors.get(css)
+        if colors is None:
+            colors = self.colors[css] = style_colors(css, "#e0e0e0")
+        return colors
+
+    def render_column(self, column):
+        height = max(1, self.height())
+        pixmap = QPixmap(COLUMN_WIDTH, height)
+        background, border = self.column_colors(column)
+        pixmap.fill(background)
+
+        painter = QPainter(pixmap)
+        painter.fillRect(0, 0, COLUMN_WIDTH, HEADER_HEIGHT, border)
+        notes = column.get("notes", [])
+        if notes:
+            # As notas são comprimidas quando não cabem na altura do mapa
+            step = min(NOTE_HEIGHT + NOTE_GAP, (height - HEADER_HEIGHT - 1) / len(notes))
+            block = max(step - NOTE_GAP, 1) if step > NOTE_GAP + 1 else max(step, 0.5)
+            y = HEADER_HEIGHT + 1
+            for _ in notes:
+                painter.fillRect(QRectF(2, y, COLUMN_WIDTH - 4, block), self.note_color)
+                y += step
+        painter.setPen(QPen(border))
+        painter.drawRect(0, 0, COLUMN_WIDTH - 1, height - 1)
+        painter.end()
+        return pixmap
+
+    def column_width(self):
+        if self.document is None or not self.document.columns:
+            return float(COLUMN_WIDTH)
+        return min(float(COLUMN_WIDTH), self.width() / len(self.document.columns))
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(0, 0, 0, 40))
+        if self.document is None:
+            return
+
+        width = self.column_width()
+        live = {}
+        for i, column in enumerate(self.document.columns):
+            key = id(column)
+            pixmap = self.pixmaps.get(key)
+            if pixmap is None:
+                pixmap = self.render_column(column)
+            live[key] = pixmap
+            painter.drawPixmap(QRectF(i * width, 0, width, self.height()), pixmap, QRectF(pixmap.rect()))
+        self.pixmaps = live  # descarta as colunas removidas
+
+        first, last = self.viewport
+        painter.setPen(QPen(QColor(0, 0, 0, 160), 2))
+        painter.setBrush(QColor(255, 255, 255, 50))
+        painter.drawRect(QRectF(first * width, 1, max((last - first) * width, 2), self.height() - 2))
+
+    def mousePressEvent(self, event):
+        self.jump_to(event.pos().x())
+
+    def mouseMoveEvent(self, event):
+        if event.buttons() & Qt.LeftButton:
+            self.jump_to(event.pos().x())
+
+    def jump_to(self, x):
+        self.jump_requested.emit(x / self.column_width())
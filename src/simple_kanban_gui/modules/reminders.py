@@ -0,0 +1,183 @@
+import os
+import time
+import heapq
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from PyQt5.QtWidgets import QApplication, QSystemTrayIcon, QMenu
+
+from simple_kanban_gui.modules.boardscan import BoardWatcher
+
+# Intervalo máximo de um QTimer (~24 dias)
+MAX_TIMER_MS = 2 ** 31 - 1
+
+# Quantidade de títulos listados numa notificação com várias notas
+NOTIFY_TITLES = 5
+
+
+def due_notes(data, path=""):
+    """
+    {chave: (vencimento, título da nota, título da coluna)} das notas com
+    "due" dos dados de um quadro.
+    """
+    entries = {}
+    for c, board in enumerate(data.get("boards", [])):
+        for n, note in enumerate(board.get("notes", [])):
+            due = note.get("due")
+            if due:
+                key = note.get("id") or f"{c}:{n}"
+                entries[key] = (float(due), note.get("title", ""), board.get("title", ""))
+    return entries
+
+
+class DueIndex:
+    """
+    Vencimentos de todos os quadros num heap mínimo. Entradas de quadros
+    relidos não são removidas do heap: são descartadas ao chegar ao topo se
+    não correspondem mais ao índice.
+    """
+    def __init__(self):
+        self.files = {}     # caminho -> {chave: (vencimento, título, coluna)}
+        self.heap = []      # (vencimento, caminho, chave)
+        self.fired = set()  # (caminho, chave, vencimento) já notificados
+        self.live = 0       # entradas válidas (para limitar o heap)
+
+    def update(self, path, entries):
+        old = self.files.get(path, {})
+        self.files[path] = entries
+        self.live += len(entries) - len(old)
+        for key, (due, _, _) in entries.items():
+            if key not in old or old[key][0] != due:
+                heapq.heappush(self.heap, (due, path, key))
+        self.compact()
+
+    def remove(self, path):
+        self.live -= len(self.files.pop(path, {}))
+
+    def valid(self, item):
+        due, path, key = item
+        entries = self.files.get(path)
+        if entries is None or key not in entries or entries[key][0] != due:
+            return False
+        return (path, key, due) not in self.fired
+
+    def next_due(self):
+        while self.heap and not self.valid(self.heap[0]):
+            heapq.heappop(self.heap)
+        return self.heap[0][0] if self.heap else None
+
+    def pop_due(self, now):
+        """
+        Notas vencidas até `now` ainda não notificadas: [(vencimento, caminho, título, coluna)].
+        """
+        result = []
+        while self.heap and self.heap[0][0] <= now:
+            item = heapq.heappop(self.heap)
+            if self.valid(item):
+                due, path, key = item
+                self.fired.add((path, key, due))
+                _, title, column = self.files[path][key]
+                result.append((due, path, title, column))
+        return result
+
+    def compact(self):
+        if len(self.heap) > 2 * self.live + 1024:
+            self.heap = [item for item in self.heap if self.valid(item)]
+            heapq.heapify(self.heap)
+
+
+class ReminderService(QObject):
+    """
+    Mantém o índice de vencimentos dos quadros sob `root` e emite `due` na
+    hora de cada vencimento. Um único QTimer aponta para o próximo item do
+    heap; os quadros alterados chegam pelo BoardWatcher, sem consultas
+    periódicas.
+    """
+    due = pyqtSignal(object)  # [(vencimento, caminho, título, coluna)]
+
+    def __init__(self, root, parent=None):
+        super().__init__(parent)
+        self.index = DueIndex()
+        self.boards = BoardWatcher(root, due_notes, self)
+        self.boards.updated.connect(self.on_updated)
+
+        self.due_timer = QTimer(self)
+        self.due_timer.setSingleShot(True)
+        self.due_timer.timeout.connect(self.on_due)
+
+    def start(self):
+        self.boards.start()
+
+    def on_updated(self, results):
+        for path, entries in results:
+            if entries is None:
+                self.index.remove(path)
+            else:
+                self.index.update(path, entries)
+        self.arm()
+
+    def arm(self):
+        next_due = self.index.next_due()
+        if next_due is None:
+            self.due_timer.stop()
+            return
+        delay = max(0, int((next_due - time.time()) * 1000))
+        self.due_timer.start(min(delay, MAX_TIMER_MS))
+
+    def on_due(self):
+        items = self.index.pop_due(time.time())
+        if items:
+            self.due.emit(items)
+        self.arm()
+
+    def stop(self):
+        self.due_timer.stop()
+        self.boards.stop()
+
+
+class ReminderTray(QSystemTrayIcon):
+    """
+    Ícone na bandeja que mostra os vencimentos do ReminderService. Um clique
+    na notificação abre o quadro da última nota notificada.
+    """
+    open_board = pyqtSignal(str)
+    open_manager = pyqtSignal()
+
+    def __init__(self, service, icon, labels, parent=None):
+        super().__init__(icon, parent)
+        self.service = service
+        self.labels = labels
+        self.last_path = ""
+        self.setToolTip(labels["tooltip"])
+
+        menu = QMenu()
+        menu.addAction(labels["open_manager"], self.open_manager.emit)
+        menu.addSeparator()
+        menu.addAction(labels["quit"], self.quit)
+        self.setContextMenu(menu)
+        self.menu = menu
+
+        self.messageClicked.connect(self.on_message_clicked)
+        service.due.connect(self.notify)
+
+    def notify(self, items):
+        items.sort()
+        self.last_path = items[-1][1]
+        if len(items) == 1:
+            due, path, title, column = items[0]
+            when = time.strftime("%Y-%m-%d %H:%M", time.localtime(due))
+            body = f"{title}\n{column} — {os.path.basename(path)}\n{when}"
+            self.showMessage(self.labels["due"], body, QSystemTrayIcon.Information)
+            return
+        lines = [f"{title} ({os.path.basename(path)})" for _, path, title, _ in items[:NOTIFY_TITLES]]
+        if len(items) > NOTIFY_TITLES:
+            lines.append("…")
+        self.showMessage(f"{len(items)} {self.labels['overdue']}", "\n".join(lines), QSystemTrayIcon.Information)
+
+    def on_message_clicked(self):
+        if self.last_path:
+            self.open_board.emit(self.last_path)
+
+    def quit(self):
+        self.service.stop()
+        self.hide()
+        QApplication.quit()
@@ -0,0 +1,130 @@
+import re
+import bisect
+import unicodedata
+
+from simple_kanban_gui.modules.blobs import note_text
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def normalize(text):
+    """
+    Minúsculas e sem acentos, para que "Ação" e "acao" coincidam.
+    """
+    text = text.casefold()
+    if text.isascii():
+        return text
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text):
+    return set(TOKEN_RE.findall(normalize(text)))
+
+
+class NoteIndex:
+    """
+    Índice invertido (token normalizado -> ids de notas) sobre título e
+    conteúdo das notas. Os tokens ficam também numa lista ordenada, de modo
+    que a busca por prefixo é feita com bisect. Os conteúdos gravados em
+    arquivos separados são lidos do diretório do quadro `path`.
+    """
+    def __init__(self, path=""):
+        self.path = path
+        self.postings = {}       # token -> set de ids
+        self.note_tokens = {}    # id -> set de tokens
+        self.sorted_tokens = []
+
+    def tokens(self, note):
+        return tokenize(note.get("title", "") + "\n" + note_text(note, self.path))
+
+    @classmethod
+    def from_boards(cls, boards, path=""):
+        index = cls(path)
+        postings = index.postings
+        for board in boards:
+            for note in board.get("notes", []):
+                tokens = index.tokens(note)
+                index.note_tokens[note["id"]] = tokens
+                for token in tokens:
+                    ids = postings.get(token)
+                    if ids is None:
+                        ids = postings[token] = set()
+                    ids.add(note["id"])
+        index.sorted_tokens = sorted(postings)
+        return index
+
+    def update(self, note):
+        note_id = note.get("id")
+        if note_id is None:
+            return
+        tokens = self.tokens(note)
+        old = self.note_tokens.get(note_id, set())
+        for token in old - tokens:
+            self._unlink(token, note_id)
+        for token in tokens - old:
+            ids = self.postings.get(token)
+            if ids is None:
+                ids = self.postings[token] = set()
+                bisect.insort(self.sorted_tokens, token)
+            ids.add(note_id)
+        self.note_tokens[note_id] = tokens
+
+    def update_many(self, notes):
+        """
+        Indexa notas novas de uma vez; a lista ordenada de tokens é refeita
+        uma única vez em vez de um insort por token.
+        """
+        postings = self.postings
+        new_tokens = []
+        for note in notes:
+            note_id = note["id"]
+            if note_id in self.note_tokens:
+                self.update(note)
+                continue
+            tokens = self.tokens(note)
+            self.note_tokens[note_id] = tokens
+            for token in tokens:
+                ids = postings.get(token)
+                if ids is None:
+                    ids = postings[token] = set()
+                    new_tokens.append(token)
+                ids.add(note_id)
+        if new_tokens:
+            self.sorted_tokens = sorted(self.sorted_tokens + new_tokens)
+
+    def discard(self, note_id):
+        for token in self.note_tokens.pop(note_id, ()):
+            self._unlink(token, note_id)
+
+    def _unlink(self, token, note_id):
+        ids = self.postings[token]
+        ids.discard(note_id)
+        if not ids:
+            del self.postings[token]
+            del self.sorted_tokens[bisect.bisect_left(self.sorted_tokens, token)]
+
+    def prefix_ids(self, prefix):
+        ids = set()
+        tokens = self.sorted_tokens
+        i = bisect.bisect_left(tokens, prefix)
+        while i < len(tokens) and tokens[i].startswith(prefix):
+            ids |= self.postings[tokens[i]]
+            i += 1
+        return ids
+
+    def search(self, query):
+        """
+        Ids das notas que têm, para cada termo da consulta, um token que
+        começa com ele. Devolve None para uma consulta vazia.
+        """
+        terms = sorted(tokenize(query), key=len, reverse=True)
+        if not terms:
+            return None
+        result = None
+        for term in terms:
+            ids = self.prefix_ids(term)
+            result = ids if result is None else result & ids
+            if not result:
+                break
+        return result
@@ -0,0 +1,74 @@
+import os
+import hashlib
+
+from simple_kanban_gui.modules import codec
+
+LAYOUT_KEY = "layout"
+SHARDED = "sharded"
+SHARD_DIR_SUFFIX = ".d"
+
+
+def is_sharded(data):
+    return data.get(LAYOUT_KEY) == SHARDED
+
+
+def shard_dir(path):
+    """
+    Diretório dos arquivos de coluna: "x.kanban.json" -> "x.kanban.d".
+    """
+    root, _ = os.path.splitext(path)
+    return root + SHARD_DIR_SUFFIX
+
+
+def shard_path(path, board_id):
+    return os.path.join(shard_dir(path), board_id + ".json")
+
+
+def encode_shard(column):
+    return codec.dumps({"id": column["id"], "notes": column["notes"]}, indent=True)
+
+
+def read_shard(path, board_id):
+    """
+    Notas de uma coluna e o texto lido (vazio se o arquivo não existir).
+    """
+    try:
+        with open(shard_path(path, board_id), "r", encoding="utf-8") as f:
+            text = f.read()
+    except FileNotFoundError:
+        return [], ""
+    return codec.loads(text)["notes"], text
+
+
+def shard_digest(board_id, text):
+    return board_id + ":" + hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def combined_digest(manifest_text, shard_digests):
+    """
+    Hash do manifesto e das colunas lidas/gravadas, na ordem do manifesto.
+    """
+    return hashlib.sha1((manifest_text + "\n" + "\n".join(shard_digests)).encode("utf-8")).hexdigest()
+
+
+def shard_files(path):
+    """
+    Ids das colunas com arquivo no diretório de colunas.
+    """
+    directory = shard_dir(path)
+    if not os.path.isdir(directory):
+        return []
+    return [name[:-5] for name in os.listdir(directory) if name.endswith(".json") and not name.startswith(".")]
+
+
+def remove_shards(path, keep=()):
+    """
+    Apaga os arquivos de colunas que não estão em `keep` (colunas removidas
+    ou conversão para o formato de arquivo único).
+    """
+    directory = shard_dir(path)
+    for board_id in shard_files(path):
+        if board_id not in keep:
+            os.remove(os.path.join(directory, board_id + ".json"))
+    if not keep and os.path.isdir(directory) and not os.listdir(directory):
+        os.rmdir(directory)
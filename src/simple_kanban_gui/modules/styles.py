@@ -0,0 +1,121 @@
+import sys
+
+STYLES_KEY = "styles"
+STYLE_NAME_KEY = "style_name"
+DEFAULT_STYLE = "default"
+
+# Versão do formato dos arquivos. Na 2 o "style" de uma coluna é o nome de um
+# estilo (de data["styles"] ou da configuração); as versões anteriores do
+# programa só leem estilos completos, gravados com board_inline_styles
+FORMAT_KEY = "format"
+FORMAT_VERSION = 2
+
+# Estilos já vistos, por conteúdo: colunas com o mesmo estilo (em qualquer
+# quadro aberto) usam o mesmo dicionário e as mesmas strings
+_shared = {}
+
+# Estilos com nome definidos na configuração ("default" é o board_style)
+_config = {}
+
+
+def share_style(style):
+    """
+    Devolve o dicionário compartilhado com o conteúdo de `style`.
+    """
+    frame = style.get("frame", "")
+    title = style.get("title", "")
+    key = (frame, title)
+    shared = _shared.get(key)
+    if shared is None:
+        shared = _shared[key] = {"frame": sys.intern(frame), "title": sys.intern(title)}
+    return shared
+
+
+def set_config_styles(styles, default):
+    """
+    Registra os estilos com nome da configuração; `default` é usado pelas
+    colunas sem estilo ou com um nome desconhecido.
+    """
+    _config.clear()
+    for name, style in styles.items():
+        _config[sys.intern(name)] = share_style(style)
+    _config.setdefault(DEFAULT_STYLE, share_style(default))
+
+
+def resolve_style(ref, file_styles=None):
+    """
+    Estilo de uma coluna: nome procurado nos estilos do arquivo e depois nos
+    da configuração; dicionários (formato antigo) são aceitos diretamente.
+    """
+    if isinstance(ref, dict):
+        return share_style(ref)
+    if ref is not None:
+        style = (file_styles or {}).get(ref)
+        if style is not None:
+            return share_style(style)
+        style = _config.get(ref)
+        if style is not None:
+            return style
+    return _config.get(DEFAULT_STYLE) or share_style({})
+
+
+def inline_style(column, file_styles=None):
+    """
+    Coluna para as versões anteriores (exportação opcional): "style" recebe
+    o estilo resolvido (frame, title) e o nome vai em "style_name".
+    """
+    ref = column.get("style")
+    if not isinstance(ref, str):
+        return column
+    style = resolve_style(ref, file_styles)
+    return dict(column, style={"frame": style["frame"], "title": style["title"]}, **{STYLE_NAME_KEY: ref})
+
+
+def named_style(column):
+    """
+    Inverso de inline_style: a coluna volta a referenciar o estilo pelo nome.
+    """
+    name = column.get(STYLE_NAME_KEY)
+    if not isinstance(name, str):
+        return column
+    column = {key: value for key, value in column.items() if key != STYLE_NAME_KEY}
+    column["style"] = sys.intern(name)
+    return column
+
+
+def normalize_styles(data):
+    """
+    Troca os estilos completos gravados em cada coluna por nomes: o gravado
+    ao lado em "style_name" ou, nos arquivos de versões anteriores, o de um
+    estilo igual da configuração ou do arquivo, ou um novo nome registrado
+    uma única vez em data["styles"]. Os dados passam à versão FORMAT_VERSION.
+    """
+    boards = data.get("boards", [])
+    for i, board in enumerate(boards):
+        if STYLE_NAME_KEY in board:
+            boards[i] = named_style(board)
+    if data.get(FORMAT_KEY, 1) < FORMAT_VERSION:
+        data[FORMAT_KEY] = FORMAT_VERSION
+    if not any(isinstance(board.get("style"), dict) for board in boards):
+        return data
+
+    file_styles = {sys.intern(name): share_style(style) for name, style in data.get(STYLES_KEY, {}).items()}
+    names = {id(style): name for name, style in _config.items()}
+    names.update((id(style), name) for name, style in file_styles.items())
+    count = len(file_styles)
+    for board in boards:
+        style = board.get("style")
+        if not isinstance(style, dict):
+            continue
+        style = share_style(style)
+        name = names.get(id(style))
+        if name is None:
+            count += 1
+            while "style" + str(count) in file_styles or "style" + str(count) in _config:
+                count += 1
+            name = names[id(style)] = sys.intern("style" + str(count))
+            file_styles[name] = style
+        board["style"] = name
+    if file_styles:
+        data[STYLES_KEY] = file_styles
+    return data
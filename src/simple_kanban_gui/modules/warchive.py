@@ -0,0 +1,93 @@
+import time
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QTableView, QLabel,
+    QAbstractItemView, QHeaderView
+)
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+
+
+class ArchiveModel(QAbstractTableModel):
+    """Notas arquivadas (título, coluna de origem, data), sem widgets por nota"""
+    def __init__(self, records, headers, parent=None):
+        super().__init__(parent)
+        self.records = records
+        self.headers = headers
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.records)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 3
+
+    def data(self, index, role=Qt.DisplayRole):
+        record = self.records[index.row()]
+        if role == Qt.DisplayRole:
+            if index.column() == 0:
+                return record["note"].get("title", "")
+            if index.column() == 1:
+                return record.get("board", "")
+            return time.strftime("%Y-%m-%d %H:%M", time.localtime(record.get("archived", 0)))
+        if role == Qt.ToolTipRole:
+            return record["note"].get("content", "")
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return None
+
+    def remove_rows(self, rows):
+        for row in sorted(rows, reverse=True):
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.records[row]
+            self.endRemoveRows()
+
+
+class ArchiveWindow(QDialog):
+    """Archive view window"""
+    restore_requested = pyqtSignal(object)  # lista de registros
+
+    def __init__(self, records, labels, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(labels["title"])
+        self.resize(700, 500)
+
+        layout = QVBoxLayout(self)
+
+        self.count_label = QLabel()
+        layout.addWidget(self.count_label)
+
+        self.model = ArchiveModel(records, labels["headers"], self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        layout.addWidget(self.table)
+
+        btn_layout = QHBoxLayout()
+        self.restore_btn = QPushButton(labels["restore"])
+        self.restore_btn.clicked.connect(self.on_restore)
+        close_btn = QPushButton(labels["close"])
+        close_btn.clicked.connect(self.accept)
+        btn_layout.addStretch()
+        btn_layout.addWidget(self.restore_btn)
+        btn_layout.addWidget(close_btn)
+        layout.addLayout(btn_layout)
+
+        self.count_text = labels["count"]
+        self.update_count()
+
+    def update_count(self):
+        self.count_label.setText(f"{self.model.rowCount()} {self.count_text}")
+
+    def on_restore(self):
+        rows = sorted(set(index.row() for index in self.table.selectionModel().selectedRows()))
+        if not rows:
+            return
+        records = [self.model.records[row] for row in rows]
+        self.model.remove_rows(rows)
+        self.update_count()
+        self.restore_requested.emit(records)
@@ -0,0 +1,42 @@
+import time
+
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QDialogButtonBox, QDateTimeEdit, QLabel
+from PyQt5.QtCore import QDateTime
+
+
+class DueDialog(QDialog):
+    """Escolha do vencimento de uma nota"""
+    def __init__(self, due, labels, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(labels["title"])
+        self.cleared = False
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel(labels["label"]))
+
+        self.edit = QDateTimeEdit()
+        self.edit.setCalendarPopup(True)
+        self.edit.setDisplayFormat("yyyy-MM-dd HH:mm")
+        if due:
+            self.edit.setDateTime(QDateTime.fromSecsSinceEpoch(int(due)))
+        else:
+            # Sugestão: daqui a um dia, na hora cheia
+            self.edit.setDateTime(QDateTime.fromSecsSinceEpoch(int(time.time()) // 3600 * 3600 + 86400))
+        layout.addWidget(self.edit)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        clear_btn = buttons.addButton(labels["clear"], QDialogButtonBox.ResetRole)
+        clear_btn.clicked.connect(self.clear)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def clear(self):
+        self.cleared = True
+        self.accept()
+
+    def due(self):
+        """Vencimento escolhido (segundos desde a época) ou None se removido"""
+        if self.cleared:
+            return None
+        return self.edit.dateTime().toSecsSinceEpoch()
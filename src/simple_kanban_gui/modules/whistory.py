@@ -0,0 +1,139 @@
+import time
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QListWidget, QListWidgetItem,
+    QTreeWidget, QTreeWidgetItem, QSplitter, QLabel, QAbstractItemView, QMessageBox
+)
+from PyQt5.QtCore import Qt, pyqtSignal
+
+from simple_kanban_gui.modules.blobs import note_text
+
+MARKS = {"added": "+", "removed": "-", "changed": "~"}
+
+
+class HistoryWindow(QDialog):
+    """
+    Versões gravadas de um quadro. Selecionar uma versão mostra o que mudou
+    dela até a mais recente (ou até a outra versão selecionada); as notas e
+    colunas podem ser restauradas como estavam na versão mais antiga.
+    """
+    restore_note = pyqtSignal(object, object, int)  # nota, cabeçalho da coluna, posição
+    restore_column = pyqtSignal(object, int)        # coluna completa, posição
+    restore_board = pyqtSignal(object)              # dados completos do quadro
+
+    def __init__(self, store, versions, labels, board_path="", parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.board_path = board_path  # de onde são lidos os conteúdos em arquivos separados
+        self.versions = versions
+        self.labels = labels
+        self.old = None  # versão de onde as restaurações são tiradas
+        self.setWindowTitle(labels["title"])
+        self.resize(900, 550)
+
+        layout = QVBoxLayout(self)
+        splitter = QSplitter(Qt.Horizontal)
+
+        self.version_list = QListWidget()
+        self.version_list.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        for i in reversed(range(len(versions))):
+            entry = versions[i]
+            text = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry["time"]))
+            item = QListWidgetItem(f"{text}  ({entry['columns']} {labels['columns']})")
+            item.setData(Qt.UserRole, i)
+            self.version_list.addItem(item)
+        self.version_list.itemSelectionChanged.connect(self.update_diff)
+        splitter.addWidget(self.version_list)
+
+        self.diff_tree = QTreeWidget()
+        self.diff_tree.setHeaderHidden(True)
+        self.diff_tree.itemSelectionChanged.connect(self.update_buttons)
+        splitter.addWidget(self.diff_tree)
+        splitter.setSizes([300, 600])
+        layout.addWidget(splitter)
+
+        self.info_label = QLabel(labels["select"])
+        layout.addWidget(self.info_label)
+
+        btn_layout = QHBoxLayout()
+        self.restore_note_btn = QPushButton(labels["restore_note"])
+        self.restore_note_btn.clicked.connect(self.on_restore_note)
+        self.restore_column_btn = QPushButton(labels["restore_column"])
+        self.restore_column_btn.clicked.connect(self.on_restore_column)
+        self.restore_board_btn = QPushButton(labels["restore_board"])
+        self.restore_board_btn.clicked.connect(self.on_restore_board)
+        close_btn = QPushButton(labels["close"])
+        close_btn.clicked.connect(self.accept)
+        btn_layout.addStretch()
+        for btn in (self.restore_note_btn, self.restore_column_btn, self.restore_board_btn, close_btn):
+            btn_layout.addWidget(btn)
+        layout.addLayout(btn_layout)
+        self.update_buttons()
+
+    def selected_versions(self):
+        return sorted(item.data(Qt.UserRole) for item in self.version_list.selectedItems())
+
+    def update_diff(self):
+        self.diff_tree.clear()
+        selected = self.selected_versions()
+        self.old = None
+        if not selected:
+            self.info_label.setText(self.labels["select"])
+            self.update_buttons()
+            return
+        old = selected[0]
+        new = selected[-1] if len(selected) > 1 else len(self.versions) - 1
+        self.old = self.versions[old]["version"]
+        if old == new:
+            self.info_label.setText(self.labels["latest"])
+            self.update_buttons()
+            return
+
+        for header, column_digest, state, notes in self.store.diff(self.old, self.versions[new]["version"]):
+            column_item = QTreeWidgetItem([f"{MARKS[state]} {header.get('title', '')}"])
+            column_item.setData(0, Qt.UserRole, ("column", header, column_digest))
+            for note_state, old_note, new_note, index in notes:
+                note = old_note if old_note is not None else new_note
+                item = QTreeWidgetItem([f"{MARKS[note_state]} {note.get('title', '')}"])
+                item.setToolTip(0, note_text(note, self.board_path))
+                item.setData(0, Qt.UserRole, ("note", header, old_note, index))
+                column_item.addChild(item)
+            self.diff_tree.addTopLevelItem(column_item)
+        self.diff_tree.expandAll()
+        self.info_label.setText(f"{self.labels['diff']} {self.diff_tree.topLevelItemCount()}")
+        self.update_buttons()
+
+    def selected_item(self):
+        """
+        (nota antiga, posição, dados da coluna) do item selecionado; a nota é
+        None quando uma coluna está selecionada.
+        """
+        items = self.diff_tree.selectedItems()
+        if not items:
+            return None
+        data = items[0].data(0, Qt.UserRole)
+        if data[0] == "note":
+            return data[2], data[3], items[0].parent().data(0, Qt.UserRole)
+        return None, None, data
+
+    def update_buttons(self):
+        selected = self.selected_item()
+        # Notas e colunas que só existem na versão mais nova não têm o que restaurar
+        self.restore_note_btn.setEnabled(selected is not None and selected[0] is not None)
+        self.restore_column_btn.setEnabled(selected is not None and selected[2][2] is not None)
+        self.restore_board_btn.setEnabled(self.old is not None)
+
+    def on_restore_note(self):
+        note, index, (_, header, _) = self.selected_item()
+        self.restore_note.emit(dict(note), header, index)
+
+    def on_restore_column(self):
+        _, header, column_digest = self.selected_item()[2]
+        columns = self.store.get(self.old)["columns"]
+        index = next((i for i, (column_id, _) in enumerate(columns) if column_id == header["id"]), 0)
+        self.restore_column.emit(self.store.load_column(column_digest), index)
+
+    def on_restore_board(self):
+        if QMessageBox.question(self, self.labels["restore_board"], self.labels["restore_board_prompt"]) != QMessageBox.Yes:
+            return
+        self.restore_board.emit(self.store.load_version(self.old))
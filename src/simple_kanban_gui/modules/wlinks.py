@@ -0,0 +1,44 @@
+import os
+
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QListWidget, QListWidgetItem
+from PyQt5.QtCore import Qt, pyqtSignal
+
+
+class BacklinkPanel(QWidget):
+    """
+    Lista das notas que citam a nota (ou o quadro) em foco; um duplo clique
+    abre a nota de origem.
+    """
+    open_requested = pyqtSignal(str, str)  # caminho, id da nota
+
+    def __init__(self, labels, parent=None):
+        super().__init__(parent)
+        self.labels = labels
+
+        layout = QVBoxLayout(self)
+        self.target_label = QLabel(labels["none"])
+        self.target_label.setWordWrap(True)
+        layout.addWidget(self.target_label)
+
+        self.list = QListWidget()
+        self.list.itemActivated.connect(self.on_item_activated)
+        layout.addWidget(self.list)
+
+    def set_backlinks(self, target, backlinks):
+        """
+        `target` é o texto que identifica a nota em foco; `backlinks` vem de
+        BacklinkIndex.backlinks().
+        """
+        self.list.clear()
+        if not target:
+            self.target_label.setText(self.labels["none"])
+            return
+        self.target_label.setText(f"{self.labels['referenced_by']} {target} ({len(backlinks)})")
+        for path, note_id, title in backlinks:
+            item = QListWidgetItem(f"{title or note_id} — {os.path.basename(path)}")
+            item.setToolTip(f"{path}#{note_id}")
+            item.setData(Qt.UserRole, (path, note_id))
+            self.list.addItem(item)
+
+    def on_item_activated(self, item):
+        self.open_requested.emit(*item.data(Qt.UserRole))
@@ -1,5 +1,6 @@
 import sys
-import json
+import time
+import bisect
 import os
 import signal
 import subprocess
@@ -7,10 +8,11 @@ import subprocess
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
     QLabel, QTextEdit, QScrollArea, QLineEdit, QFileDialog, QToolBar,
-    QMainWindow, QAction, QMessageBox, QSizePolicy, QFrame
+    QMainWindow, QAction, QMessageBox, QSizePolicy, QFrame, QProgressBar,
+    QToolButton, QTabWidget, QTabBar, QMenu, QInputDialog, QDockWidget
 )
 from PyQt5.QtGui import QIcon
-from PyQt5.QtCore import Qt, QMimeData, QByteArray, QDataStream, QIODevice, QUrl
+from PyQt5.QtCore import Qt, QEvent, QMimeData, QByteArray, QDataStream, QIODevice, QUrl, QThread, QTimer, QFileSystemWatcher, pyqtSignal
 from PyQt5.QtGui import QFontMetrics, QDesktopServices
 from PyQt5 import QtGui
 
@@ -18,12 +20,32 @@ from PyQt5 import QtGui
 
 import simple_kanban_gui.about as about
 import simple_kanban_gui.modules.configure as configure 
-from simple_kanban_gui.desktop import create_desktop_file, create_desktop_directory, create_desktop_menu
-from simple_kanban_gui.modules.wabout  import show_about_window
+from simple_kanban_gui.desktop import install_desktop_entries_later
+from simple_kanban_gui.modules.loader  import BoardParser, ChunkedBuilder
+from simple_kanban_gui.modules.document import BoardDocument, BoardSaver, index_of
+from simple_kanban_gui.modules.journal  import BoardJournal, journal_path
+from simple_kanban_gui.modules.shards   import LAYOUT_KEY, SHARDED, read_shard, shard_dir
+from simple_kanban_gui.modules.minimap  import BoardMinimap, COLUMN_WIDTH
+from simple_kanban_gui.modules.archive  import ArchiveLoader, archive_path, archive_records, restore_records, append_records
+from simple_kanban_gui.modules.styles   import DEFAULT_STYLE, set_config_styles, resolve_style, named_style
+from simple_kanban_gui.modules.markdown import MarkdownCache, MarkdownView
+from simple_kanban_gui.modules          import codec
+from simple_kanban_gui.modules.formats  import save_filters, open_filter, path_for_filter
+from simple_kanban_gui.modules.links    import LinkService, link_target, linkify
+from simple_kanban_gui.modules.icons    import theme_icon
+from simple_kanban_gui.modules.boardstyle import (
+    BoardStyleSheet, repolish, COLUMN_NAME, COLUMN_TITLE_NAME, NOTE_NAME, NOTE_DUE_NAME,
+    STYLE_PROPERTY, CONFLICT_PROPERTY, DUE_PROPERTY
+)
+from simple_kanban_gui.modules.wlinks   import BacklinkPanel
+from simple_kanban_gui.modules.blobs    import BLOB_KEY, SIZE_KEY, blob_dir, is_stub, read_blob, inline_note
 
 # Path to config file
 CONFIG_PATH = os.path.join(os.path.expanduser("~"),".config",about.__package__,"config.json")
 
+# Diretório kanban escolhido no gestor (simple-kanban-manager)
+INFO_PATH = os.path.join(os.path.expanduser("~"),".config",about.__package__,"info_path.json")
+
 DEFAULT_CONTENT={   "toolbar_new_kanban": "New kanban",
                     "toolbar_new_kanban_tooltip": "New kanban window",
                     "toolbar_add_column": "Add board",
@@ -34,6 +56,18 @@ DEFAULT_CONTENT={   "toolbar_new_kanban": "New kanban",
                     "toolbar_save_as_tooltip": "Save data to JSON file",
                     "toolbar_load": "Load",
                     "toolbar_load_tooltip": "Load data from Json file",
+                    "toolbar_filter": "Filter notes",
+                    "toolbar_filter_tooltip": "Show only the notes containing these words",
+                    "toolbar_minimap": "Minimap",
+                    "toolbar_minimap_tooltip": "Show an overview of all boards and notes",
+                    "toolbar_sharded": "Split file",
+                    "toolbar_sharded_tooltip": "Store this kanban as a small manifest plus one file per board",
+                    "toolbar_archive": "Archive",
+                    "toolbar_archive_tooltip": "Show the archived notes of this kanban",
+                    "toolbar_backlinks": "References",
+                    "toolbar_backlinks_tooltip": "Show the notes that link to the focused note",
+                    "toolbar_history": "History",
+                    "toolbar_history_tooltip": "Browse, compare and restore saved versions of this kanban",
                     "toolbar_configure": "Configure",
                     "toolbar_configure_tooltip": "Open the configure Json file",
                     "toolbar_about": "About",
@@ -43,6 +77,42 @@ DEFAULT_CONTENT={   "toolbar_new_kanban": "New kanban",
                     "window_filename": "Filename:",
                     "window_path_problems": "Path problems!",
                     "window_error_loading": "Error when loading:",
+                    "window_loading": "Loading:",
+                    "window_loading_cancel": "Cancel loading",
+                    "window_loading_cancelled": "Loading cancelled",
+                    "window_saved": "Saved:",
+                    "window_archived": "notes archived in",
+                    "window_archive_needs_file": "Save the kanban to a file before archiving notes.",
+                    "window_storage_needs_file": "Save the kanban to a file before changing how it is stored.",
+                    "window_error_archive": "Error using the archive file:",
+                    "window_error_import": "Could not import the file:",
+                    "window_selected": "notes selected",
+                    "archive_title": "Archived notes",
+                    "archive_headers": ["Note", "Board", "Archived"],
+                    "archive_count": "archived notes",
+                    "archive_restore": "Restore",
+                    "archive_close": "Close",
+                    "archive_age_days": 30,
+                    "history": True,
+                    "history_dir": "",
+                    "history_title": "History",
+                    "history_columns": "boards",
+                    "history_select": "Select a version to compare it with the latest one, or two versions to compare them",
+                    "history_latest": "This is the latest version",
+                    "history_diff": "Changed boards:",
+                    "history_empty": "No saved versions of this kanban yet",
+                    "history_restore_note": "Restore note",
+                    "history_restore_column": "Restore board",
+                    "history_restore_board": "Restore kanban",
+                    "history_restore_board_prompt": "Replace the whole kanban by the selected version?",
+                    "history_close": "Close",
+                    "window_error_saving": "Error when saving:",
+                    "autosave": True,
+                    "autosave_delay_ms": 2000,
+                    "journal": False,
+                    "journal_compact_bytes": 1048576,
+                    "window_reloaded": "Reloaded from disk:",
+                    "window_conflicts": "notes changed on disk and here; local versions kept",
                     "window_width": 1500,
                     "window_height": 800,
                     "kanban_title_label":"Title",
@@ -51,56 +121,223 @@ DEFAULT_CONTENT={   "toolbar_new_kanban": "New kanban",
                     "kanban_description_default":"",
                     "board_startup_list": ["To do", "Doing", "Done"],
                     "board_style": {"frame":"background-color: #e0f5e0; border: 2px solid #66cc66; padding: 5px; border-radius: 5px;","title":"font-weight: bold; background-color: #ccffcc; color:#000000"},
+                    "board_styles": {},
+                    "board_inline_styles": False,
                     "board_title": "New board",
                     "board_new_note": "Add a new note",
                     "board_delete": "Remove board",
-                    "board_interchange_right": "Interchange board with the right",
+                    "board_archive_all": "Archive all notes",
+                    "board_archive_older": "Archive old notes...",
+                    "board_archive_older_prompt": "Archive the notes not changed in the last N days:",
+                    "board_move_selected": "Move selected notes here",
+                    "board_delete_selected": "Delete selected notes",
+                    "board_archive_selected": "Archive selected notes",
+                    "board_clear_selection": "Clear selection",
+                    "board_paste_notes": "Paste lines as notes",
+                    "board_import_notes": "Import notes from CSV/TSV...",
+                    "board_import_filter": "CSV/TSV (*.csv *.tsv *.txt)",
+                    "board_bulk_rebuild": 64,
+                    "board_move_left": "Move board to the left",
+                    "board_move_right": "Move board to the right",
                     "board_width": 350,
+                    "board_virtual_margin": 1,
+                    "minimap": True,
+                    "minimap_height": 80,
                     "note_style": {"frame":"background-color: #ffffff; border: 1px solid #cccccc; border-radius: 5px;"},
                     "note_title": "Initial title",
                     "note_content": "Hi",
                     "note_expand_compress": "Expand/Compress content",
-                    "note_remove": "Remove note"
+                    "note_markdown": True,
+                    "note_markdown_cache": 256,
+                    "note_markdown_async_chars": 2000,
+                    "note_blob_chars": 32768,
+                    "note_remove": "Remove note",
+                    "note_archive": "Archive note",
+                    "note_conflict": "Changed on disk and here; the local version was kept",
+                    "note_match_color": "#ff9900",
+                    "note_selected_color": "#3399ff",
+                    "note_conflict_style": "border: 2px solid #cc3333;",
+                    "note_due": "Due date",
+                    "note_due_label": "Remind me at:",
+                    "note_due_clear": "Remove due date",
+                    "note_due_style": "",
+                    "note_due_overdue_style": "color: #cc3333; font-weight: bold;",
+                    "links": True,
+                    "links_root": "",
+                    "links_title": "Referenced by",
+                    "links_referenced_by": "Notes linking to",
+                    "links_none": "Focus a note to see the notes that link to it with [[file#id]].",
+                    "window_link_missing": "Linked kanban not found:",
+                    "window_note_missing": "Linked note not found:"
                 }
 
 configure.verify_default_config(CONFIG_PATH,default_content=DEFAULT_CONTENT)
 
-CONFIG=configure.load_config(CONFIG_PATH)
-
+# Recarregada quando o arquivo muda; CONFIG é o dicionário atualizado no lugar
+LIVE_CONFIG=configure.LiveConfig(CONFIG_PATH,default_content=DEFAULT_CONTENT)
+CONFIG=LIVE_CONFIG.data
+
+# Estilos com nome que as colunas referenciam pela chave "style"
+set_config_styles(CONFIG["board_styles"], CONFIG["board_style"])
+
+NOTE_MIME_TYPE = "application/x-kanban-note"
+COLUMN_MIME_TYPE = "application/x-kanban-column"
+
+_markdown_cache = None
+_board_style = None
+_history_store = None
+_link_service = None
+
+def link_service(hint=""):
+    """
+    Índice de referências [[...]] compartilhado, sobre o diretório kanban
+    (ou o diretório de `hint` se nenhum estiver configurado). None se
+    desativado ou ainda sem diretório. Criado só quando o painel de
+    referências é aberto ou uma referência é seguida: a primeira leitura
+    percorre a árvore inteira.
+    """
+    global _link_service
+    if _link_service is None and CONFIG["links"]:
+        root = CONFIG["links_root"]
+        if not root and os.path.exists(INFO_PATH):
+            root = configure.load_config(INFO_PATH).get("kanban_path", "")
+        if not root and hint:
+            root = os.path.dirname(os.path.abspath(hint))
+        if root:
+            app = QApplication.instance()
+            _link_service = LinkService(root, app)
+            app.aboutToQuit.connect(_link_service.stop)
+            _link_service.start()
+    return _link_service
+
+def history_store():
+    """
+    Repositório de versões compartilhado pelos quadros (None se desativado).
+    """
+    global _history_store
+    if _history_store is None and CONFIG["history"]:
+        root = CONFIG["history_dir"] or os.path.join(os.path.dirname(CONFIG_PATH), "history")
+        from simple_kanban_gui.modules.history import HistoryStore
+        _history_store = HistoryStore(os.path.expanduser(root))
+    return _history_store
+
+def board_style():
+    """
+    Folha de estilo única das colunas e notas, aplicada nos contêineres dos quadros.
+    """
+    global _board_style
+    if _board_style is None:
+        _board_style = BoardStyleSheet( CONFIG["note_style"]["frame"],
+                                        CONFIG["note_conflict_style"],
+                                        CONFIG["note_due_style"],
+                                        CONFIG["note_due_overdue_style"],
+                                        QApplication.instance())
+        # Estilos da configuração registrados antes do primeiro quadro
+        _board_style.pin([resolve_style(name) for name in [DEFAULT_STYLE] + list(CONFIG["board_styles"])])
+    return _board_style
+
+def on_config_changed(keys):
+    """
+    Estilos da configuração recarregada; as janelas abertas se atualizam
+    depois (sinal LIVE_CONFIG.changed).
+    """
+    if keys & {"board_styles", "board_style"}:
+        set_config_styles(CONFIG["board_styles"], CONFIG["board_style"])
+    if _board_style is not None:
+        _board_style.set_note_styles(   CONFIG["note_style"]["frame"],
+                                        CONFIG["note_conflict_style"],
+                                        CONFIG["note_due_style"],
+                                        CONFIG["note_due_overdue_style"])
+        _board_style.pin([resolve_style(name) for name in [DEFAULT_STYLE] + list(CONFIG["board_styles"])])
+
+LIVE_CONFIG.changed.connect(on_config_changed)
+
+def markdown_cache():
+    """
+    Cache único dos conteúdos renderizados, criado no primeiro uso.
+    """
+    global _markdown_cache
+    if _markdown_cache is None:
+        app = QApplication.instance()
+        _markdown_cache = MarkdownCache(CONFIG["note_markdown_cache"], CONFIG["note_markdown_async_chars"], app)
+        app.aboutToQuit.connect(_markdown_cache.stop)
+    return _markdown_cache
+
+def drop_position(offsets, y):
+    """
+    Posição de inserção de uma nota solta na altura `y`, por busca binária em
+    `offsets` = (centros, posições) de ColumnWidget.note_offsets: logo depois
+    da última nota cujo centro fica acima de `y`.
+    """
+    centers, positions = offsets
+    index = bisect.bisect_right(centers, y)
+    return positions[index - 1] + 1 if index else 0
 
 
 class NoteWidget(QWidget):
-    def __init__(self, title="", content=""):
+    # Nota sendo arrastada (não pode ser destruída durante o arraste)
+    active_drag = None
+
+    def __init__(self, note):
         super().__init__()
+        self.note = note
+        title = note.get('title', '')
+
         self.setAcceptDrops(True)
         self.layout = QVBoxLayout(self)
 
         self.setAttribute(Qt.WA_StyledBackground, True)
-        self.setStyleSheet(CONFIG["note_style"]["frame"])
+        self.setObjectName(NOTE_NAME)
+        self.matched = False
+        self.selected = False
 
         
         self.title_edit = QLineEdit(title)
         self.title_edit.setCursorPosition(0)
         self.title_edit.setToolTip(title)
-        self.title_edit.returnPressed.connect(self.on_title_enter)
+        self.title_edit.editingFinished.connect(self.on_title_enter)
+        self.title_edit.installEventFilter(self)  # Ctrl/Shift+clique seleciona
         
+        # O texto só é posto no editor ao expandir a nota; conteúdos grandes
+        # ficam num arquivo separado até lá
         self.content_edit = QTextEdit()
-        self.content_edit.setPlainText(content)
+        self.content_loaded = False
+        self.blob_text = None
         self.content_edit.setVisible(False)
+        self.content_edit.textChanged.connect(self.on_content_changed)
+        self.content_edit.installEventFilter(self)
+        self.commit_timer = None
+
+        # Conteúdo renderizado (Markdown), criado ao expandir a nota
+        self.content_view = None
 
         self.toggle_btn = QPushButton()
-        self.toggle_btn.setIcon(QIcon.fromTheme("insert-text"))
+        self.toggle_btn.setIcon(theme_icon("insert-text"))
         self.toggle_btn.setToolTip(CONFIG["note_expand_compress"])
         self.toggle_btn.clicked.connect(self.toggle_content)
 
         self.remove_btn = QPushButton()
-        self.remove_btn.setIcon(QIcon.fromTheme("edit-delete"))
+        self.remove_btn.setIcon(theme_icon("edit-delete"))
         self.remove_btn.setToolTip(CONFIG["note_remove"])
         self.remove_btn.clicked.connect(self.delete_self)
 
+        self.archive_btn = QPushButton()
+        self.archive_btn.setIcon(theme_icon("archive-insert", "folder"))
+        self.archive_btn.setToolTip(CONFIG["note_archive"])
+        self.archive_btn.clicked.connect(self.archive_self)
+
+        # Vencimento (lembrado pelo processo da bandeja: simple-kanban-manager --reminders)
+        self.due_btn = QPushButton()
+        self.due_btn.setObjectName(NOTE_DUE_NAME)
+        self.due_btn.setIcon(theme_icon("appointment-new", "x-office-calendar"))
+        self.due_btn.clicked.connect(self.choose_due)
+        self.update_due()
+
         btn_layout = QHBoxLayout()
         btn_layout.addWidget(self.toggle_btn)
         btn_layout.addWidget(self.remove_btn)
+        btn_layout.addWidget(self.archive_btn)
+        btn_layout.addWidget(self.due_btn)
         btn_layout.addStretch()
 
         self.layout.addWidget(self.title_edit)
@@ -109,217 +346,1880 @@ class NoteWidget(QWidget):
 
         self.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Fixed)
 
+        self.drag_start_pos = None
+        self.dropped_in_process = False
+        self.discarded = False  # tirada do quadro durante o próprio arraste
+
+    def edit(self, **fields):
+        column = self.parentWidget()
+        if isinstance(column, ColumnWidget):
+            column.document.edit_note(column.column, self.note, **fields)
+        else:
+            self.note.update(fields)
+
     def on_title_enter(self):
         new_title = self.title_edit.text()
         self.title_edit.setToolTip(new_title)
         self.title_edit.setCursorPosition(0)
+        if new_title != self.note.get('title'):
+            self.edit(title=new_title)
+
+    def on_content_changed(self):
+        # As teclas são agrupadas antes de atualizar o modelo
+        if self.commit_timer is None:
+            self.commit_timer = QTimer(self)
+            self.commit_timer.setSingleShot(True)
+            self.commit_timer.setInterval(500)
+            self.commit_timer.timeout.connect(self.commit_content)
+        self.commit_timer.start()
+
+    def commit_content(self):
+        if self.commit_timer is not None:
+            self.commit_timer.stop()
+        if not self.content_loaded:
+            return
+        content = self.content_edit.toPlainText()
+        if content != self.note_content():
+            self.blob_text = None
+            self.edit(content=content)
+
+    def board_path(self):
+        column = self.parentWidget()
+        if isinstance(column, ColumnWidget):
+            return column.board_view().top_input.text()
+        return ""
+
+    def note_content(self):
+        """
+        Conteúdo da nota; o de um arquivo separado é lido uma vez, no primeiro uso.
+        """
+        if not is_stub(self.note):
+            return self.note.get('content', '')
+        if self.blob_text is None:
+            try:
+                self.blob_text = read_blob(self.board_path(), self.note[BLOB_KEY])
+            except OSError as e:
+                print(f"Note content not found: {e}")
+                return ""
+        return self.blob_text
+
+    def load_content(self):
+        if not self.content_loaded:
+            self.content_edit.blockSignals(True)
+            self.content_edit.setPlainText(self.note_content())
+            self.content_edit.blockSignals(False)
+            self.content_loaded = True
 
     def toggle_content(self):
-        self.content_edit.setVisible(not self.content_edit.isVisible())
+        # note_markdown pode mudar com a nota aberta (configuração recarregada):
+        # a vista renderizada pode não existir ou estar visível no modo texto
+        rendered = self.content_view is not None and self.content_view.isVisible()
+        if not CONFIG["note_markdown"]:
+            self.load_content()
+            self.content_edit.setVisible(not (self.content_edit.isVisible() or rendered))
+            if rendered:
+                self.content_view.setVisible(False)
+        elif self.content_edit.isVisible() or rendered:
+            self.commit_content()
+            self.content_edit.setVisible(False)
+            if self.content_view is not None:
+                self.content_view.setVisible(False)
+        else:
+            self.show_rendered()
+
+    def show_rendered(self):
+        self.commit_content()
+        if self.content_view is None:
+            self.content_view = MarkdownView()
+            self.content_view.edit_requested.connect(self.start_editing)
+            self.content_view.link_activated.connect(self.follow_link)
+            self.layout.insertWidget(self.layout.indexOf(self.content_edit) + 1, self.content_view)
+        markdown_cache().request(linkify(self.note_content()), self.content_view)
+        self.content_edit.setVisible(False)
+        self.content_view.setVisible(True)
+
+    def follow_link(self, file, note_id):
+        column = self.parentWidget()
+        if isinstance(column, ColumnWidget):
+            column.board_view().follow_link(file, note_id)
+
+    def start_editing(self):
+        # O editor cru só aparece quando o usuário começa a editar
+        self.load_content()
+        self.content_view.setVisible(False)
+        self.content_edit.setVisible(True)
+        self.content_edit.setFocus()
+
+    def eventFilter(self, obj, event):
+        if obj is self.title_edit and event.type() == QEvent.MouseButtonPress and self.select_click(event):
+            return True
+        if (obj is self.content_edit and event.type() == QEvent.FocusOut
+                and event.reason() not in (Qt.PopupFocusReason, Qt.ActiveWindowFocusReason)
+                and CONFIG["note_markdown"] and self.content_view is not None
+                and self.content_edit.isVisible()):
+            self.show_rendered()
+        return super().eventFilter(obj, event)
 
     def delete_self(self):
+        column = self.parentWidget()
+        if isinstance(column, ColumnWidget):
+            column.document.remove_note(column.column, self.note)
         self.setParent(None)
         self.deleteLater()
 
-    def get_data(self):
-        return {
-            'title': self.title_edit.text(),
-            'content': self.content_edit.toPlainText()
-        }
+    def choose_due(self):
+        labels = {"title": CONFIG["note_due"], "label": CONFIG["note_due_label"], "clear": CONFIG["note_due_clear"]}
+        from simple_kanban_gui.modules.wdue import DueDialog
+        dialog = DueDialog(self.note.get("due"), labels, self)
+        if dialog.exec_() == DueDialog.Accepted and dialog.due() != self.note.get("due"):
+            self.edit(due=dialog.due())
+            self.update_due()
+
+    def update_due(self):
+        due = self.note.get("due")
+        if not due:
+            self.due_btn.setText("")
+            self.due_btn.setToolTip(CONFIG["note_due"])
+            self.set_due_state("")
+            return
+        self.due_btn.setText(time.strftime("%m-%d %H:%M", time.localtime(due)))
+        self.due_btn.setToolTip(f"{CONFIG['note_due']}: {time.strftime('%Y-%m-%d %H:%M', time.localtime(due))}")
+        self.set_due_state("overdue" if due <= time.time() else "pending")
+
+    def set_due_state(self, state):
+        if (self.due_btn.property(DUE_PROPERTY) or "") != state:
+            self.due_btn.setProperty(DUE_PROPERTY, state)
+            repolish(self.due_btn)
 
-    def set_data(self, data):
-        self.title_edit.setText(data.get('title', ''))
+    def archive_self(self):
+        column = self.parentWidget()
+        if isinstance(column, ColumnWidget):
+            self.commit_content()
+            column.board_view().archive_notes(column, [self.note])
+
+    def get_data(self):
+        """
+        Cópia da nota com o conteúdo completo (para outro quadro ou processo).
+        """
+        self.commit_content()
+        note = dict(self.note)
+        if is_stub(note):
+            note["content"] = self.note_content()
+        note.pop(BLOB_KEY, None)
+        note.pop(SIZE_KEY, None)
+        return note
+
+    def set_data(self, note):
+        self.note = note
+        self.blob_text = None
+        self.title_edit.setText(note.get('title', ''))
+        self.title_edit.setToolTip(note.get('title', ''))
         self.title_edit.setCursorPosition(0)
-        self.content_edit.setPlainText(data.get('content', ''))
+        if self.content_edit.isVisible():
+            self.content_loaded = False
+            self.load_content()
+        else:
+            self.content_loaded = False
+            self.content_edit.blockSignals(True)
+            self.content_edit.clear()
+            self.content_edit.blockSignals(False)
+        self.update_due()
+        if self.content_view is not None and self.content_view.isVisible():
+            markdown_cache().request(linkify(self.note_content()), self.content_view)
+
+    def set_conflict(self, conflict):
+        if bool(self.property(CONFLICT_PROPERTY)) != conflict:
+            self.setProperty(CONFLICT_PROPERTY, conflict)
+            repolish(self)
+        self.setToolTip(CONFIG["note_conflict"] if conflict else "")
+
+    def set_filter(self, ids):
+        """
+        Mostra a nota só se estiver em `ids` (None: sem filtro) e destaca as
+        que coincidem; o texto dos widgets não é consultado.
+        """
+        matched = ids is not None and self.note.get('id') in ids
+        self.setVisible(ids is None or matched)
+        if matched != self.matched:
+            self.matched = matched
+            self.update()
+
+    def set_selected(self, selected):
+        if selected != self.selected:
+            self.selected = selected
+            self.update()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        # O destaque é desenhado por cima; trocar o estilo da nota custaria
+        # um novo polimento de todos os widgets filhos
+        if self.matched or self.selected:
+            painter = QtGui.QPainter(self)
+            if self.selected:
+                painter.setPen(QtGui.QPen(QtGui.QColor(CONFIG["note_selected_color"]), 3))
+                painter.drawRect(self.rect().adjusted(1, 1, -2, -2))
+            if self.matched:
+                painter.fillRect(0, 0, self.width(), 4, QtGui.QColor(CONFIG["note_match_color"]))
+
+    def select_click(self, event):
+        """
+        Ctrl+clique alterna a seleção da nota; Shift+clique seleciona o intervalo.
+        """
+        if event.button() != Qt.LeftButton or not event.modifiers() & (Qt.ControlModifier | Qt.ShiftModifier):
+            return False
+        column = self.parentWidget()
+        if not isinstance(column, ColumnWidget):
+            return False
+        column.board_view().select_note(column, self.note, event.modifiers())
+        return True
 
     def mousePressEvent(self, event):
-        if event.button() == Qt.LeftButton:
-            # Salva a referência ao widget arrastado na aplicação
-            QApplication.instance().dragged_note = self
+        if self.select_click(event):
+            self.drag_start_pos = None
+        elif event.button() == Qt.LeftButton:
+            self.drag_start_pos = event.pos()
+
+    def mouseReleaseEvent(self, event):
+        # Um clique simples (sem arraste) desfaz a seleção
+        if self.drag_start_pos is not None:
+            column = self.parentWidget()
+            if isinstance(column, ColumnWidget):
+                column.board_view().clear_selection()
+        self.drag_start_pos = None
+        super().mouseReleaseEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if not (event.buttons() & Qt.LeftButton) or self.drag_start_pos is None:
+            return
+        if (event.pos() - self.drag_start_pos).manhattanLength() < QApplication.startDragDistance():
+            return
+        self.drag_start_pos = None
+
+        # Dentro do processo a própria nota é movida; o JSON só é gerado
+        # se um outro processo pedir os dados
+        self.dropped_in_process = False
+        view = self.parentWidget().board_view()
+        # Arrastar uma nota selecionada leva toda a seleção
+        multiple = self.selected and len(view.selected_ids) > 1
+        drag = QtGui.QDrag(self)
+        drag.setMimeData(NoteMimeData(self, [note for _, note in view.selected_items()] if multiple else None))
+        drag.setPixmap(self.grab())
+        drag.setHotSpot(event.pos())
+        NoteWidget.active_drag = self
+        result = drag.exec_(Qt.MoveAction)
+        NoteWidget.active_drag = None
+        window = self.window()
+        if self.discarded:
+            # A seleção foi levada para outra aba; só agora a nota pode ser destruída
+            self.deleteLater()
+        elif result == Qt.MoveAction and not self.dropped_in_process:
+            if multiple:
+                view.delete_selected()
+            else:
+                self.delete_self()
+        if isinstance(window, KanbanWindow):
+            # A aba de origem pode ter ficado inativa durante o arraste
+            window.suspend_inactive()
 
-            mime = QMimeData()
-            data = QByteArray()
-            stream = QDataStream(data, QIODevice.WriteOnly)
-            stream.writeQString(json.dumps(self.get_data()))
-            mime.setData("application/x-kanban-note", data)
 
-            drag = QtGui.QDrag(self)
-            drag.setMimeData(mime)
-            drag.exec_(Qt.MoveAction)
-            QApplication.instance().dragged_note = None
+class NoteMimeData(QMimeData):
+    """
+    Dados de arraste de uma nota (ou da seleção), serializados apenas sob demanda.
+    """
+    def __init__(self, note, notes=None):
+        super().__init__()
+        self.note = note
+        self.notes = notes
+
+    def formats(self):
+        return [NOTE_MIME_TYPE]
+
+    def hasFormat(self, mime_type):
+        return mime_type == NOTE_MIME_TYPE
+
+    def retrieveData(self, mime_type, preferred_type):
+        if mime_type != NOTE_MIME_TYPE:
+            return None
+        data = QByteArray()
+        stream = QDataStream(data, QIODevice.WriteOnly)
+        if self.notes is not None:
+            self.note.commit_content()
+            path = self.note.board_path()
+            stream.writeQString(codec.dumps([inline_note(dict(note), path) for note in self.notes]))
+        else:
+            stream.writeQString(codec.dumps(self.note.get_data()))
+        return data
 
 
 class ColumnWidget(QFrame):
-    def __init__(self, title=CONFIG["board_title"], style=CONFIG["board_style"]):
+    def __init__(self, document, column):
         super().__init__()
+        self.document = document
+        self.column = column
+        title = column.get('title', '')
+        self.applied_style = document.column_style(column)
+
         self.setAcceptDrops(True)
         self.setFrameShape(QFrame.StyledPanel)
-        self.setStyleSheet(style["frame"])
+        self.setObjectName(COLUMN_NAME)
+        self.setProperty(STYLE_PROPERTY, board_style().style_name(self.applied_style))
         
         self.setFixedWidth(CONFIG["board_width"])
-        
-        self.style=style
+
+        # Colunas fora da área visível não têm widgets de notas, mas mantêm
+        # a largura mesmo escondidas durante a construção
+        self.materialized = False
+        self.materializing = False
+        size_policy = self.sizePolicy()
+        size_policy.setRetainSizeWhenHidden(True)
+        self.setSizePolicy(size_policy)
 
         self.layout = QVBoxLayout(self)
 
         self.title_edit = QLineEdit(title)
         self.title_edit.setCursorPosition(0)
         self.title_edit.setToolTip(title)
-        self.title_edit.setStyleSheet(style["title"])
-        self.title_edit.returnPressed.connect(self.on_title_enter)
+        self.title_edit.setObjectName(COLUMN_TITLE_NAME)
+        self.title_edit.editingFinished.connect(self.on_title_enter)
 
         self.add_btn = QPushButton()
-        self.add_btn.setIcon(QIcon.fromTheme("list-add"))
+        self.add_btn.setIcon(theme_icon("list-add"))
         self.add_btn.setToolTip(CONFIG["board_new_note"])
         self.add_btn.clicked.connect(lambda: self.add_note())
 
         self.remove_btn = QPushButton()
-        self.remove_btn.setIcon(QIcon.fromTheme("edit-delete"))
+        self.remove_btn.setIcon(theme_icon("edit-delete"))
         self.remove_btn.setToolTip(CONFIG["board_delete"])
         self.remove_btn.clicked.connect(self.remove_self)
         
-        self.interchange_right_btn = QPushButton()
-        self.interchange_right_btn.setIcon(QIcon.fromTheme("go-next"))
-        self.interchange_right_btn.setToolTip(CONFIG["board_interchange_right"])
-        self.interchange_right_btn.clicked.connect(self.interchange_right)
+        self.move_left_btn = QPushButton()
+        self.move_left_btn.setIcon(theme_icon("go-previous"))
+        self.move_left_btn.setToolTip(CONFIG["board_move_left"])
+        self.move_left_btn.clicked.connect(self.move_left)
+
+        self.move_right_btn = QPushButton()
+        self.move_right_btn.setIcon(theme_icon("go-next"))
+        self.move_right_btn.setToolTip(CONFIG["board_move_right"])
+        self.move_right_btn.clicked.connect(self.move_right)
+
+        self.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.customContextMenuRequested.connect(self.show_context_menu)
 
         top_layout = QHBoxLayout()
         top_layout.addWidget(self.title_edit)
         top_layout.addWidget(self.add_btn)
         top_layout.addWidget(self.remove_btn)
-        top_layout.addWidget(self.interchange_right_btn)
+        top_layout.addWidget(self.move_left_btn)
+        top_layout.addWidget(self.move_right_btn)
 
         self.notes_layout = QVBoxLayout()
         self.notes_layout.setSpacing(10)
         self.notes_layout.addStretch()
 
+        self.drop_offsets = None
+        self.drag_start_pos = None
+
         self.layout.addLayout(top_layout)
         self.layout.addLayout(self.notes_layout)
 
-    def interchange_right(self):
-        # Encontrar o layout pai (KanbanWindow.columns_layout)
-        parent_layout = self.parentWidget().layout()
-        
-        # Obter a lista de widgets = []
-        widgets = []
-        for i in range(parent_layout.count()):
-            item = parent_layout.itemAt(i)
-            widget = item.widget()
-            if isinstance(widget, ColumnWidget):
-                widgets.append(widget)
+    def column_index(self):
+        return self.parentWidget().layout().indexOf(self)
 
-        if len(widgets) <= 1:
-            return
-
-        # Encontrar índice da coluna atual
-        try:
-            idx = widgets.index(self)
-        except ValueError:
+    def move_to(self, index):
+        """
+        Move a coluna para a posição `index`, sem tocar nas outras colunas do layout.
+        """
+        parent_layout = self.parentWidget().layout()
+        index = max(0, min(index, parent_layout.count() - 2))  # -2: stretch e a própria coluna
+        if index == parent_layout.indexOf(self):
             return
+        parent_layout.removeWidget(self)
+        parent_layout.insertWidget(index, self)
+        self.document.move_column(self.column, index)
+        self.board_view().schedule_virtual()
 
-        # Cálculo cíclico do índice seguinte
-        next_idx = (idx + 1) % len(widgets)
+    def move_left(self):
+        self.move_to(self.column_index() - 1)
 
-        # Trocar posições no layout
-        # Remover todos os widgets e itens, inclusive stretch
-        for i in reversed(range(parent_layout.count())):
-            item = parent_layout.itemAt(i)
-            widget = item.widget()
-            if widget:
-                parent_layout.removeWidget(widget)
-            else:
-                parent_layout.removeItem(item)  # remove o stretch
+    def move_right(self):
+        self.move_to(self.column_index() + 1)
 
-        # Reordenar
-        widgets[idx], widgets[next_idx] = widgets[next_idx], widgets[idx]
-
-        # Re-inserir os widgets na nova ordem
-        for i, w in enumerate(widgets):
-            parent_layout.insertWidget(i, w)
-
-        # Certifique-se de manter o stretch sempre no fim
-        parent_layout.addStretch()
-        
     def on_title_enter(self):
         new_title = self.title_edit.text()
         self.title_edit.setCursorPosition(0)
         self.title_edit.setToolTip(new_title)
+        if new_title != self.column.get('title'):
+            self.document.rename_column(self.column, new_title)
+
+    def add_note(self, note_title=None, note_content=None):
+        if note_title is None:
+            note_title = CONFIG["note_title"]
+        if note_content is None:
+            note_content = CONFIG["note_content"]
+        note = {'title': note_title, 'content': note_content}
+        view = self.board_view()
+        view.ensure_loaded(self.column)
+        self.document.add_note(self.column, note)
+        if self.materialized:
+            widget = self.add_note_widget(note)
+            view.filter_new_notes([widget])
+            return widget
+        return None
+
+    def add_notes(self, notes, index=None):
+        """
+        Acrescenta várias notas (dicionários com title/content) numa única
+        operação do modelo. Lotes grandes não criam widgets aqui: a coluna é
+        refeita em fatias pela virtualização do quadro.
+        """
+        if not notes:
+            return
+        view = self.board_view()
+        view.ensure_loaded(self.column)
+        if index is None:
+            index = len(self.column['notes'])
+        self.document.add_notes(self.column, notes, index)
+        if not self.materialized:
+            return
+        if self.materializing or len(notes) > CONFIG["board_bulk_rebuild"]:
+            view.rebuild_column(self)
+            return
+        self.setUpdatesEnabled(False)
+        try:
+            view.filter_new_notes([self.add_note_widget(note, index + offset)
+                                   for offset, note in enumerate(notes)])
+        finally:
+            self.setUpdatesEnabled(True)
+
+    def paste_notes(self):
+        from simple_kanban_gui.modules.importer import notes_from_lines
+        self.add_notes(notes_from_lines(QApplication.clipboard().text()))
+
+    def import_notes(self):
+        path, _ = QFileDialog.getOpenFileName(self, CONFIG["board_import_notes"], "", CONFIG["board_import_filter"])
+        if not path:
+            return
+        try:
+            from simple_kanban_gui.modules.importer import read_table
+            notes = read_table(path)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"{CONFIG['window_error_import']}\n{path}\n{e}")
+            return
+        self.add_notes(notes)
+
+    def materialize(self):
+        """
+        Gerador que cria os widgets das notas, um por passo. Se for
+        interrompido, a coluna volta a ficar só com o cabeçalho.
+        """
+        self.board_view().ensure_loaded(self.column)
+        self.materialized = True
+        self.materializing = True
+        self.setVisible(False)
+        self.setUpdatesEnabled(False)
+        complete = False
+        try:
+            filter_ids = self.board_view().filter_ids
+            selected_ids = self.board_view().selected_ids
+            for note in self.column['notes']:
+                widget = self.add_note_widget(note)
+                widget.set_filter(filter_ids)
+                widget.set_selected(note['id'] in selected_ids)
+                yield
+            complete = True
+        finally:
+            self.materializing = False
+            if not complete:
+                self.release()
+            self.setUpdatesEnabled(True)
+            self.setVisible(True)
+
+    def release(self):
+        """
+        Destrói os widgets das notas; o modelo não é alterado.
+        """
+        if self.materializing:
+            return
+        widgets = self.take_note_widgets()
+        if NoteWidget.active_drag in widgets:
+            for widget in widgets:
+                self.notes_layout.insertWidget(self.notes_layout.count() - 1, widget)
+            return
+        for widget in widgets:
+            widget.commit_content()
+        self.drop_note_widgets(widgets)
+        self.materialized = False
+
+    def drop_note_widgets(self, widgets):
+        """
+        Tira os widgets do layout e os destrói. Esconder em vez de chamar
+        setParent(None) evita que cada um vire uma janela de topo antes de ser
+        apagado, o que custava cerca de 1 ms por nota. A nota que está sendo
+        arrastada só é destruída quando o arraste termina (mouseMoveEvent).
+        """
+        for widget in widgets:
+            self.notes_layout.removeWidget(widget)
+            widget.hide()
+            if widget is NoteWidget.active_drag:
+                widget.discarded = True
+            else:
+                widget.deleteLater()
+
+    def add_note_widget(self, note, index=None):
+        """
+        Cria o widget de uma nota que já está no modelo.
+        """
+        if index is None:
+            index = self.notes_layout.count() - 1  # antes do stretch
+        widget = NoteWidget(note)
+        if note.get('id') in self.document.conflicts:
+            widget.set_conflict(True)
+        self.notes_layout.insertWidget(index, widget)
+        return widget
+
+    def apply_config(self):
+        self.setFixedWidth(CONFIG["board_width"])
+        self.refresh_header()
+
+    def refresh_header(self):
+        # Só recalcula o estilo dos widgets se o estilo da coluna mudou
+        style = self.document.column_style(self.column)
+        if style is not self.applied_style:
+            self.applied_style = style
+            self.setProperty(STYLE_PROPERTY, board_style().style_name(style))
+            repolish(self)
+        self.title_edit.setText(self.column.get('title', ''))
+        self.title_edit.setToolTip(self.column.get('title', ''))
+        self.title_edit.setCursorPosition(0)
 
-    def add_note(self, note_title=CONFIG["note_title"], note_content=CONFIG["note_content"]):
-        note = NoteWidget(note_title, note_content)
-        self.notes_layout.insertWidget(self.notes_layout.count() - 1, note)
+    def note_widgets(self):
+        return [self.notes_layout.itemAt(i).widget() for i in range(self.notes_layout.count() - 1)]
+
+    def take_note_widgets(self):
+        """
+        Retira do layout (sem destruir) os widgets de notas da coluna.
+        """
+        widgets = []
+        while self.notes_layout.count() > 1:  # mantém o stretch
+            widgets.append(self.notes_layout.takeAt(0).widget())
+        return widgets
+
+    def fill_notes(self, pool, updated=(), conflicts=()):
+        """
+        Recoloca as notas na ordem do modelo, reaproveitando os widgets de
+        `pool` (por id de nota) e criando apenas os que faltam.
+        """
+        self.setVisible(False)
+        for note in self.column['notes']:
+            widget = pool.pop(note['id'], None)
+            if widget is None:
+                widget = self.add_note_widget(note)
+            else:
+                if note['id'] in updated or widget.note is not note:
+                    widget.set_data(note)
+                self.notes_layout.insertWidget(self.notes_layout.count() - 1, widget)
+            widget.set_conflict(note['id'] in conflicts)
+        self.setVisible(True)
 
     def remove_self(self):
+        view = self.board_view()
+        self.document.remove_column(self.column)
         self.setParent(None)
         self.deleteLater()
+        view.schedule_virtual()
+
+    def show_context_menu(self, pos):
+        view = self.board_view()
+        menu = QMenu(self)
+        menu.addAction(CONFIG["board_archive_all"], lambda: view.ensure_loaded(self.column) or view.archive_notes(self, list(self.column['notes'])))
+        menu.addAction(CONFIG["board_archive_older"], lambda: view.archive_older(self))
+        if view.selected_ids:
+            menu.addSeparator()
+            menu.addAction(f"{CONFIG['board_move_selected']} ({len(view.selected_ids)})", lambda: view.move_selected(self))
+            menu.addAction(CONFIG["board_delete_selected"], view.delete_selected)
+            menu.addAction(CONFIG["board_archive_selected"], view.archive_selected)
+            menu.addAction(CONFIG["board_clear_selection"], view.clear_selection)
+        menu.addSeparator()
+        paste = menu.addAction(CONFIG["board_paste_notes"], self.paste_notes)
+        paste.setEnabled(bool(QApplication.clipboard().text().strip()))
+        menu.addAction(CONFIG["board_import_notes"], self.import_notes)
+        menu.exec_(self.mapToGlobal(pos))
+
+    def board_view(self):
+        widget = self.parentWidget()
+        while widget is not None and not isinstance(widget, BoardView):
+            widget = widget.parentWidget()
+        return widget
 
     def get_data(self):
-        notes = []
-        for i in range(self.notes_layout.count() - 1):  # -1 to skip stretch
-            item = self.notes_layout.itemAt(i).widget()
-            if isinstance(item, NoteWidget):
-                notes.append(item.get_data())
-        return {
-            'title': self.title_edit.text(),
-            'notes': notes,
-            'style': self.style
-        }
+        return self.column
 
-    def set_data(self, data):
-        self.style=data.get('style', CONFIG["board_style"])
-        self.setStyleSheet(self.style["frame"])
-        
-        self.title_edit.setStyleSheet(self.style["title"])
-        self.title_edit.setText(data.get('title', ''))
-        self.title_edit.setToolTip(data.get('title', ''))
+    def drop_column(self, column, x):
+        """
+        Coloca `column` antes ou depois desta coluna, conforme o lado em que foi solta.
+        """
+        if column is self:
+            return
+        index = self.column_index()
+        if x > self.width() // 2:
+            index += 1
+        if column.column_index() < index:
+            index -= 1
+        column.move_to(index)
+
+    def move_note_here(self, note, index):
+        old_column = note.parentWidget()
+        old_column.notes_layout.removeWidget(note)
+        self.notes_layout.insertWidget(index, note)
+        if old_column.document is self.document:
+            self.document.move_note(old_column.column, note.note, self.column, index)
+        else:
+            # Nota vinda do quadro de outra aba
+            note.commit_content()
+            inline_note(note.note, old_column.board_view().top_input.text())
+            old_column.document.remove_note(old_column.column, note.note)
+            self.document.add_note(self.column, note.note, index)
+            self.board_view().filter_new_notes([note])
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self.drag_start_pos = event.pos()
 
-        for note in data.get('notes', []):
-            self.add_note(note['title'], note['content'])
+    def mouseMoveEvent(self, event):
+        if not (event.buttons() & Qt.LeftButton) or self.drag_start_pos is None:
+            return
+        if (event.pos() - self.drag_start_pos).manhattanLength() < QApplication.startDragDistance():
+            return
+        self.drag_start_pos = None
+
+        mime = QMimeData()
+        mime.setData(COLUMN_MIME_TYPE, QByteArray())
+        drag = QtGui.QDrag(self)
+        drag.setMimeData(mime)
+        drag.setPixmap(self.title_edit.grab())
+        drag.exec_(Qt.MoveAction)
+
+    def mouseReleaseEvent(self, event):
+        self.drag_start_pos = None
+        super().mouseReleaseEvent(event)
+
+    def note_offsets(self, exclude=()):
+        """
+        Centros verticais das notas visíveis da coluna (em ordem), ignorando as
+        de `exclude`, e a posição de cada uma entre as notas que ficam na
+        coluna. As notas escondidas pelo filtro não têm posição na tela, mas
+        contam nas posições.
+        """
+        centers, positions = [], []
+        position = 0
+        for i in range(self.notes_layout.count() - 1):  # -1 ignora o stretch
+            widget = self.notes_layout.itemAt(i).widget()
+            if not isinstance(widget, NoteWidget) or widget in exclude:
+                continue
+            if not widget.isHidden():
+                centers.append(widget.y() + widget.height() // 2)
+                positions.append(position)
+            position += 1
+        return centers, positions
+
+    def dragged_notes(self, source):
+        """
+        Widgets desta coluna que saem dela com o arraste de `source`.
+        """
+        if not isinstance(source, NoteWidget):
+            return set()
+        if source.selected:
+            ids = source.parentWidget().board_view().selected_ids
+            return set(widget for widget in self.note_widgets() if widget.note.get('id') in ids) | {source}
+        return {source}
 
     def dragEnterEvent(self, event):
-        if event.mimeData().hasFormat("application/x-kanban-note"):
+        if event.mimeData().hasFormat(NOTE_MIME_TYPE):
+            if not self.materialized or self.materializing:
+                return
+            # As posições são calculadas uma vez por arraste
+            self.drop_offsets = self.note_offsets(exclude=self.dragged_notes(event.source()))
             event.acceptProposedAction()
+        elif event.mimeData().hasFormat(COLUMN_MIME_TYPE):
+            source = event.source()
+            if isinstance(source, ColumnWidget) and source.parentWidget() is self.parentWidget():
+                event.acceptProposedAction()
+
+    def dragLeaveEvent(self, event):
+        self.drop_offsets = None
 
     def dropEvent(self, event):
-        data = event.mimeData().data("application/x-kanban-note")
-        stream = QDataStream(data, QIODevice.ReadOnly)
-        note_json = stream.readQString()
-        note_data = json.loads(note_json)
+        if event.mimeData().hasFormat(COLUMN_MIME_TYPE):
+            self.drop_column(event.source(), event.pos().x())
+            event.setDropAction(Qt.MoveAction)
+            event.accept()
+            return
 
-        dragged_note = QApplication.instance().dragged_note
+        offsets = self.drop_offsets
+        if offsets is None:
+            offsets = self.note_offsets(exclude=self.dragged_notes(event.source()))
+        self.drop_offsets = None
 
-        # Remove a nota original do local de origem
-        if dragged_note:
-            dragged_note.setParent(None)
-            dragged_note.deleteLater()
-            QApplication.instance().dragged_note = None  # Limpa referência
+        # Busca binária da posição de inserção
+        insert_at = drop_position(offsets, event.pos().y())
 
-        # Calcula a posição ideal para inserção
-        pos = event.pos()
-        insert_at = self.notes_layout.count() - 1  # default = before stretch
+        source = event.source()
+        if isinstance(source, NoteWidget) and source.selected and len(source.parentWidget().board_view().selected_ids) > 1:
+            # A seleção inteira é movida de uma vez
+            source_view = source.parentWidget().board_view()
+            if source_view is self.board_view():
+                source_view.move_selected(self, insert_at)
+            else:
+                self.add_notes(source_view.take_selected(), insert_at)
+            source.dropped_in_process = True
+        elif isinstance(source, NoteWidget):
+            # Mesmo processo: a nota existente é movida
+            self.move_note_here(source, insert_at)
+            source.dropped_in_process = True
+        else:
+            data = event.mimeData().data(NOTE_MIME_TYPE)
+            stream = QDataStream(data, QIODevice.ReadOnly)
+            note = codec.loads(stream.readQString())
+            if isinstance(note, list):
+                self.add_notes(note, insert_at)
+            else:
+                self.document.add_note(self.column, note, insert_at)
+                self.board_view().filter_new_notes([self.add_note_widget(note, insert_at)])
 
-        for i in range(self.notes_layout.count() - 1):  # -1 ignora o stretch
-            item = self.notes_layout.itemAt(i)
-            widget = item.widget()
-            if widget and isinstance(widget, NoteWidget):
-                widget_pos = widget.mapTo(self, widget.rect().center())
-                if pos.y() < widget_pos.y():
-                    insert_at = i
-                    break
+        event.setDropAction(Qt.MoveAction)
+        event.accept()
+
+
+
+class BoardView(QWidget):
+    """
+    Um quadro (documento, colunas e gravação) dentro de uma aba da janela.
+    Quando a aba fica inativa os widgets podem ser descartados, ficando só o
+    modelo do documento.
+    """
+    loading_changed = pyqtSignal(bool)
+    title_changed = pyqtSignal(str)
+    link_activated = pyqtSignal(str, str)  # caminho do quadro, id da nota
+    note_edited = pyqtSignal(str, object)  # caminho do quadro, nota
+
+    def __init__(self, filepath, parent=None):
+        super().__init__(parent)
+
+        self.scroll_area = QScrollArea()
+        self.scroll_area.setWidgetResizable(True)
+        board_style().attach(self.scroll_area)
+        self.scroll_area.horizontalScrollBar().valueChanged.connect(lambda _: self.schedule_virtual())
+        self.scroll_area.horizontalScrollBar().rangeChanged.connect(lambda *_: self.schedule_virtual())
+
+        # Materialização das colunas visíveis
+        self.virtual_timer = QTimer(self)
+        self.virtual_timer.setSingleShot(True)
+        self.virtual_timer.setInterval(0)
+        self.virtual_timer.timeout.connect(self.update_virtual)
+        self.materialize_queue = []
+        self.materializer = None
+
+        self.columns_widget, self.columns_layout = self.new_columns_widget()
+        self.scroll_area.setWidget(self.columns_widget)
+
+        main_layout = QVBoxLayout(self)
+        
+        # Cria o widget de topo e seu layout
+        self.top_line_widget = QWidget()
+        self.top_line_layout = QHBoxLayout(self.top_line_widget)
+        self.top_label = QLabel(CONFIG["window_filename"])
+        self.top_input = QLineEdit("")
+        self.top_input.setReadOnly(True)
+        self.top_line_layout.addWidget(self.top_label)
+        self.top_line_layout.addWidget(self.top_input)
 
-        new_note = NoteWidget(note_data['title'], note_data['content'])
-        self.notes_layout.insertWidget(insert_at, new_note)
+        # Title layout
+        self.top_title_line_widget = QWidget()
+        #self.top_title_line_widget.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Preferred)
+        self.top_title_layout = QHBoxLayout(self.top_title_line_widget)
+        self.top_title_label = QLabel(CONFIG["kanban_title_label"])
+        self.top_title_input = QLineEdit(CONFIG["kanban_title_default"])
+        self.top_title_input.editingFinished.connect(self.on_meta_edited)
+        self.top_description_label = QLabel(CONFIG["kanban_description_label"])
+        self.top_description_input = QLineEdit(CONFIG["kanban_description_default"])
+        self.top_description_input.editingFinished.connect(self.on_meta_edited)
+        self.top_title_layout.addWidget(self.top_title_label)
+        self.top_title_layout.addWidget(self.top_title_input)
+        self.top_title_layout.addWidget(self.top_description_label)
+        self.top_title_layout.addWidget(self.top_description_input)
+
+        # Adiciona ao layout principal
+        main_layout.addWidget(self.top_line_widget)
+        main_layout.addWidget(self.top_title_line_widget)
+        main_layout.addWidget(self.scroll_area)
+
+        # Progresso do carregamento
+        self.loader = None
+        self.builder = None
+        self.loading_backup = None
+        self.loading = False
+
+        self.loading_widget = QWidget()
+        loading_layout = QHBoxLayout(self.loading_widget)
+        loading_layout.setContentsMargins(0, 0, 0, 0)
+        self.load_progress = QProgressBar()
+        self.load_progress.setMaximumWidth(300)
+        self.load_cancel_btn = QToolButton()
+        self.load_cancel_btn.setIcon(theme_icon("process-stop"))
+        self.load_cancel_btn.setToolTip(CONFIG["window_loading_cancel"])
+        self.load_cancel_btn.clicked.connect(self.cancel_loading)
+        loading_layout.addStretch()
+        loading_layout.addWidget(self.load_progress)
+        loading_layout.addWidget(self.load_cancel_btn)
+        main_layout.addWidget(self.loading_widget)
+        self.loading_widget.setVisible(False)
+
+        # Filtro de notas (o texto vem da janela) e descarte dos widgets
+        self.filter_text = ""
+        self.filter_ids = None
+
+        # Notas selecionadas (por id, sobrevivem à virtualização) e a âncora
+        # do Shift+clique
+        self.selected_ids = set()
+        self.selection_anchor = None
+        # Nota a mostrar quando o quadro terminar de carregar (link seguido)
+        self.reveal_id = None
+        self.suspended = False
+
+        # Modelo do quadro e gravação em segundo plano
+        self.document = BoardDocument({ "title": CONFIG["kanban_title_default"],
+                                        "description": CONFIG["kanban_description_default"],
+                                        "boards": []})
+        self.document.changed.connect(self.on_document_changed)
+        self.saver = BoardSaver(self.document, CONFIG["autosave_delay_ms"], self)
+        self.saver.history = history_store()
+        self.saver.blob_threshold = CONFIG["note_blob_chars"]
+        self.saver.inline_styles = CONFIG["board_inline_styles"]
+        self.saver.saved.connect(self.on_saved)
+        self.saver.failed.connect(self.on_save_failed)
+        self.journal = None
+        self.pending_restores = []
+        self.restoring = False  # versão do histórico sendo reconstruída
+
+        # Miniatura do quadro sobre a área de rolagem
+        self.minimap = BoardMinimap(CONFIG["note_style"]["frame"], self.scroll_area)
+        self.minimap.set_document(self.document)
+        self.minimap.jump_requested.connect(self.scroll_to_column)
+        self.minimap.setVisible(CONFIG["minimap"])
+
+        # Recarga quando o arquivo é alterado por outro programa
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(lambda _: self.reload_timer.start())
+        self.watcher.directoryChanged.connect(lambda _: self.reload_timer.start())
+        self.reload_timer = QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.setInterval(300)
+        self.reload_timer.timeout.connect(self.reload_from_disk)
+        self.reloader = None
+
+        # Quadros iniciais
+        for title in CONFIG["board_startup_list"]:
+            self.add_column(title)
+            
+        self.top_line_widget.setVisible(False)
+        
+        if len(filepath)>0:
+            self.load_from_file(filepath)
+
+    def new_columns_widget(self):
+        columns_widget = QWidget()
+        columns_layout = QHBoxLayout(columns_widget)
+        columns_layout.setSpacing(10)
+        columns_layout.addStretch()
+        return columns_widget, columns_layout
+
+    def add_column(self, title=None,style=DEFAULT_STYLE):
+        if title is None:
+            title = CONFIG["board_title"]
+        column = {"title": title, "notes": [], "style": style}
+        self.document.add_column(column)
+        widget = ColumnWidget(self.document, column)
+        self.columns_layout.insertWidget(self.columns_layout.count() - 1, widget)
+        self.schedule_virtual()
+        return widget
+
+    # ------------------------------------------------------ virtualização
+    def schedule_virtual(self):
+        self.virtual_timer.start()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.schedule_virtual()
+
+    def column_step(self):
+        """
+        Posição x da primeira coluna e distância entre colunas (largura fixa).
+        """
+        return self.columns_layout.contentsMargins().left(), CONFIG["board_width"] + self.columns_layout.spacing()
+
+    def visible_range(self):
+        """
+        Índices (primeiro, último) das colunas na área visível, mais a margem.
+        """
+        left, step = self.column_step()
+        x0 = self.scroll_area.horizontalScrollBar().value()
+        x1 = x0 + self.scroll_area.viewport().width()
+        margin = CONFIG["board_virtual_margin"]
+        return max(0, (x0 - left) // step - margin), (x1 - left) // step + margin
+
+    def update_virtual(self):
+        self.update_minimap()
+        first, last = self.visible_range()
+        # A fila é refeita a cada rolagem; colunas que saíram dela não são construídas
+        self.materialize_queue = []
+        for i in range(self.columns_layout.count() - 1):
+            column = self.columns_layout.itemAt(i).widget()
+            if first <= i <= last:
+                if not column.materialized:
+                    self.materialize_queue.append(column)
+            elif column.materialized:
+                column.release()
+        if self.materialize_queue and self.materializer is None:
+            self.materializer = ChunkedBuilder(self.materialize_steps(), 0, parent=self)
+            self.materializer.finished.connect(self.on_materialized)
+            self.materializer.start()
+
+    def materialize_steps(self):
+        while self.materialize_queue:
+            column = self.materialize_queue.pop(0)
+            if column.parentWidget() is self.columns_widget and not column.materialized:
+                yield from column.materialize()
+                # Libera a coluna se a área visível mudou durante a construção
+                self.schedule_virtual()
+
+    def on_materialized(self):
+        self.materializer.deleteLater()
+        self.materializer = None
+        if self.reveal_id is not None:
+            self.ensure_revealed()
+
+    # ------------------------------------------------------------ miniatura
+    def set_minimap_visible(self, visible):
+        self.minimap.setVisible(visible)
+        self.update_minimap()
+
+    def update_minimap(self):
+        if self.minimap.isHidden():
+            return
+        viewport = self.scroll_area.viewport().geometry()
+        width = max(COLUMN_WIDTH, min(len(self.document.columns) * COLUMN_WIDTH, viewport.width() - 40))
+        height = min(CONFIG["minimap_height"], viewport.height() - 20)
+        self.minimap.setGeometry(viewport.right() - width - 12, viewport.bottom() - height - 12, width, height)
+        self.minimap.raise_()
+
+        left, step = self.column_step()
+        x0 = self.scroll_area.horizontalScrollBar().value() - left
+        self.minimap.set_viewport(x0 / step, (x0 + viewport.width()) / step)
+
+    def scroll_to_column(self, position):
+        left, step = self.column_step()
+        x = left + position * step - self.scroll_area.viewport().width() / 2
+        self.scroll_area.horizontalScrollBar().setValue(int(x))
+
+    def rebuild_column(self, column):
+        """
+        Descarta os widgets da coluna; se estiver visível, ela é recriada em
+        fatias.
+        """
+        if column.materializing:
+            self.stop_materializing()
+        column.release()
+        self.schedule_virtual()
+
+    def add_notes(self, notes, column_index=0):
+        """
+        Inserção em lote na coluna `column_index`.
+        """
+        column = self.columns_layout.itemAt(column_index).widget()
+        if isinstance(column, ColumnWidget):
+            column.add_notes(notes)
+
+    def stop_materializing(self):
+        self.materialize_queue = []
+        if self.materializer is not None:
+            self.materializer.cancel()
+            self.on_materialized()
+
+    # ----------------------------------------------------------------- filtro
+    def apply_filter(self, text=None):
+        """
+        Consulta o índice do documento e aplica o resultado às notas das
+        colunas materializadas; as demais o aplicam ao serem criadas.
+        """
+        if text is not None:
+            self.filter_text = text
+        self.filter_ids = self.document.index.search(self.filter_text)
+        for i in range(self.columns_layout.count() - 1):
+            column = self.columns_layout.itemAt(i).widget()
+            if column.materialized:
+                for widget in column.note_widgets():
+                    widget.set_filter(self.filter_ids)
+
+    def filter_new_notes(self, widgets):
+        """
+        Aplica o filtro ativo aos widgets de notas recém-acrescentadas ao
+        documento; a busca é refeita porque o resultado guardado não as tem.
+        """
+        if self.filter_ids is not None:
+            self.filter_ids = self.document.index.search(self.filter_text)
+        for widget in widgets:
+            widget.set_filter(self.filter_ids)
+
+    def on_meta_edited(self):
+        title = self.top_title_input.text()
+        description = self.top_description_input.text()
+        if title != self.document.meta.get("title") or description != self.document.meta.get("description"):
+            self.document.set_meta(title=title, description=description)
+            self.title_changed.emit(self.tab_title())
+
+    def on_document_changed(self, op):
+        if op["op"] == "edit_note" and "content" in op and self.top_input.text():
+            # O índice de referências é atualizado antes da gravação
+            self.note_edited.emit(self.top_input.text(), self.document.columns[op["board"]]["notes"][op["index"]])
+        if self.journal is not None:
+            # A operação vai para o diário; o arquivo base só é reescrito
+            # quando o diário passa do limite
+            self.document.meta["journal_seq"] = self.journal.append(op)
+            self.document.mark_dirty()
+            if self.journal.size() > CONFIG["journal_compact_bytes"]:
+                self.saver.save()
+        elif CONFIG["autosave"]:
+            self.saver.schedule()
+
+    def open_journal(self, path, reset=False):
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+        if not CONFIG["journal"]:
+            return
+        seq = self.document.meta.get("journal_seq", 0)
+        self.journal = BoardJournal(journal_path(path), seq)
+        if reset:
+            self.journal.truncate_through(float("inf"))
+        self.document.meta["journal_seq"] = seq
+
+    def commit_focused_note(self):
+        """
+        Envia ao modelo o texto ainda não registrado da nota em edição.
+        """
+        widget = QApplication.focusWidget()
+        while widget is not None and not isinstance(widget, NoteWidget):
+            widget = widget.parentWidget()
+        if widget is not None:
+            widget.commit_content()
+
+    def watch_file(self, path):
+        watched = self.watcher.files() + self.watcher.directories()
+        if watched:
+            self.watcher.removePaths(watched)
+        if os.path.exists(path):
+            self.watcher.addPath(path)
+        # Quadro dividido: colunas gravadas por outro programa
+        if os.path.isdir(shard_dir(path)):
+            self.watcher.addPath(shard_dir(path))
+
+    def reload_from_disk(self):
+        path = self.top_input.text()
+        if not path or not os.path.exists(path):
+            return
+        # Gravações atômicas substituem o arquivo e o tiram da vigilância
+        if path not in self.watcher.files():
+            self.watcher.addPath(path)
+        if self.loader is not None or self.builder is not None or self.reloader is not None:
+            self.reload_timer.start()
+            return
+        self.reloader = BoardParser(path, self, known_digest=self.saver.last_hash,
+                                    skip_ids=set(self.document.unloaded))
+        self.reloader.parsed.connect(self.on_disk_parsed)
+        self.reloader.failed.connect(self.on_reload_failed)
+        self.reloader.unchanged.connect(self.on_reload_failed)
+        self.reloader.finished.connect(self.reloader.deleteLater)
+        self.reloader.start()
+
+    def on_reload_failed(self, path, message=""):
+        # Gravação desta janela, ou arquivo ainda sendo escrito por outro programa
+        self.reloader = None
+
+    def on_disk_parsed(self, path, data, total):
+        digest = self.sender().digest
+        self.reloader = None
+        if path != self.top_input.text() or digest == self.saver.last_hash:
+            return  # gravação feita por esta janela
+
+        self.commit_focused_note()
+        changed, updated = self.document.merge(data)
+        self.patch_columns(changed, updated)
+        self.top_title_input.setText(self.document.meta["title"])
+        self.top_description_input.setText(self.document.meta["description"])
+
+        message = f"{CONFIG['window_reloaded']} {path}"
+        if self.document.conflicts:
+            message += f" ({len(self.document.conflicts)} {CONFIG['window_conflicts']})"
+        self.show_message(message, 10000)
+        self.title_changed.emit(self.tab_title())
+
+        if self.journal is not None:
+            # O diário passa a valer sobre a nova versão do arquivo base
+            self.saver.save()
+
+    def patch_columns(self, changed, updated):
+        """
+        Atualiza apenas as colunas e notas que mudaram no modelo.
+        """
+        self.minimap.invalidate(*changed)
+        if self.suspended:
+            return  # as colunas são recriadas a partir do modelo em resume()
+        widgets = {}
+        for i in range(self.columns_layout.count() - 1):
+            widget = self.columns_layout.itemAt(i).widget()
+            widgets[id(widget.column)] = widget
+
+        pool = {}
+        for key in changed:
+            if key in widgets:
+                for note_widget in widgets[key].take_note_widgets():
+                    pool[note_widget.note['id']] = note_widget
+
+        for index, column in enumerate(self.document.columns):
+            widget = widgets.pop(id(column), None)
+            if widget is None:
+                widget = ColumnWidget(self.document, column)
+                self.columns_layout.insertWidget(index, widget)
+            elif self.columns_layout.indexOf(widget) != index:
+                self.columns_layout.removeWidget(widget)
+                self.columns_layout.insertWidget(index, widget)
+            if id(column) in changed:
+                widget.refresh_header()
+                if widget.materialized:
+                    widget.fill_notes(pool, updated, self.document.conflicts)
+
+        for widget in list(widgets.values()) + list(pool.values()):
+            widget.setParent(None)
+            widget.deleteLater()
+        self.apply_filter()
+        self.schedule_virtual()
+
+    def on_saved(self, path, written, meta):
+        if path == self.top_input.text():
+            shards = shard_dir(path)
+            if path not in self.watcher.files() or (os.path.isdir(shards) != (shards in self.watcher.directories())):
+                self.watch_file(path)
+        if self.journal is not None and self.journal.path == journal_path(path) and "journal_seq" in meta:
+            self.journal.truncate_through(meta["journal_seq"])
+        if written:
+            self.show_message(f"{CONFIG['window_saved']} {path}", 3000)
+        if self.pending_restores:
+            self.write_restores()
+
+    def on_save_failed(self, path, message):
+        QMessageBox.critical(self, "Error", f"{CONFIG['window_error_saving']}\n{path}\n{message}")
+
+    def save_as_to_file(self):
+        # O formato do arquivo (JSON, comprimido, MessagePack) segue a extensão
+        path, selected = QFileDialog.getSaveFileName(self, "Save as", "", ";;".join(save_filters()))
+        if not path:
+            return
+        path = path_for_filter(path, selected)
+        self.top_input.setText(path)
+        self.save_to_file()
+        
+    def save_to_file(self):
+        path=self.top_input.text()
+        
+        if path=='':
+            self.save_as_to_file()
+            return
+        else:
+            self.commit_focused_note()
+            self.on_meta_edited()
+            if self.document.is_sharded() and path != self.saver.path:
+                # Os arquivos das colunas são todos escritos no novo local
+                self.load_all_columns()
+                self.document.mark_all_dirty()
+            if self.saver.path and blob_dir(path) != blob_dir(self.saver.path):
+                # Conteúdos separados são regravados ao lado do novo arquivo
+                self.load_all_columns()
+                for column in self.document.columns:
+                    for note in column['notes']:
+                        if is_stub(note):
+                            inline_note(note, self.saver.path)
+                self.document.mark_all_dirty()
+            if CONFIG["journal"] and (self.journal is None or self.journal.path != journal_path(path)):
+                self.open_journal(path, reset=True)
+            # Colunas e conteúdos separados passam a ser lidos do novo arquivo
+            self.document.source = self.document.index.path = path
+            self.saver.save(path)
+            self.top_line_widget.setVisible(True)
+            self.title_changed.emit(self.tab_title())
 
+    def load_from_file(self, path=""):
+        
+        if (len(path)==0) or not os.path.exists(path):
+            path, _ = QFileDialog.getOpenFileName(self, "Load", "", open_filter())
+            
+        if os.path.exists(path):
+            self.cancel_loading()
+            self.set_loading(True, path)
+
+            # A leitura do JSON é feita numa thread separada
+            self.loader = BoardParser(path, self, build_index=True)
+            self.loader.parsed.connect(self.on_board_parsed)
+            self.loader.failed.connect(self.on_board_failed)
+            self.loader.finished.connect(self.loader.deleteLater)
+            self.loader.start()
+        else:
+            QMessageBox.warning(self, CONFIG["window_path_problems"], f"{CONFIG['window_error_loading']}\n{path}")  
+
+    def set_loading(self, loading, path=""):
+        self.loading = loading
+        self.loading_widget.setVisible(loading)
+        if loading:
+            self.load_progress.setRange(0, 0)  # indeterminado enquanto lê o arquivo
+            self.show_message(f"{CONFIG['window_loading']} {path}")
+        else:
+            self.show_message("")
+        self.loading_changed.emit(loading)
+
+    def show_message(self, message, timeout=0):
+        window = self.window()
+        if isinstance(window, QMainWindow):
+            window.statusBar().showMessage(message, timeout)
+
+    def tab_title(self):
+        path = self.top_input.text()
+        if path:
+            return os.path.basename(path)
+        return self.document.meta.get("title") or CONFIG["kanban_title_default"]
+
+    def on_board_failed(self, path, message):
+        if self.sender() is not self.loader:
+            return
+        self.loader = None
+        self.set_loading(False)
+        QMessageBox.critical(self, "Error", f"{CONFIG['window_error_loading']}\n{message}")
+
+    def on_board_parsed(self, path, data, total):
+        if self.sender() is not self.loader:
+            return
+        self.loaded_digest = self.loader.digest
+        index = self.loader.index
+        unloaded = self.loader.unloaded
+        self.loader = None
+        self.build_document(path, data, total, index, unloaded)
+
+    def build_document(self, path, data, total, index=None, unloaded=()):
+        # O quadro atual fica guardado até o fim da construção, para poder cancelar
+        self.stop_materializing()
+        self.loading_backup = ( self.scroll_area.takeWidget(),
+                                self.columns_layout,
+                                self.document)
+
+        self.columns_widget, self.columns_layout = self.new_columns_widget()
+        self.scroll_area.setWidget(self.columns_widget)
+
+        self.document = BoardDocument(data, index=index, unloaded=unloaded, source=path)
+        # Estilos novos mudam a folha antes de haver colunas para repolir
+        board_style().style_names([self.document.column_style(column) for column in self.document.columns])
+        self.document.changed.connect(self.on_document_changed)
+        self.minimap.set_document(self.document)
+        self.filter_ids = self.document.index.search(self.filter_text)
+        self.top_title_input.setText(self.document.meta["title"])
+        self.top_description_input.setText(self.document.meta["description"])
+
+        self.load_progress.setRange(0, total)
+        self.builder = ChunkedBuilder(self.build_columns(self.document), total, parent=self)
+        self.builder.progress.connect(lambda done, _: self.load_progress.setValue(done))
+        self.builder.finished.connect(lambda: self.on_board_built(path))
+        self.builder.start()
+
+    def build_columns(self, document):
+        # Só os cabeçalhos; as notas das colunas visíveis são criadas por update_virtual
+        for column in document.columns:
+            self.columns_layout.insertWidget(self.columns_layout.count() - 1, ColumnWidget(document, column))
+            self.schedule_virtual()
+            yield
+
+    def on_board_built(self, path):
+        old_widget = self.loading_backup[0]
+        old_widget.deleteLater()
+        self.loading_backup = None
+        self.builder.deleteLater()
+        self.builder = None
+
+        self.saver.set_document(self.document, path)
+        self.saver.last_hash = self.loaded_digest
+        self.open_journal(path)
+        self.watch_file(path)
+        self.schedule_virtual()
+        self.top_line_widget.setVisible(True)
+        self.top_input.setText(path)
+        self.set_loading(False)
+        self.title_changed.emit(self.tab_title())
+        if self.restoring:
+            self.restoring = False
+            self.saver.save()
+        if self.reveal_id is not None:
+            self.reveal_note(self.reveal_id)
+
+    def cancel_loading(self):
+        if self.loader is not None:
+            self.loader = None  # o resultado da thread será ignorado
+            self.set_loading(False)
+
+        if self.builder is not None:
+            self.builder.cancel()
+            self.builder.deleteLater()
+            self.builder = None
+            self.restoring = False
+
+            # Restaura o quadro anterior
+            old_widget, old_layout, old_document = self.loading_backup
+            self.loading_backup = None
+            self.scroll_area.takeWidget().deleteLater()
+            self.scroll_area.setWidget(old_widget)
+            self.columns_widget, self.columns_layout = old_widget, old_layout
+            self.stop_materializing()
+            self.document.deleteLater()
+            self.document = old_document
+            self.minimap.set_document(old_document)
+            self.top_title_input.setText(old_document.meta["title"])
+            self.top_description_input.setText(old_document.meta["description"])
+            self.apply_filter()
+
+            self.set_loading(False)
+            self.show_message(CONFIG["window_loading_cancelled"], 3000)
+
+    # ---------------------------------------------------- quadro dividido
+    def ensure_loaded(self, column):
+        """
+        Lê sob demanda as notas de uma coluna de um quadro dividido.
+        """
+        if column['id'] not in self.document.unloaded:
+            return
+        notes, text = read_shard(self.document.source, column['id'])
+        self.document.load_column(column, notes, text)
+        self.minimap.invalidate(id(column))
+
+    def load_all_columns(self):
+        for column in self.document.columns:
+            self.ensure_loaded(column)
+
+    def set_sharded(self, sharded):
+        if sharded == self.document.is_sharded():
+            return
+        path = self.top_input.text()
+        if not path:
+            QMessageBox.warning(self, CONFIG["toolbar_sharded"], CONFIG["window_storage_needs_file"])
+            return
+        self.commit_focused_note()
+        self.load_all_columns()
+        self.document.set_layout(sharded)
+        self.saver.save(path)
+        self.watch_file(path)
+
+    # -------------------------------------------------------- arquivo morto
+    def archive_file(self):
+        path = self.top_input.text()
+        if not path:
+            QMessageBox.warning(self, CONFIG["toolbar_archive"], CONFIG["window_archive_needs_file"])
+            return ""
+        return archive_path(path)
+
+    def archive_notes(self, column_widget, notes):
+        """
+        Acrescenta as notas ao arquivo morto e as retira do quadro.
+        """
+        if not notes:
+            return
+        path = self.archive_file()
+        if not path:
+            return
+        self.commit_focused_note()
+        column = column_widget.column
+        try:
+            append_records(path, archive_records(column, notes, self.top_input.text()))
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"{CONFIG['window_error_archive']}\n{path}\n{e}")
+            return
+
+        ids = set(note['id'] for note in notes)
+        self.document.remove_notes([(column, note) for note in notes])
+        column_widget.drop_note_widgets([widget for widget in column_widget.note_widgets() if widget.note['id'] in ids])
+        self.show_message(f"{len(notes)} {CONFIG['window_archived']} {path}", 3000)
+
+    def archive_older(self, column_widget):
+        days, ok = QInputDialog.getInt(self, CONFIG["board_archive_older"], CONFIG["board_archive_older_prompt"],
+                                       CONFIG["archive_age_days"], 0, 100000)
+        if not ok:
+            return
+        self.ensure_loaded(column_widget.column)
+        cutoff = time.time() - days * 86400
+        notes = [note for note in column_widget.column['notes'] if note.get('modified', cutoff) < cutoff]
+        self.archive_notes(column_widget, notes)
+
+    def open_archive(self):
+        path = self.archive_file()
+        if not path:
+            return
+        if not os.path.exists(path):
+            self.on_archive_loaded(path, [])
+            return
+        # O arquivo morto só é lido quando a vista é aberta
+        loader = ArchiveLoader(path, self)
+        loader.loaded.connect(self.on_archive_loaded)
+        loader.failed.connect(lambda path, message: QMessageBox.critical(self, "Error", f"{CONFIG['window_error_archive']}\n{path}\n{message}"))
+        loader.finished.connect(loader.deleteLater)
+        loader.start()
+
+    def on_archive_loaded(self, path, records):
+        labels = {  "title": f"{CONFIG['archive_title']} - {self.tab_title()}",
+                    "headers": CONFIG["archive_headers"],
+                    "count": CONFIG["archive_count"],
+                    "restore": CONFIG["archive_restore"],
+                    "close": CONFIG["archive_close"]}
+        from simple_kanban_gui.modules.warchive import ArchiveWindow
+        window = ArchiveWindow(records, labels, self)
+        window.restore_requested.connect(lambda records: self.restore_archived(path, records))
+        window.setAttribute(Qt.WA_DeleteOnClose)
+        window.show()
+
+    def restore_archived(self, path, records):
+        """
+        Devolve notas arquivadas às colunas de origem (ou à primeira coluna).
+        """
+        present = set(note['id'] for column in self.document.columns for note in column['notes'])
+        columns = {column['id']: column for column in self.document.columns}
+        widgets = {}
+        for i in range(self.columns_layout.count() - 1):
+            widget = self.columns_layout.itemAt(i).widget()
+            widgets[id(widget.column)] = widget
+
+        restored = []
+        for record in records:
+            note = record["note"]
+            if note['id'] in present:
+                continue
+            column = columns.get(record.get("board_id"))
+            if column is None:
+                if not self.document.columns:
+                    self.add_column(record.get("board") or CONFIG["board_title"])
+                column = self.document.columns[0]
+            self.ensure_loaded(column)
+            self.document.add_note(column, note)
+            widget = widgets.get(id(column))
+            if widget is not None and widget.materialized:
+                widget.add_note_widget(note)
+            restored.append(note['id'])
+
+        # As notas só saem do arquivo morto quando já estão gravadas no quadro
+        self.pending_restores.append((path, restored))
+        if self.journal is not None:
+            self.write_restores()
+        else:
+            self.saver.save(self.top_input.text())
+
+    def write_restores(self):
+        pending = []
+        for path, note_ids in self.pending_restores:
+            if self.journal is None and any(self.document.is_local("notes", note_id) for note_id in note_ids):
+                pending.append((path, note_ids))
+                continue
+            try:
+                append_records(path, restore_records(note_ids))
+            except Exception as e:
+                self.show_message(f"{CONFIG['window_error_archive']} {path} {e}", 10000)
+        self.pending_restores = pending
+
+    # ----------------------------------------------------------------- links
+    def follow_link(self, file, note_id):
+        """
+        Segue uma referência [[arquivo#id]] feita numa nota deste quadro.
+        """
+        path = self.top_input.text()
+        if not file:
+            self.reveal_note(note_id)
+            return
+        target, note_id = link_target(path or os.path.join(os.getcwd(), ""), file, note_id)
+        self.link_activated.emit(target, note_id)
+
+    def reveal_note(self, note_id):
+        """
+        Seleciona a nota `note_id` e rola o quadro até ela.
+        """
+        if self.loading:
+            self.reveal_id = note_id
+            return
+        self.reveal_id = None
+        if not note_id:
+            return
+        self.load_all_columns()
+        for position, column in enumerate(self.document.columns):
+            if any(note['id'] == note_id for note in column['notes']):
+                break
+        else:
+            self.show_message(f"{CONFIG['window_note_missing']} {note_id}", 5000)
+            return
+        self.selected_ids = {note_id}
+        self.selection_anchor = note_id
+        self.update_selection()
+        self.scroll_to_column(position)
+        self.reveal_id = note_id
+        self.ensure_revealed()
+
+    def ensure_revealed(self):
+        # A coluna pode ainda não ter widgets; tenta de novo após a materialização
+        for column in self.column_widgets():
+            if column.materialized:
+                for widget in column.note_widgets():
+                    if widget.note['id'] == self.reveal_id:
+                        self.scroll_area.ensureWidgetVisible(widget)
+                        self.reveal_id = None
+                        return
+
+    # --------------------------------------------------------------- seleção
+    def column_widgets(self):
+        return [self.columns_layout.itemAt(i).widget() for i in range(self.columns_layout.count() - 1)]
+
+    def apply_config(self):
+        """
+        Configuração recarregada: estilos e larguras das colunas atualizados
+        sem refazer os widgets.
+        """
+        self.minimap.set_note_style(CONFIG["note_style"]["frame"])
+        self.saver.blob_threshold = CONFIG["note_blob_chars"]
+        self.saver.inline_styles = CONFIG["board_inline_styles"]
+        for widget in self.column_widgets():
+            widget.apply_config()
+        self.schedule_virtual()
+
+    def select_note(self, column_widget, note, modifiers):
+        notes = column_widget.column['notes']
+        anchor = next((i for i, n in enumerate(notes) if n['id'] == self.selection_anchor), None)
+        if modifiers & Qt.ShiftModifier and anchor is not None:
+            first, last = sorted((anchor, index_of(notes, note)))
+            if not modifiers & Qt.ControlModifier:
+                self.selected_ids = set()
+            self.selected_ids.update(n['id'] for n in notes[first:last + 1])
+        else:
+            self.selected_ids ^= {note['id']}
+            self.selection_anchor = note['id']
+        self.update_selection()
+
+    def clear_selection(self):
+        self.selection_anchor = None
+        if self.selected_ids:
+            self.selected_ids = set()
+            self.update_selection()
+
+    def update_selection(self):
+        for column in self.column_widgets():
+            if column.materialized:
+                for widget in column.note_widgets():
+                    widget.set_selected(widget.note['id'] in self.selected_ids)
+        if self.selected_ids:
+            self.show_message(f"{len(self.selected_ids)} {CONFIG['window_selected']}")
+        else:
+            self.show_message("")
+
+    def selected_items(self):
+        """
+        Pares (coluna, nota) selecionados, na ordem do quadro.
+        """
+        if not self.selected_ids:
+            return []
+        self.load_all_columns()
+        items = [(column, note) for column in self.document.columns for note in column['notes'] if note['id'] in self.selected_ids]
+        self.selected_ids = set(note['id'] for _, note in items)
+        return items
+
+    def move_selected(self, target_widget, index=None):
+        """
+        Move as notas selecionadas para `target_widget` com uma operação do
+        modelo; os widgets existentes são reaproveitados e cada coluna afetada
+        é refeita num único passo de layout.
+        """
+        self.commit_focused_note()
+        items = self.selected_items()
+        if not items:
+            return
+        target = target_widget.column
+        if index is None:
+            index = len(target['notes']) - sum(1 for column, _ in items if column is target)
+        sources = set(id(column) for column, _ in items) | {id(target)}
+        affected = [widget for widget in self.column_widgets() if id(widget.column) in sources]
+        if any(widget.materializing for widget in affected):
+            self.stop_materializing()
+
+        ids = self.selected_ids
+        widgets = {}
+        for widget in affected:
+            widget.setUpdatesEnabled(False)
+            if widget.materialized:
+                for note_widget in widget.note_widgets():
+                    if note_widget.note['id'] in ids:
+                        widget.notes_layout.removeWidget(note_widget)
+                        widgets[note_widget.note['id']] = note_widget
+
+        self.document.move_notes(items, target, index)
+
+        if target_widget.materialized:
+            if len(items) > CONFIG["board_bulk_rebuild"]:
+                # Reparentar centenas de widgets custa mais do que refazer a
+                # coluna em fatias a partir do modelo
+                target_widget.release()
+            else:
+                for offset, (_, note) in enumerate(items):
+                    note_widget = widgets.pop(note['id'], None)
+                    if note_widget is None:
+                        note_widget = target_widget.add_note_widget(note, index + offset)
+                    else:
+                        target_widget.notes_layout.insertWidget(index + offset, note_widget)
+                    note_widget.set_filter(self.filter_ids)
+                    note_widget.set_selected(True)
+        target_widget.drop_note_widgets(widgets.values())
+        for widget in affected:
+            widget.setUpdatesEnabled(True)
+        self.schedule_virtual()
+
+    def remove_selected_widgets(self, items):
+        columns = set(id(column) for column, _ in items)
+        ids = set(note['id'] for _, note in items)
+        for widget in self.column_widgets():
+            if id(widget.column) in columns and widget.materialized:
+                widget.drop_note_widgets([note_widget for note_widget in widget.note_widgets() if note_widget.note['id'] in ids])
+
+    def take_selected(self):
+        """
+        Retira as notas selecionadas deste quadro (para outra aba) e as devolve
+        com o conteúdo completo.
+        """
+        self.commit_focused_note()
+        items = self.selected_items()
+        if items:
+            self.remove_selected_widgets(items)
+            self.document.remove_notes(items)
+        self.clear_selection()
+        return [inline_note(note, self.top_input.text()) for _, note in items]
+
+    def delete_selected(self):
+        self.take_selected()
+
+    def archive_selected(self):
+        if not self.archive_file():
+            return
+        self.commit_focused_note()
+        items = self.selected_items()
+        widgets = dict((id(widget.column), widget) for widget in self.column_widgets())
+        by_column = {}
+        for column, note in items:
+            by_column.setdefault(id(column), []).append(note)
+        for key, notes in by_column.items():
+            self.archive_notes(widgets[key], notes)
+        self.clear_selection()
+
+    # ------------------------------------------------------------- histórico
+    def open_history(self):
+        path = self.top_input.text()
+        store = history_store()
+        versions = store.versions(path) if store is not None and path else []
+        if not versions:
+            QMessageBox.information(self, CONFIG["history_title"], CONFIG["history_empty"])
+            return
+        labels = {  "title": f"{CONFIG['history_title']} - {self.tab_title()}",
+                    "columns": CONFIG["history_columns"],
+                    "select": CONFIG["history_select"],
+                    "latest": CONFIG["history_latest"],
+                    "diff": CONFIG["history_diff"],
+                    "restore_note": CONFIG["history_restore_note"],
+                    "restore_column": CONFIG["history_restore_column"],
+                    "restore_board": CONFIG["history_restore_board"],
+                    "restore_board_prompt": CONFIG["history_restore_board_prompt"],
+                    "close": CONFIG["history_close"]}
+        from simple_kanban_gui.modules.whistory import HistoryWindow
+        window = HistoryWindow(store, versions, labels, path, self)
+        window.restore_note.connect(self.restore_note)
+        window.restore_column.connect(self.restore_column)
+        window.restore_board.connect(self.restore_board)
+        window.setAttribute(Qt.WA_DeleteOnClose)
+        window.show()
+
+    def release_columns(self):
+        """
+        Descarta os widgets de notas (gravando o texto em edição) antes de o
+        modelo ser alterado por fora dos widgets; update_virtual os recria.
+        """
+        self.stop_materializing()
+        self.load_all_columns()
+        for i in range(self.columns_layout.count() - 1):
+            self.columns_layout.itemAt(i).widget().release()
+
+    def refresh_columns(self):
+        for i in range(self.columns_layout.count() - 1):
+            self.columns_layout.itemAt(i).widget().refresh_header()
+        self.schedule_virtual()
+
+    def put_note(self, note, target, index):
+        """
+        Coloca `note` (versão antiga) na posição `index` de `target`, editando
+        e movendo a nota atual de mesmo id ou inserindo-a de novo.
+        """
+        index = min(index, len(target["notes"]))
+        for column in self.document.columns:
+            for current in column["notes"]:
+                if current["id"] != note["id"]:
+                    continue
+                fields = {key: value for key, value in note.items() if key != "id" and current.get(key) != value}
+                if fields:
+                    self.document.edit_note(column, current, **fields)
+                if column is not target or self.document.note_index(column, current) != index:
+                    self.document.move_note(column, current, target, min(index, len(target["notes"]) - (column is target)))
+                return
+        self.document.add_note(target, note, index)
+
+    def restore_note(self, note, header, index):
+        """
+        Devolve uma nota como estava numa versão do histórico, à sua coluna
+        (ou à primeira, se a coluna não existe mais).
+        """
+        self.release_columns()
+        target = next((column for column in self.document.columns if column["id"] == header["id"]), None)
+        if target is None:
+            if not self.document.columns:
+                self.add_column(header.get("title", CONFIG["board_title"]))
+            target = self.document.columns[0]
+        self.put_note(note, target, index)
+        self.refresh_columns()
+
+    def restore_column(self, column, index):
+        """
+        Deixa a coluna (título, estilo e notas) como estava numa versão do histórico.
+        """
+        self.release_columns()
+        column = named_style(column)
+        target = next((c for c in self.document.columns if c["id"] == column["id"]), None)
+        if target is None:
+            target = dict({key: value for key, value in column.items() if key != "notes"}, notes=[])
+            index = min(index, len(self.document.columns))
+            self.document.add_column(target, index)
+            self.columns_layout.insertWidget(index, ColumnWidget(self.document, target))
+        else:
+            if target.get("title") != column.get("title"):
+                self.document.rename_column(target, column.get("title", ""))
+            if target.get("style") != column.get("style"):
+                self.document.set_column_style(target, column.get("style"))
+        old_ids = set(note["id"] for note in column["notes"])
+        for note in list(target["notes"]):
+            if note["id"] not in old_ids:
+                self.document.remove_note(target, note)
+        for i, note in enumerate(column["notes"]):
+            self.put_note(dict(note), target, i)
+        self.refresh_columns()
+
+    def restore_board(self, data):
+        """
+        Troca o quadro inteiro por uma versão do histórico e o grava.
+        """
+        path = self.top_input.text()
+        self.commit_focused_note()
+        data["journal_seq"] = self.document.meta.get("journal_seq", 0)
+        if self.document.is_sharded():
+            data[LAYOUT_KEY] = SHARDED
+        else:
+            data.pop(LAYOUT_KEY, None)
+        self.cancel_loading()
+        self.set_loading(True, path)
+        self.loaded_digest = ""
+        self.restoring = True
+        self.build_document(path, data, len(data["boards"]))
+
+    # ------------------------------------------------------ abas inativas
+    def suspend(self):
+        """
+        Descarta os widgets das colunas, mantendo apenas o documento.
+        """
+        if self.suspended or self.loading or self.builder is not None:
+            return
+        if NoteWidget.active_drag is not None and self.isAncestorOf(NoteWidget.active_drag):
+            return  # a nota arrastada não pode ser destruída
+        self.stop_materializing()
+        for i in range(self.columns_layout.count() - 1):
+            for widget in self.columns_layout.itemAt(i).widget().note_widgets():
+                widget.commit_content()
+        self.scroll_area.takeWidget().deleteLater()
+        self.columns_widget, self.columns_layout = self.new_columns_widget()
+        self.scroll_area.setWidget(self.columns_widget)
+        self.suspended = True
+
+    def resume(self):
+        if not self.suspended:
+            return
+        self.suspended = False
+        for _ in self.build_columns(self.document):
+            pass
+        self.schedule_virtual()
+
+    def shutdown(self):
+        """
+        Termina a carga e as gravações pendentes antes de fechar o quadro.
+        """
+        self.cancel_loading()
+        self.stop_materializing()
+        if CONFIG["autosave"]:
+            self.commit_focused_note()
+            self.on_meta_edited()
+            try:
+                self.saver.flush()
+            except Exception as e:
+                self.on_save_failed(self.saver.path, str(e))
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+        for thread in self.findChildren(QThread):
+            thread.wait()
+
+
+class BoardTabBar(QTabBar):
+    """
+    Barra de abas que troca de aba quando uma nota é arrastada sobre ela,
+    permitindo soltá-la num quadro de outra aba.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAcceptDrops(True)
+
+    def dragEnterEvent(self, event):
+        if event.mimeData().hasFormat(NOTE_MIME_TYPE):
+            event.acceptProposedAction()
+
+    def dragMoveEvent(self, event):
+        index = self.tabAt(event.pos())
+        if index >= 0 and index != self.currentIndex():
+            self.setCurrentIndex(index)
         event.acceptProposedAction()
 
+    def dropEvent(self, event):
+        event.ignore()
 
 
 class KanbanWindow(QMainWindow):
+    """
+    Janela principal; cada quadro aberto fica numa aba (BoardView), todos no
+    mesmo processo.
+    """
     def __init__(self, filepath):
         super().__init__()
         self.setWindowTitle(about.__program_name__)
         self.resize(CONFIG["window_width"], CONFIG["window_height"])
 
+        # Edições da configuração (open_configure_editor) valem sem reiniciar
+        LIVE_CONFIG.watch()
+        LIVE_CONFIG.changed.connect(self.on_config_changed)
+
         ## Icon
         # Get base directory for icons
         base_dir_path = os.path.dirname(os.path.abspath(__file__))
@@ -330,112 +2230,126 @@ class KanbanWindow(QMainWindow):
         self.toolbar.setToolButtonStyle(Qt.ToolButtonTextUnderIcon)
         self.addToolBar(self.toolbar)
 
-        self.new_kanban_action = QAction(QIcon.fromTheme("document-new"), CONFIG["toolbar_new_kanban"], self)
+        self.new_kanban_action = QAction(theme_icon("document-new"), CONFIG["toolbar_new_kanban"], self)
         self.new_kanban_action.setToolTip(CONFIG["toolbar_new_kanban_tooltip"])
         self.new_kanban_action.triggered.connect(lambda: self.func_new_kanban())
 
-        self.add_column_action = QAction(QIcon.fromTheme("list-add"), CONFIG["toolbar_add_column"], self)
+        self.add_column_action = QAction(theme_icon("list-add"), CONFIG["toolbar_add_column"], self)
         self.add_column_action.setToolTip(CONFIG["toolbar_add_column_tooltip"])
-        self.add_column_action.triggered.connect(lambda: self.add_column())
+        self.add_column_action.triggered.connect(lambda: self.current_view().add_column())
 
-        self.save_action = QAction(QIcon.fromTheme("document-save"), CONFIG["toolbar_save"], self)
+        self.save_action = QAction(theme_icon("document-save"), CONFIG["toolbar_save"], self)
         self.save_action.setToolTip(CONFIG["toolbar_save_tooltip"])
-        self.save_action.triggered.connect(self.save_to_file)
+        self.save_action.triggered.connect(lambda: self.current_view().save_to_file())
         
-        self.save_as_action = QAction(QIcon.fromTheme("document-save-as"), CONFIG["toolbar_save_as"], self)
+        self.save_as_action = QAction(theme_icon("document-save-as"), CONFIG["toolbar_save_as"], self)
         self.save_as_action.setToolTip(CONFIG["toolbar_save_as_tooltip"])
-        self.save_as_action.triggered.connect(self.save_as_to_file)
+        self.save_as_action.triggered.connect(lambda: self.current_view().save_as_to_file())
 
-        self.load_action = QAction(QIcon.fromTheme("document-open"), CONFIG["toolbar_load"], self)
+        self.load_action = QAction(theme_icon("document-open"), CONFIG["toolbar_load"], self)
         self.load_action.setToolTip(CONFIG["toolbar_load_tooltip"])
-        self.load_action.triggered.connect(lambda: self.load_from_file(""))
+        self.load_action.triggered.connect(lambda: self.current_view().load_from_file(""))
 
         # Adicionar o espaçador
         spacer = QWidget()
         spacer.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
 
         #
-        self.configure_action = QAction(QIcon.fromTheme("document-properties"), CONFIG["toolbar_configure"], self)
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText(CONFIG["toolbar_filter"])
+        self.filter_input.setToolTip(CONFIG["toolbar_filter_tooltip"])
+        self.filter_input.setClearButtonEnabled(True)
+        self.filter_input.setMaximumWidth(250)
+        self.filter_input.textChanged.connect(lambda text: self.current_view().apply_filter(text))
+
+        self.configure_action = QAction(theme_icon("document-properties"), CONFIG["toolbar_configure"], self)
         self.configure_action.setToolTip(CONFIG["toolbar_configure_tooltip"])
         self.configure_action.triggered.connect(self.open_configure_editor)
         
         #
-        self.about_action = QAction(QIcon.fromTheme("help-about"), CONFIG["toolbar_about"], self)
+        self.about_action = QAction(theme_icon("help-about"), CONFIG["toolbar_about"], self)
         self.about_action.setToolTip(CONFIG["toolbar_about_tooltip"])
         self.about_action.triggered.connect(self.open_about)
         
         # Coffee
-        self.coffee_action = QAction(QIcon.fromTheme("emblem-favorite"), CONFIG["toolbar_coffee"], self)
+        self.coffee_action = QAction(theme_icon("emblem-favorite"), CONFIG["toolbar_coffee"], self)
         self.coffee_action.setToolTip(CONFIG["toolbar_coffee_tooltip"])
         self.coffee_action.triggered.connect(self.on_coffee_action_click)
 
+        self.sharded_action = QAction(theme_icon("folder-new"), CONFIG["toolbar_sharded"], self)
+        self.sharded_action.setToolTip(CONFIG["toolbar_sharded_tooltip"])
+        self.sharded_action.setCheckable(True)
+        self.sharded_action.triggered.connect(self.on_sharded_triggered)
+
+        self.archive_action = QAction(theme_icon("archive-extract", "folder-open"), CONFIG["toolbar_archive"], self)
+        self.archive_action.setToolTip(CONFIG["toolbar_archive_tooltip"])
+        self.archive_action.triggered.connect(lambda: self.current_view().open_archive())
+
+        self.history_action = QAction(theme_icon("document-open-recent", "edit-undo"), CONFIG["toolbar_history"], self)
+        self.history_action.setToolTip(CONFIG["toolbar_history_tooltip"])
+        self.history_action.triggered.connect(lambda: self.current_view().open_history())
+
+        self.minimap_action = QAction(theme_icon("zoom-fit-best"), CONFIG["toolbar_minimap"], self)
+        self.minimap_action.setToolTip(CONFIG["toolbar_minimap_tooltip"])
+        self.minimap_action.setCheckable(True)
+        self.minimap_action.setChecked(CONFIG["minimap"])
+        self.minimap_action.toggled.connect(lambda checked: [view.set_minimap_visible(checked) for view in self.views()])
+
+        # Painel "citada por": notas de qualquer quadro que apontam para a nota em foco
+        self.backlinks_panel = BacklinkPanel({"none": CONFIG["links_none"], "referenced_by": CONFIG["links_referenced_by"]})
+        self.backlinks_panel.open_requested.connect(self.open_link)
+        self.backlinks_dock = QDockWidget(CONFIG["links_title"], self)
+        self.backlinks_dock.setWidget(self.backlinks_panel)
+        self.backlinks_dock.setVisible(False)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.backlinks_dock)
+        self.backlinks_target = None  # (caminho, id da nota, título)
+
+        self.backlinks_action = self.backlinks_dock.toggleViewAction()
+        self.backlinks_action.setIcon(theme_icon("insert-link", "emblem-symbolic-link"))
+        self.backlinks_action.setText(CONFIG["toolbar_backlinks"])
+        self.backlinks_action.setToolTip(CONFIG["toolbar_backlinks_tooltip"])
+        self.backlinks_action.setEnabled(CONFIG["links"])
+        self.backlinks_action.toggled.connect(lambda checked: checked and self.update_backlinks())
+        QApplication.instance().focusChanged.connect(self.on_focus_changed)
+
 
         self.toolbar.addAction(self.new_kanban_action)
         self.toolbar.addAction(self.add_column_action)
         self.toolbar.addAction(self.save_action)
         self.toolbar.addAction(self.save_as_action)
         self.toolbar.addAction(self.load_action)
+        self.toolbar.addAction(self.sharded_action)
+        self.toolbar.addAction(self.archive_action)
+        self.toolbar.addAction(self.history_action)
+        self.toolbar.addAction(self.minimap_action)
+        self.toolbar.addAction(self.backlinks_action)
+        self.toolbar.addWidget(self.filter_input)
         self.toolbar.addWidget(spacer)
         self.toolbar.addAction(self.configure_action)
         self.toolbar.addAction(self.about_action)
         self.toolbar.addAction(self.coffee_action)
         
-        central_widget = QWidget()
-        self.setCentralWidget(central_widget)
-
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-
-        self.columns_widget = QWidget()
-        self.columns_layout = QHBoxLayout(self.columns_widget)
-        self.columns_layout.setSpacing(10)
-        self.columns_layout.addStretch()
-
-        self.scroll_area.setWidget(self.columns_widget)
-
-        main_layout = QVBoxLayout(central_widget)
-        
-        # Cria o widget de topo e seu layout
-        self.top_line_widget = QWidget()
-        self.top_line_layout = QHBoxLayout(self.top_line_widget)
-        self.top_label = QLabel(CONFIG["window_filename"])
-        self.top_input = QLineEdit("")
-        self.top_input.setReadOnly(True)
-        self.top_line_layout.addWidget(self.top_label)
-        self.top_line_layout.addWidget(self.top_input)
-
-        # Title layout
-        self.top_title_line_widget = QWidget()
-        #self.top_title_line_widget.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Preferred)
-        self.top_title_layout = QHBoxLayout(self.top_title_line_widget)
-        self.top_title_label = QLabel(CONFIG["kanban_title_label"])
-        self.top_title_input = QLineEdit(CONFIG["kanban_title_default"])
-        self.top_description_label = QLabel(CONFIG["kanban_description_label"])
-        self.top_description_input = QLineEdit(CONFIG["kanban_description_default"])
-        self.top_title_layout.addWidget(self.top_title_label)
-        self.top_title_layout.addWidget(self.top_title_input)
-        self.top_title_layout.addWidget(self.top_description_label)
-        self.top_title_layout.addWidget(self.top_description_input)
-
-        # Adiciona ao layout principal
-        main_layout.addWidget(self.top_line_widget)
-        main_layout.addWidget(self.top_title_line_widget)
-        main_layout.addWidget(self.scroll_area)
-
-        # Quadros iniciais
-        for title in CONFIG["board_startup_list"]:
-            self.add_column(title)
-            
-        self.top_line_widget.setVisible(False)
-        
-        if len(filepath)>0:
-            self.load_from_file(filepath)
+        self.tabs = QTabWidget()
+        self.tabs.setTabBar(BoardTabBar())
+        self.tabs.setTabsClosable(True)
+        self.tabs.setMovable(True)
+        self.tabs.setDocumentMode(True)
+        self.tabs.currentChanged.connect(self.on_current_changed)
+        self.tabs.tabCloseRequested.connect(self.close_view)
+        self.setCentralWidget(self.tabs)
+
+        self.link_service_connected = False
+        self.add_view(filepath)
 
     def on_coffee_action_click(self):
         QDesktopServices.openUrl(QUrl("https://ko-fi.com/trucomanx"))
         
     def func_new_kanban(self):
-        subprocess.Popen([sys.executable, __file__])
+        self.add_view("")
+
+    def on_config_changed(self, keys):
+        for view in self.views():
+            view.apply_config()
 
     def open_configure_editor(self):
         if os.name == 'nt':  # Windows
@@ -443,71 +2357,136 @@ class KanbanWindow(QMainWindow):
         elif os.name == 'posix':  # Linux/macOS
             subprocess.run(['xdg-open', CONFIG_PATH])
 
-    def add_column(self, title=CONFIG["board_title"],style=CONFIG["board_style"]):
-        column = ColumnWidget(title,style)
-        self.columns_layout.insertWidget(self.columns_layout.count() - 1, column)
-
-    def save_as_to_file(self):
-        path, _ = QFileDialog.getSaveFileName(self, "Save as", "", "JSON (*.kanban.json)")
-        if not path.endswith(".kanban.json"):
-            path += ".kanban.json"
-        self.top_input.setText(path)
-        self.save_to_file()
-        
-    def save_to_file(self):
-        path=self.top_input.text()
-        
-        if path=='':
-            self.save_as_to_file()
+    def on_sharded_triggered(self, checked):
+        self.current_view().set_sharded(checked)
+        self.update_actions()
+
+    def current_view(self):
+        return self.tabs.currentWidget()
+
+    def views(self):
+        return [self.tabs.widget(i) for i in range(self.tabs.count())]
+
+    def add_notes(self, notes, column_index=0):
+        """
+        Inserção em lote numa coluna do quadro da aba atual.
+        """
+        view = self.current_view()
+        if view is not None:
+            view.add_notes(notes, column_index)
+
+    def add_view(self, filepath):
+        view = BoardView(filepath)
+        view.loading_changed.connect(lambda _: self.update_actions())
+        view.title_changed.connect(lambda title, view=view: self.tabs.setTabText(self.tabs.indexOf(view), title))
+        view.title_changed.connect(lambda _: self.update_actions())
+        view.set_minimap_visible(self.minimap_action.isChecked())
+        view.link_activated.connect(self.open_link)
+        view.note_edited.connect(self.on_note_edited)
+        index = self.tabs.addTab(view, view.tab_title())
+        self.tabs.setCurrentIndex(index)
+        return view
+
+    # ----------------------------------------------------------------- links
+    def connect_link_service(self, hint=""):
+        service = link_service(hint)
+        if service is not None and not self.link_service_connected:
+            self.link_service_connected = True
+            service.updated.connect(self.update_backlinks)
+        return service
+
+    def on_note_edited(self, path, note):
+        # Sem índice ainda, a nota é lida do disco quando ele for criado
+        if _link_service is not None:
+            _link_service.update_note(path, note)
+
+    def open_link(self, path, note_id):
+        """
+        Mostra a nota `note_id` do quadro `path`, abrindo-o numa aba se preciso.
+        """
+        target = os.path.normpath(os.path.abspath(path))
+        self.connect_link_service(target)
+        for view in self.views():
+            if view.top_input.text() and os.path.normpath(os.path.abspath(view.top_input.text())) == target:
+                self.tabs.setCurrentWidget(view)
+                view.reveal_note(note_id)
+                return
+        if not os.path.exists(target):
+            self.statusBar().showMessage(f"{CONFIG['window_link_missing']} {path}", 5000)
             return
-        else:
-            boards = []
-            for i in range(self.columns_layout.count() - 1):
-                item = self.columns_layout.itemAt(i).widget()
-                if isinstance(item, ColumnWidget):
-                    boards.append(item.get_data())
-            
-            title = self.top_title_input.text()
-            description = self.top_description_input.text()
-            
-            data={  "title":title,
-                    "description": description,
-                    "boards":boards}
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            
-            self.top_line_widget.setVisible(True)
+        view = self.add_view(target)
+        view.reveal_note(note_id)
+
+    def on_focus_changed(self, old, new):
+        widget = new
+        while widget is not None and not isinstance(widget, NoteWidget):
+            widget = widget.parentWidget()
+        if widget is None:
+            return
+        view = widget.parentWidget()
+        while view is not None and not isinstance(view, BoardView):
+            view = view.parentWidget()
+        if view is None or view.window() is not self or not view.top_input.text():
+            return
+        self.backlinks_target = (view.top_input.text(), widget.note.get('id', ''), widget.note.get('title', ''))
+        self.update_backlinks()
 
-    def load_from_file(self, path=""):
-        
-        if (len(path)==0) or not os.path.exists(path):
-            path, _ = QFileDialog.getOpenFileName(self, "Load", "", "JSON (*.kanban.json)")
-            
-        if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as f:
-                try:
-                    data = json.load(f)
-                except Exception as e:
-                    QMessageBox.critical(self, "Error", f"{CONFIG['window_error_loading']}\n{e}")
-                    return
-            
-            self.top_line_widget.setVisible(True)
-            self.top_input.setText(path)
-            
-            self.top_title_input.setText(data["title"])
-            self.top_description_input.setText(data["description"])
-
-            for i in reversed(range(self.columns_layout.count() - 1)):
-                item = self.columns_layout.itemAt(i).widget()
-                if item:
-                    item.setParent(None)
-
-            for col_data in data["boards"]:
-                col = ColumnWidget()
-                col.set_data(col_data)
-                self.columns_layout.insertWidget(self.columns_layout.count() - 1, col)
-        else:
-            QMessageBox.warning(self, CONFIG["window_path_problems"], f"{CONFIG['window_error_loading']}\n{path}")  
+    def update_backlinks(self):
+        if not self.backlinks_dock.isVisible():
+            return
+        view = self.current_view()
+        service = self.connect_link_service(view.top_input.text() if view is not None else "")
+        target = self.backlinks_target
+        if target is None:
+            if view is None or not view.top_input.text():
+                self.backlinks_panel.set_backlinks("", [])
+                return
+            # Sem nota em foco: referências ao quadro inteiro
+            target = (view.top_input.text(), "", os.path.basename(view.top_input.text()))
+        path, note_id, title = target
+        backlinks = service.index.backlinks(path, note_id) if service is not None else []
+        self.backlinks_panel.set_backlinks(title or note_id, backlinks)
+
+    def close_view(self, index):
+        view = self.tabs.widget(index)
+        view.shutdown()
+        self.tabs.removeTab(index)
+        view.deleteLater()
+        if self.tabs.count() == 0:
+            self.close()
+
+    def on_current_changed(self, index):
+        view = self.tabs.widget(index)
+        if view is None:
+            return
+        self.backlinks_target = None
+        self.update_backlinks()
+        view.resume()
+        view.apply_filter(self.filter_input.text())
+        self.suspend_inactive()
+        self.update_actions()
+
+    def suspend_inactive(self):
+        """
+        Abas inativas guardam apenas o modelo do documento.
+        """
+        current = self.current_view()
+        for view in self.views():
+            if view is not current:
+                view.suspend()
+
+    def update_actions(self):
+        view = self.current_view()
+        loading = view is not None and view.loading
+        for action in [self.add_column_action, self.save_action, self.save_as_action, self.sharded_action]:
+            action.setEnabled(not loading)
+        if view is not None:
+            self.sharded_action.setChecked(view.document.is_sharded())
+
+    def closeEvent(self, event):
+        for view in self.views():
+            view.shutdown()
+        super().closeEvent(event)
 
     def open_about(self):
         data={
@@ -522,50 +2501,35 @@ class KanbanWindow(QMainWindow):
             "url_funding": about.__url_funding__,
             "url_bugs": about.__url_bugs__
         }
+        from simple_kanban_gui.modules.wabout import show_about_window
         show_about_window(data,self.icon_path)
 
-def main():
+def run(filepath="", profile=None):
+    """
+    Abre a janela (os argumentos já foram lidos por launcher.program_main).
+    """
     signal.signal(signal.SIGINT, signal.SIG_DFL)
-    
-    create_desktop_directory()    
-    create_desktop_menu()
-    create_desktop_file(os.path.join("~",".local","share","applications"))
-    
-    filepath = ""
-    if(len(sys.argv)==2):
-        if sys.argv[1] == "--autostart":
-            create_desktop_directory(overwrite = True)
-            create_desktop_menu(overwrite = True)
-            create_desktop_file(os.path.join("~",".config","autostart"), overwrite=True)
-            return
-            
-        if sys.argv[1] == "--applications":
-            create_desktop_directory(overwrite = True)
-            create_desktop_menu(overwrite = True)
-            create_desktop_file(os.path.join("~",".local","share","applications"), overwrite=True)
-            return
-
-        if os.path.exists(sys.argv[1]):
-            filepath = sys.argv[1]
-    else:
-        for n in range(len(sys.argv)):
-            if sys.argv[n] == "--autostart":
-                create_desktop_directory(overwrite = True)
-                create_desktop_menu(overwrite = True)
-                create_desktop_file(os.path.join("~",".config","autostart"), overwrite=True)
-                return
-            if sys.argv[n] == "--applications":
-                create_desktop_directory(overwrite = True)
-                create_desktop_menu(overwrite = True)
-                create_desktop_file(os.path.join("~",".local","share","applications"), overwrite=True)
-                return
+    if filepath and not os.path.exists(filepath):
+        filepath = ""
 
     app = QApplication(sys.argv)
     app.setApplicationName(about.__package__) 
+    if profile is not None:
+        profile.mark("QApplication")
     
     window = KanbanWindow(filepath)
     window.show()
+    if profile is not None:
+        profile.mark("main window")
+        profile.watch_first_paint(window)
+
+    # Atalhos do menu de aplicativos criados só depois da primeira pintura
+    QTimer.singleShot(0, install_desktop_entries_later)
     sys.exit(app.exec_())
+
+def main():
+    from simple_kanban_gui.launcher import program_main
+    program_main(sys.modules[__name__])
     
 if __name__ == "__main__":
     main()
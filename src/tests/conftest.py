@@ -0,0 +1,17 @@
+import os
+import sys
+
+import pytest
+
+# Os testes importam o pacote a partir do código-fonte (src/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def qt_app():
+    """
+    QApplication única dos testes com widgets ou threads do Qt, sem tela.
+    """
+    widgets = pytest.importorskip("PyQt5.QtWidgets")
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return widgets.QApplication.instance() or widgets.QApplication([])
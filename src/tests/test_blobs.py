@@ -0,0 +1,58 @@
+import os
+
+from simple_kanban_gui.modules.archive import archive_records
+from simple_kanban_gui.modules.blobs import BLOB_KEY, SIZE_KEY, externalize_notes, inline_note, is_stub
+from simple_kanban_gui.modules.document import BoardDocument
+from simple_kanban_gui.modules.links import BacklinkIndex, note_links
+from simple_kanban_gui.modules.search import NoteIndex
+
+NOTE_BLOB_CHARS = 32768  # padrão de "note_blob_chars"
+
+
+def big_board(tmp_path):
+    """
+    Quadro com uma nota maior que NOTE_BLOB_CHARS, gravada como referência.
+    """
+    path = str(tmp_path / "b.kanban.json")
+    content = "x " * NOTE_BLOB_CHARS + "needle [[other.kanban.json#n2]]"
+    notes = [{"id": "big", "title": "Big", "content": content}, {"id": "small", "title": "Small", "content": "hay"}]
+    stubs = externalize_notes(path, notes, NOTE_BLOB_CHARS)
+    return path, content, {"title": "t", "description": "", "boards": [{"id": "c", "title": "c", "notes": stubs}]}
+
+
+def test_large_contents_are_written_once_as_stubs(tmp_path):
+    path, content, data = big_board(tmp_path)
+    big, small = data["boards"][0]["notes"]
+    assert is_stub(big) and big[SIZE_KEY] == len(content)
+    assert small == {"id": "small", "title": "Small", "content": "hay"}
+    assert inline_note(dict(big), path)["content"] == content
+    assert not os.path.exists(str(tmp_path / "b.kanban.json"))
+
+
+def test_search_index_reads_stub_contents(tmp_path):
+    path, _, data = big_board(tmp_path)
+    assert NoteIndex.from_boards(data["boards"], path).search("needle") == {"big"}
+    assert BoardDocument(data, source=path).index.search("needle") == {"big"}
+
+
+def test_links_of_stub_contents_are_indexed(tmp_path):
+    path, _, data = big_board(tmp_path)
+    assert note_links(data, path) == {"big": ("Big", [("other.kanban.json", "n2")])}
+    index = BacklinkIndex()
+    index.update_note(path, data["boards"][0]["notes"][0])
+    target = str(tmp_path / "other.kanban.json")
+    assert index.backlinks(target, "n2") == [(path, "big", "Big")]
+
+
+def test_archived_stubs_carry_their_content(tmp_path):
+    path, content, data = big_board(tmp_path)
+    column = data["boards"][0]
+    record = archive_records(column, column["notes"][:1], path)[0]
+    assert record["note"]["content"] == content
+    assert BLOB_KEY not in record["note"] and SIZE_KEY not in record["note"]
+    assert is_stub(column["notes"][0])
+
+
+def test_missing_blob_is_indexed_as_empty(tmp_path):
+    path, _, data = big_board(tmp_path)
+    assert NoteIndex.from_boards(data["boards"], str(tmp_path / "elsewhere.kanban.json")).search("big") == {"big"}
@@ -0,0 +1,47 @@
+import os
+import time
+
+import pytest
+
+pytest.importorskip("PyQt5.QtCore")
+
+from simple_kanban_gui.modules.boardscan import BoardWatcher
+from simple_kanban_gui.modules.formats import dump_board
+
+
+def write_board(path, title):
+    dump_board(path, {"title": title, "description": "", "boards": []})
+
+
+def spin(app, condition, seconds=10):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline and not condition():
+        app.processEvents()
+        time.sleep(0.01)
+    return condition()
+
+
+def test_paths_over_the_watch_limit_are_polled(qt_app, tmp_path, capsys):
+    paths = [str(tmp_path / f"d{i}" / "b.kanban.json") for i in range(4)]
+    for path in paths:
+        os.makedirs(os.path.dirname(path))
+        write_board(path, "old")
+
+    titles = {}
+    watcher = BoardWatcher(str(tmp_path), lambda data, path: data["title"], max_watches=2, poll_interval=50)
+    watcher.updated.connect(lambda results: titles.update(results))
+    watcher.start()
+    try:
+        assert spin(qt_app, lambda: len(titles) == 4)
+        watched = watcher.watcher.directories() + watcher.watcher.files()
+        assert len(watched) == 2
+        assert watcher.poll_timer.isActive()
+        assert "Watching only 2 of 5 paths" in capsys.readouterr().out
+
+        # Um quadro num diretório sem watch é relido pela consulta periódica
+        unwatched = next(path for path in paths if os.path.dirname(path) not in watched)
+        time.sleep(0.01)
+        write_board(unwatched, "new")
+        assert spin(qt_app, lambda: titles[unwatched] == "new")
+    finally:
+        watcher.stop()
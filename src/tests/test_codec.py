@@ -0,0 +1,55 @@
+import io
+import json
+
+import pytest
+
+from simple_kanban_gui.modules import codec
+
+DATA = {"title": "Ação ✓", "n": 3, "x": 1.5, "ok": True, "none": None,
+        "boards": [{"id": "c", "notes": [{"title": "é", "content": "linha\nnova \"aspas\""}]}]}
+
+
+@pytest.fixture(params=["default", "stdlib"])
+def backend(request, monkeypatch):
+    """
+    Executa cada teste com o backend instalado e com a biblioteca padrão.
+    """
+    if request.param == "stdlib":
+        monkeypatch.setattr(codec, "orjson", None)
+    return request.param
+
+
+def test_round_trip(backend):
+    assert codec.loads(codec.dumpb(DATA)) == DATA
+    assert codec.loads(codec.dumps(DATA, indent=True)) == DATA
+    assert codec.loads(bytearray(codec.dumpb(DATA))) == DATA
+
+
+def test_indented_output_matches_json_module(backend):
+    expected = json.dumps(DATA, ensure_ascii=False, indent=2)
+    assert codec.dumps(DATA, indent=True) == expected
+    assert codec.dumpb(DATA, indent=True) == expected.encode("utf-8")
+
+
+def test_compact_output_has_no_spaces(backend):
+    assert codec.dumps({"a": [1, 2]}) == '{"a":[1,2]}'
+    assert codec.dumps({"b": 1, "a": 2}, sort_keys=True) == '{"a":2,"b":1}'
+
+
+def test_values_outside_the_fast_backend_fall_back(backend):
+    assert codec.loads(codec.dumpb({"big": 2 ** 70})) == {"big": 2 ** 70}
+    assert codec.loads(codec.dumps({1: "a"})) == {"1": "a"}
+
+
+def test_decode_error_is_json_decode_error(backend):
+    with pytest.raises(codec.DecodeError):
+        codec.loads(b'{"a": ')
+    with pytest.raises(json.JSONDecodeError):
+        codec.loads("[1,")
+
+
+def test_file_helpers(backend):
+    f = io.StringIO()
+    codec.dump(DATA, f, indent=True)
+    assert codec.load(io.StringIO(f.getvalue())) == DATA
+    assert codec.load(io.BytesIO(f.getvalue().encode("utf-8"))) == DATA
@@ -0,0 +1,142 @@
+import copy
+
+from simple_kanban_gui.modules import codec
+from simple_kanban_gui.modules.document import (
+    BoardDocument, adopt_ids, assemble_document, board_layout, encode_snapshot, ensure_ids
+)
+from simple_kanban_gui.modules.styles import FORMAT_KEY, FORMAT_VERSION, STYLE_NAME_KEY
+
+
+def board_without_ids(columns=3, notes=3):
+    return {"title": "t", "description": "",
+            "boards": [{"title": f"c{c}", "notes": [{"title": f"n{c}-{i}", "content": ""} for i in range(notes)]}
+                       for c in range(columns)]}
+
+
+def titles(document):
+    return [[note["title"] for note in column["notes"]] for column in document.columns]
+
+
+def test_ensure_ids_keeps_existing_ids():
+    data = {"boards": [{"id": "c", "notes": [{"id": "n", "title": "x"}, {"title": "y"}]}]}
+    ensure_ids(data)
+    notes = data["boards"][0]["notes"]
+    assert data["boards"][0]["id"] == "c"
+    assert notes[0]["id"] == "n"
+    assert notes[1]["id"] and notes[1]["id"] != "n"
+    assert all("modified" in note for note in notes)
+
+
+def test_adopt_ids_matches_equal_notes_then_positions():
+    document = BoardDocument(board_without_ids())
+    disk = board_without_ids()
+    disk["boards"][0]["notes"].insert(0, {"title": "new", "content": ""})
+    disk["boards"][1]["notes"][2]["title"] = "edited"
+    adopt_ids(disk, document.layout, document.base)
+
+    old = document.columns
+    assert [board["id"] for board in disk["boards"]] == [column["id"] for column in old]
+    # Notas iguais recebem o id da mesma nota, mesmo deslocadas
+    assert [note["id"] for note in disk["boards"][0]["notes"][1:]] == [note["id"] for note in old[0]["notes"]]
+    assert "id" not in disk["boards"][0]["notes"][0]
+    # Nota alterada: id da mesma posição, sem herdar a data de modificação
+    assert disk["boards"][1]["notes"][2]["id"] == old[1]["notes"][2]["id"]
+    assert "modified" not in disk["boards"][1]["notes"][2]
+    assert disk["boards"][2]["notes"][0]["modified"] == old[2]["notes"][0]["modified"]
+
+
+def test_merge_of_file_without_ids_keeps_local_edit_without_duplicates():
+    document = BoardDocument(board_without_ids())
+    document.edit_note(document.columns[0], document.columns[0]["notes"][0], title="EDIT")
+    disk = board_without_ids()
+    disk["boards"][1]["notes"][2]["title"] = "external"
+    disk["boards"][2]["notes"].insert(0, {"title": "inserted", "content": ""})
+
+    document.merge(disk)
+
+    assert titles(document) == [["EDIT", "n0-1", "n0-2"],
+                                ["n1-0", "n1-1", "external"],
+                                ["inserted", "n2-0", "n2-1", "n2-2"]]
+    assert document.conflicts == set()
+
+
+def test_merge_marks_conflict_when_both_sides_edit_a_note():
+    document = BoardDocument(ensure_ids(board_without_ids()))
+    note = document.columns[0]["notes"][1]
+    disk = copy.deepcopy(document.to_dict())
+    document.edit_note(document.columns[0], note, title="local")
+    disk["boards"][0]["notes"][1]["title"] = "disk"
+
+    document.merge(disk)
+
+    assert note["title"] == "local"
+    assert document.conflicts == {note["id"]}
+
+
+def test_merge_applies_disk_changes_to_untouched_notes():
+    document = BoardDocument(ensure_ids(board_without_ids()))
+    disk = copy.deepcopy(document.to_dict())
+    disk["boards"][2]["notes"][0]["title"] = "from disk"
+    del disk["boards"][0]["notes"][2]
+
+    changed, updated = document.merge(disk)
+
+    assert titles(document)[0] == ["n0-0", "n0-1"]
+    assert titles(document)[2][0] == "from disk"
+    assert updated == {disk["boards"][2]["notes"][0]["id"]}
+    assert id(document.columns[0]) in changed
+
+
+def test_merge_keeps_notes_removed_on_disk_but_edited_locally():
+    document = BoardDocument(ensure_ids(board_without_ids()))
+    note = document.columns[1]["notes"][0]
+    disk = copy.deepcopy(document.to_dict())
+    del disk["boards"][1]["notes"][0]
+    document.edit_note(document.columns[1], note, content="kept")
+
+    document.merge(disk)
+
+    assert document.columns[1]["notes"][0] is note
+    assert note["id"] in document.conflicts
+
+
+def test_snapshot_encodes_like_a_full_dump():
+    document = BoardDocument(ensure_ids(board_without_ids()))
+    meta, parts, headers = document.snapshot()
+    text, fragments = encode_snapshot(meta, parts)
+    assert codec.loads(text)["boards"] == [dict(column) for column in document.columns]
+    assert text == codec.dumps(codec.loads(text), indent=True)
+    assert len(fragments) == len(document.columns)
+    assert board_layout(codec.loads(text)["boards"]) == document.layout
+
+
+def styled_board():
+    data = ensure_ids(board_without_ids())
+    data["styles"] = {"mine": {"frame": "background-color: red;", "title": "color: blue;"}}
+    for column in data["boards"]:
+        column["style"] = "mine"
+    return data
+
+
+def test_snapshot_saves_style_names_only():
+    document = BoardDocument(styled_board())
+    meta, parts, headers = document.snapshot()
+    saved = codec.loads(encode_snapshot(meta, parts)[0])
+    assert saved[FORMAT_KEY] == FORMAT_VERSION
+    assert [column["style"] for column in saved["boards"]] == ["mine"] * 3
+    assert not any(STYLE_NAME_KEY in column for column in saved["boards"])
+
+
+def test_inline_styles_export_reads_back_as_names():
+    document = BoardDocument(styled_board())
+    meta, parts, headers = document.snapshot(inline_styles=True)
+    saved = codec.loads(encode_snapshot(meta, parts)[0])
+    assert all(column["style"]["frame"] == "background-color: red;" for column in saved["boards"])
+    reloaded = BoardDocument(saved)
+    assert [column["style"] for column in reloaded.columns] == ["mine"] * 3
+    assert not any(STYLE_NAME_KEY in column for column in reloaded.columns)
+
+
+def test_assemble_document_without_columns():
+    meta = {"title": "t", "description": ""}
+    assert assemble_document(meta, []) == codec.dumps(dict(meta, boards=[]), indent=True)
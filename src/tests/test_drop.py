@@ -0,0 +1,99 @@
+import time
+
+import pytest
+
+pytest.importorskip("PyQt5.QtWidgets")
+
+
+@pytest.fixture(scope="module")
+def program(qt_app, tmp_path_factory):
+    # A configuração do programa é criada num HOME temporário
+    patch = pytest.MonkeyPatch()
+    patch.setenv("HOME", str(tmp_path_factory.mktemp("home")))
+    from simple_kanban_gui import program
+    yield program
+    patch.undo()
+
+
+def test_drop_position_maps_the_bisect_back_to_column_positions(program):
+    offsets = ([10, 30, 50], [0, 2, 5])
+    assert [program.drop_position(offsets, y) for y in (0, 20, 40, 60)] == [0, 1, 3, 6]
+    assert program.drop_position(([10, 30], [0, 1]), 35) == 2
+    assert program.drop_position(([], []), 35) == 0
+
+
+def open_board(program, path, titles):
+    from PyQt5.QtWidgets import QApplication
+    from simple_kanban_gui.modules import codec
+
+    path.write_text(codec.dumps({"title": "t", "description": "",
+                                 "boards": [{"title": "c", "notes": [{"title": t} for t in titles]}]}))
+    window = program.KanbanWindow(str(path))
+    window.resize(1000, 900)
+    window.show()
+    view = window.current_view()
+
+    # O quadro é carregado e as colunas materializadas fora desta chamada
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        QApplication.processEvents()
+        column = view.columns_layout.itemAt(0).widget() if view.columns_layout.count() > 1 else None
+        if isinstance(column, program.ColumnWidget) and column.materialized \
+                and len(column.note_widgets()) == len(titles):
+            return window, view, column
+    pytest.fail("o quadro não foi carregado")
+
+
+def test_drop_into_a_filtered_column_lands_after_the_visible_note_above(program, tmp_path):
+    from PyQt5.QtCore import QByteArray, QDataStream, QIODevice, QMimeData, QPoint, Qt
+    from PyQt5.QtGui import QDropEvent
+    from PyQt5.QtWidgets import QApplication
+    from simple_kanban_gui.modules import codec
+
+    titles = ["pear 1", "apple 1", "pear 2", "pear 3", "apple 2", "apple 3"]
+    window, view, column = open_board(program, tmp_path / "b.kanban.json", titles)
+
+    window.filter_input.setText("apple")
+    QApplication.processEvents()
+    visible = [widget for widget in column.note_widgets() if not widget.isHidden()]
+    assert [widget.note["title"] for widget in visible] == ["apple 1", "apple 2", "apple 3"]
+
+    # Entre "apple 2" e "apple 3"; as escondidas guardam posições antigas na tela
+    y = (visible[1].geometry().center().y() + visible[2].geometry().center().y()) // 2
+    data = QByteArray()
+    QDataStream(data, QIODevice.WriteOnly).writeQString(codec.dumps({"title": "apple new"}))
+    mime = QMimeData()
+    mime.setData(program.NOTE_MIME_TYPE, data)
+    event = QDropEvent(QPoint(10, y), Qt.MoveAction, mime, Qt.LeftButton, Qt.NoModifier)
+    column.dropEvent(event)
+
+    assert [note["title"] for note in column.column["notes"]] == \
+        ["pear 1", "apple 1", "pear 2", "pear 3", "apple 2", "apple new", "apple 3"]
+    assert [widget.note["title"] for widget in column.note_widgets()] == \
+        [note["title"] for note in column.column["notes"]]
+    window.close()
+
+
+def test_selection_taken_during_its_own_drag_keeps_the_dragged_widget(program, tmp_path):
+    from PyQt5 import sip
+    from PyQt5.QtCore import QEvent, Qt
+    from PyQt5.QtWidgets import QApplication
+
+    window, view, column = open_board(program, tmp_path / "b.kanban.json", ["a", "b", "c"])
+    first, second, third = column.note_widgets()
+    view.select_note(column, first.note, Qt.ControlModifier)
+    view.select_note(column, second.note, Qt.ControlModifier)
+
+    # A seleção é solta em outra aba enquanto drag.exec_ ainda roda
+    program.NoteWidget.active_drag = first
+    try:
+        taken = view.take_selected()
+        QApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    finally:
+        program.NoteWidget.active_drag = None
+
+    assert [note["title"] for note in taken] == ["a", "b"]
+    assert not sip.isdeleted(first) and first.discarded and first.isHidden()
+    assert sip.isdeleted(second)
+    assert column.note_widgets() == [third]
+    window.close()
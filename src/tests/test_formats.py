@@ -0,0 +1,74 @@
+import gzip
+import hashlib
+
+import pytest
+
+from simple_kanban_gui.modules import formats
+from simple_kanban_gui.modules.formats import (
+    GZIP, JSON, MSGPACK, ZSTD, board_stem, detect_format, dump_board, encode_board, format_for_path,
+    path_for_filter, read_board
+)
+
+BOARD = {"title": "Ação", "description": "", "boards": [{"id": "c", "title": "A", "notes": [{"id": "n", "title": "é"}]}]}
+
+
+@pytest.mark.parametrize("head, fmt", [
+    (b"\x1f\x8b\x08\x00", GZIP),
+    (b"\x28\xb5\x2f\xfd", ZSTD),
+    (b"\x83\xa5titl", MSGPACK),   # fixmap
+    (b"\xde\x00\x10\xa5", MSGPACK),  # map16
+    (b"{\n  \"", JSON),
+    (b"\xef\xbb\xbf{", JSON),
+    (b"", JSON),
+])
+def test_detect_format_by_magic_bytes(head, fmt):
+    assert detect_format(head) == fmt
+
+
+@pytest.mark.parametrize("name, fmt", [
+    ("a.kanban.json", JSON), ("a.kanban.json.gz", GZIP), ("A.KANBAN.JSON.ZST", ZSTD),
+    ("a.kanban.msgpack", MSGPACK), ("a.txt", JSON),
+])
+def test_format_for_path(name, fmt):
+    assert format_for_path(name) == fmt
+
+
+def test_board_stem_and_filters():
+    assert board_stem("dir/x.kanban.json.gz") == "dir/x"
+    assert path_for_filter("x", "JSON gzip (*.kanban.json.gz)") == "x.kanban.json.gz"
+    assert path_for_filter("x.kanban.json", "JSON gzip (*.kanban.json.gz)") == "x.kanban.json"
+    assert path_for_filter("x", "") == "x.kanban.json"
+
+
+@pytest.mark.parametrize("fmt", [JSON, GZIP, ZSTD, MSGPACK])
+def test_round_trip(tmp_path, fmt):
+    if not formats.available(fmt):
+        pytest.skip(f"{formats.MODULES[fmt]} not installed")
+    path = str(tmp_path / ("b" + formats.SUFFIXES[fmt]))
+    dump_board(path, BOARD)
+    data, digest, read_fmt, raw = read_board(path)
+    assert data == BOARD
+    assert read_fmt == fmt
+    with open(path, "rb") as f:
+        assert digest == hashlib.sha1(f.read()).hexdigest()
+
+
+def test_content_decides_the_format_not_the_extension(tmp_path):
+    path = tmp_path / "b.kanban.json"
+    dump_board(str(path), BOARD, GZIP)
+    assert path.read_bytes()[:2] == b"\x1f\x8b"
+    assert read_board(str(path))[0] == BOARD
+
+
+def test_gzip_encoding_is_deterministic():
+    text = '{"title": "x", "boards": []}'
+    assert encode_board(text, GZIP) == encode_board(text, GZIP)
+    assert gzip.decompress(encode_board(text, GZIP)).decode("utf-8") == text
+
+
+def test_missing_optional_package_is_reported(monkeypatch):
+    monkeypatch.setattr(formats, "zstandard", None)
+    assert not formats.available(ZSTD)
+    assert all("zstd" not in name for name in formats.save_filters())
+    with pytest.raises(RuntimeError, match="zstandard"):
+        encode_board("{}", ZSTD)
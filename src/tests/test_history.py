@@ -0,0 +1,92 @@
+import os
+
+from simple_kanban_gui.modules.document import BoardDocument, ensure_ids, write_snapshot
+from simple_kanban_gui.modules.history import HistoryStore, split_chunks
+
+
+def make_document(notes=100):
+    return BoardDocument(ensure_ids({"title": "t", "description": "",
+                                     "boards": [{"title": f"c{c}", "notes": [{"title": f"n{c}-{i}", "content": "x"} for i in range(notes)]}
+                                                for c in range(2)]}))
+
+
+def save(document, store, path):
+    meta, parts, headers = document.snapshot()
+    fragments, _, _ = write_snapshot(path, meta, parts, headers, "")
+    document.store_fragments(fragments)
+    document.save_finished(True)
+    return store.record(path, meta, parts, headers, fragments)
+
+
+def object_count(store):
+    return sum(len(files) for _, _, files in os.walk(os.path.join(store.root, "objects")))
+
+
+def test_unchanged_saves_are_not_recorded_again(tmp_path):
+    store = HistoryStore(str(tmp_path / "history"))
+    path = str(tmp_path / "b.kanban.json")
+    document = make_document()
+    assert save(document, store, path) is not None
+    document.mark_all_dirty()
+    assert save(document, store, path) is None
+    assert len(store.versions(path)) == 1
+
+
+def test_a_new_version_stores_only_the_changed_chunk(tmp_path):
+    store = HistoryStore(str(tmp_path / "history"))
+    path = str(tmp_path / "b.kanban.json")
+    document = make_document()
+    save(document, store, path)
+    before = object_count(store)
+
+    column = document.columns[1]
+    document.edit_note(column, column["notes"][50], content="changed")
+    entry = save(document, store, path)
+
+    # A coluna, a versão e o pedaço editado; conforme os ids (aleatórios),
+    # a edição pode deslocar uma fronteira e dividir o pedaço em dois
+    assert 3 <= object_count(store) - before <= 4
+    assert entry["changed"] == 1
+    assert store.load_version(entry["version"])["boards"] == document.columns
+
+
+def test_versions_survive_a_new_store_instance(tmp_path):
+    root = str(tmp_path / "history")
+    path = str(tmp_path / "b.kanban.json")
+    document = make_document(5)
+    first = save(document, HistoryStore(root), path)
+    document.set_meta(title="renamed")
+    second = save(document, HistoryStore(root), path)
+
+    store = HistoryStore(root)
+    assert [v["version"] for v in store.versions(path)] == [first["version"], second["version"]]
+    assert store.load_version(first["version"])["title"] == "t"
+    assert store.load_version(second["version"])["title"] == "renamed"
+
+
+def test_diff_reports_the_changed_note(tmp_path):
+    store = HistoryStore(str(tmp_path / "history"))
+    path = str(tmp_path / "b.kanban.json")
+    document = make_document()
+    old = save(document, store, path)["version"]
+    column = document.columns[0]
+    note = column["notes"][10]
+    document.edit_note(column, note, title="edited")
+    new = save(document, store, path)["version"]
+
+    changes = [(header["id"], state, notes) for header, _, state, notes in store.diff(old, new)]
+    assert [(column_id, state) for column_id, state, _ in changes] == [(column["id"], "changed")]
+    [(state, before, after, _)] = changes[0][2]
+    assert state == "changed"
+    assert before["title"] == "n0-10" and after["title"] == "edited"
+
+
+def test_chunk_boundaries_depend_only_on_content():
+    notes = [{"id": str(i), "title": f"n{i}"} for i in range(200)]
+    chunks = split_chunks(notes)
+    assert [note for chunk in chunks for note in chunk] == notes
+    inserted = notes[:100] + [{"id": "new", "title": "new"}] + notes[100:]
+    new_chunks = split_chunks(inserted)
+    # Só o pedaço que recebeu a nota muda (dividido em dois se ela terminar um pedaço)
+    assert sum(1 for chunk in chunks if chunk not in new_chunks) == 1
+    assert sum(1 for chunk in new_chunks if chunk not in chunks) <= 2
@@ -0,0 +1,70 @@
+import copy
+
+from simple_kanban_gui.modules import codec
+from simple_kanban_gui.modules.document import BoardDocument, ensure_ids
+from simple_kanban_gui.modules.journal import BoardJournal, apply_op, journal_path, read_records, replay
+from simple_kanban_gui.modules.styles import normalize_styles
+
+
+def sample_board():
+    return ensure_ids({"title": "t", "description": "",
+                       "boards": [{"title": f"c{c}", "notes": [{"title": f"n{c}-{i}", "content": ""} for i in range(3)]}
+                                  for c in range(3)]})
+
+
+def test_replaying_document_operations_rebuilds_the_document():
+    data = sample_board()
+    replica = normalize_styles(copy.deepcopy(data))
+    document = BoardDocument(data)
+    ops = []
+    document.changed.connect(lambda op: ops.append(copy.deepcopy(op)))
+
+    first, second, third = document.columns
+    document.set_meta(title="renamed")
+    document.add_note(first, {"title": "added", "content": ""}, 1)
+    document.add_notes(second, [{"title": "a"}, {"title": "b"}], 0)
+    document.edit_note(third, third["notes"][2], content="edited")
+    document.move_note(first, first["notes"][0], third, 1)
+    document.remove_note(second, second["notes"][3])
+    document.move_notes([(first, first["notes"][0]), (third, third["notes"][0])], second, 2)
+    document.remove_notes([(third, third["notes"][1])])
+    document.rename_column(second, "middle")
+    document.set_column_style(second, "done")
+    document.set_column_style(first, None)
+    document.move_column(third, 0)
+    document.add_column({"title": "new", "notes": []}, 1)
+    document.remove_column(first)
+
+    for op in ops:
+        apply_op(replica, op)
+    assert replica == document.to_dict()
+
+
+def test_journal_replay_skips_operations_already_in_the_base_file(tmp_path):
+    path = str(tmp_path / "b.kanban.json")
+    journal = BoardJournal(journal_path(path))
+    journal.append({"op": "rename_board", "index": 0, "title": "first"})
+    journal.append({"op": "rename_board", "index": 0, "title": "second"})
+    journal.close()
+
+    data = {"journal_seq": 1, "boards": [{"title": "first", "notes": []}]}
+    assert replay(data, journal_path(path)) == 2
+    assert data["boards"][0]["title"] == "second"
+    assert data["journal_seq"] == 2
+
+
+def test_incomplete_last_record_is_ignored(tmp_path):
+    path = tmp_path / "b.kanban.json.journal"
+    path.write_bytes(codec.dumpb({"op": "set_meta", "seq": 1, "title": "x"}) + b"\n" + b'{"op": "set_me')
+    assert [record["seq"] for record in read_records(str(path))] == [1]
+
+
+def test_truncate_through_keeps_later_operations(tmp_path):
+    path = str(tmp_path / "b.kanban.json.journal")
+    journal = BoardJournal(path)
+    for title in ["a", "b", "c"]:
+        journal.append({"op": "set_meta", "title": title})
+    journal.truncate_through(2)
+    journal.append({"op": "set_meta", "title": "d"})
+    journal.close()
+    assert [(record["seq"], record["title"]) for record in read_records(path)] == [(3, "c"), (4, "d")]
@@ -0,0 +1,61 @@
+import pytest
+
+from simple_kanban_gui.modules.links import (
+    BacklinkIndex, link_target, link_url, linkify, note_links, parse_link_url, parse_links
+)
+
+
+@pytest.mark.parametrize("text, links", [
+    ("see [[a.kanban.json#n1]]", [("a.kanban.json", "n1")]),
+    ("[[a.kanban.json]] and [[#n2]]", [("a.kanban.json", ""), ("", "n2")]),
+    ("[[ sub/b.kanban.json # n3 |label]]", [("sub/b.kanban.json", "n3")]),
+    ("[[]] [[#]] [not a link] [[x", []),
+    ("[[a#b]][[c#d]]", [("a", "b"), ("c", "d")]),
+])
+def test_parse_links(text, links):
+    assert parse_links(text) == links
+
+
+def test_link_target_is_relative_to_the_source_board(tmp_path):
+    source = str(tmp_path / "dir" / "a.kanban.json")
+    assert link_target(source, "../b.kanban.json", "n") == (str(tmp_path / "b.kanban.json"), "n")
+    assert link_target(source, "", "n") == (source, "n")
+
+
+def test_link_urls_round_trip():
+    for file, note_id in [("a b.kanban.json", "n#1"), ("ação/x.kanban.json", ""), ("", "n")]:
+        assert parse_link_url(link_url(file, note_id)) == (file, note_id)
+    assert parse_link_url("https://example.com") is None
+
+
+def test_linkify():
+    assert linkify("[[a.kanban.json#n1]]") == f"[a.kanban.json#n1](<{link_url('a.kanban.json', 'n1')}>)"
+    assert linkify("[[#n1|here]]") == f"[here](<{link_url('', 'n1')}>)"
+    assert linkify("[[]] plain") == "[[]] plain"
+
+
+def test_note_links_only_lists_notes_with_references():
+    data = {"boards": [{"notes": [{"id": "a", "title": "A", "content": "[[#b]]"},
+                                  {"id": "b", "title": "B", "content": "[[ no link"},
+                                  {"id": "c", "title": "C"}]}]}
+    assert note_links(data) == {"a": ("A", [("", "b")])}
+
+
+def test_backlink_index_updates_per_file_and_per_note(tmp_path):
+    a = str(tmp_path / "a.kanban.json")
+    b = str(tmp_path / "b.kanban.json")
+    index = BacklinkIndex()
+    index.update(a, {"x": ("X", [("b.kanban.json", "t")]), "y": ("Y", [("b.kanban.json", "")])})
+    assert index.backlinks(b, "t") == [(a, "x", "X")]
+    assert index.backlinks(b) == [(a, "y", "Y")]
+
+    index.update_note(a, {"id": "x", "title": "X", "content": "nothing"})
+    assert index.backlinks(b, "t") == []
+    index.update_note(a, {"id": "z", "title": "Z", "content": "[[b.kanban.json#t]]"})
+    assert index.backlinks(b, "t") == [(a, "z", "Z")]
+
+    index.update(a, {})
+    assert index.backlinks(b, "t") == [] and index.backlinks(b) == []
+    index.update(a, {"x": ("X", [("b.kanban.json", "t")])})
+    index.remove(a)
+    assert index.targets == {}
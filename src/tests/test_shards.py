@@ -0,0 +1,79 @@
+import os
+
+from simple_kanban_gui.modules import codec
+from simple_kanban_gui.modules.boardscan import read_board_data
+from simple_kanban_gui.modules.document import BoardDocument, ensure_ids, write_snapshot
+from simple_kanban_gui.modules.shards import (
+    LAYOUT_KEY, SHARDED, read_shard, remove_shards, shard_dir, shard_files, shard_path
+)
+
+
+def sharded_document():
+    return BoardDocument(ensure_ids({"title": "t", "description": "", LAYOUT_KEY: SHARDED,
+                                     "boards": [{"title": f"c{c}", "notes": [{"title": f"n{c}-{i}"} for i in range(2)]}
+                                                for c in range(3)]}))
+
+
+def save(document, path, last_hash=""):
+    meta, parts, headers = document.snapshot()
+    fragments, digest, written = write_snapshot(path, meta, parts, headers, last_hash)
+    document.store_fragments(fragments)
+    document.save_finished(True)
+    return digest, written
+
+
+def test_sharded_save_writes_a_manifest_and_one_file_per_column(tmp_path):
+    path = str(tmp_path / "b.kanban.json")
+    document = sharded_document()
+    save(document, path)
+
+    with open(path, encoding="utf-8") as f:
+        manifest = codec.loads(f.read())
+    assert all("notes" not in board for board in manifest["boards"])
+    assert sorted(shard_files(path)) == sorted(column["id"] for column in document.columns)
+    notes, text = read_shard(path, document.columns[1]["id"])
+    assert [note["title"] for note in notes] == ["n1-0", "n1-1"]
+    assert read_board_data(path)["boards"] == document.columns
+
+
+def test_only_changed_columns_are_rewritten(tmp_path):
+    path = str(tmp_path / "b.kanban.json")
+    document = sharded_document()
+    digest, _ = save(document, path)
+    first, second = (shard_path(path, column["id"]) for column in document.columns[:2])
+    os.utime(first, ns=(0, 0))
+    os.utime(second, ns=(0, 0))
+
+    assert save(document, path, digest)[1] is False
+    document.edit_note(document.columns[1], document.columns[1]["notes"][0], title="edited")
+    save(document, path, digest)
+
+    assert os.stat(first).st_mtime_ns == 0
+    assert os.stat(second).st_mtime_ns != 0
+    assert read_board_data(path)["boards"][1]["notes"][0]["title"] == "edited"
+
+
+def test_missing_shard_reads_as_empty_column(tmp_path):
+    assert read_shard(str(tmp_path / "b.kanban.json"), "missing") == ([], "")
+
+
+def test_converting_back_to_a_single_file_removes_the_shards(tmp_path):
+    path = str(tmp_path / "b.kanban.json")
+    document = sharded_document()
+    save(document, path)
+    document.set_layout(False)
+    save(document, path)
+
+    assert not os.path.exists(shard_dir(path))
+    with open(path, encoding="utf-8") as f:
+        assert codec.loads(f.read())["boards"] == document.columns
+
+
+def test_remove_shards_keeps_listed_columns(tmp_path):
+    path = str(tmp_path / "b.kanban.json")
+    os.makedirs(shard_dir(path))
+    for board_id in ["a", "b"]:
+        with open(shard_path(path, board_id), "w") as f:
+            f.write("{}")
+    remove_shards(path, keep={"a"})
+    assert shard_files(path) == ["a"]
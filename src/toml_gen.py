@@ -49,6 +49,10 @@ dependencies = [
     "PyQt5"
 ]
 
+[project.optional-dependencies]
+formats = ["zstandard", "msgpack"]
+fast = ["orjson"]
+
 [project.urls]
 "Bug Reports" = "{__url_bugs__}"
 "Funding" = "{__url_funding__}"
@@ -56,8 +60,8 @@ dependencies = [
 "Source" = "{__url_source__}"
 
 [project.scripts]
-"{__program_name__}" = "{__package__}.program:main"
-"{__manager_name__}" = "{__package__}.manager:main"
+"{__program_name__}" = "{__package__}.launcher:program_main"
+"{__manager_name__}" = "{__package__}.launcher:manager_main"
 
 [tool.setuptools]
 packages = ["{__package__}", "{__package__}.modules"]